@@ -16,13 +16,58 @@ load_dotenv()
 DIALOGFLOW_PROJECT_ID = os.getenv("DIALOGFLOW_PROJECT_ID")
 DIALOGFLOW_CREDENTIALS_PATH = os.getenv("DIALOGFLOW_CREDENTIALS_PATH")
 DIALOGFLOW_LANGUAGE_CODE = os.getenv("DIALOGFLOW_LANGUAGE_CODE")
+DIALOGFLOW_MAX_CONCURRENT_REQUESTS = int(os.getenv("DIALOGFLOW_MAX_CONCURRENT_REQUESTS", 16))
+DIALOGFLOW_REQUEST_TIMEOUT = float(os.getenv("DIALOGFLOW_REQUEST_TIMEOUT", 10.0))
+DIALOGFLOW_CHANNEL_POOL_SIZE = int(os.getenv("DIALOGFLOW_CHANNEL_POOL_SIZE", 4))
+DIALOGFLOW_MAX_SESSIONS = int(os.getenv("DIALOGFLOW_MAX_SESSIONS", 1000))
+DIALOGFLOW_SESSION_TTL = float(os.getenv("DIALOGFLOW_SESSION_TTL", 1800.0))
 
 # # API Endpoints
 # LLM_API_ENDPOINT = os.getenv("LLM_API_ENDPOINT", "http://127.0.0.1:1234/v1/chat/completions")
 # TTS_API_ENDPOINT = os.getenv("TTS_API_ENDPOINT", "http://localhost:5005/v1/audio/speech")
 
-# # Whisper Model Configuration
-# WHISPER_MODEL = os.getenv("WHISPER_MODEL", "tiny.en")
+# LLM Execution
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", 8))
+
+# Transcription Cache (0 entries disables it; an empty directory keeps it in memory only)
+TRANSCRIPTION_CACHE_ENTRIES = int(os.getenv("TRANSCRIPTION_CACHE_ENTRIES", 1024))
+TRANSCRIPTION_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPTION_CACHE_MAX_BYTES", 4 * 1024 * 1024))
+TRANSCRIPTION_CACHE_DIR = os.getenv("TRANSCRIPTION_CACHE_DIR", "")
+TRANSCRIPTION_CACHE_DISK_ENTRIES = int(os.getenv("TRANSCRIPTION_CACHE_DISK_ENTRIES", 10000))
+
+# TTS Audio Cache (0 bytes disables it; an empty directory keeps it in memory only)
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "")
+TTS_CACHE_MAX_DISK_BYTES = int(os.getenv("TTS_CACHE_MAX_DISK_BYTES", 512 * 1024 * 1024))
+TTS_CACHE_WARMUP = [phrase.strip() for phrase in os.getenv("TTS_CACHE_WARMUP", "").split("|") if phrase.strip()]
+
+# Generate the greeting when a client connects, before it asks for it
+GREETING_PREWARM = os.getenv("GREETING_PREWARM", "true").lower() == "true"
+
+# Token budget of each conversation history; older turns are summarized (0 for no limit)
+HISTORY_MAX_TOKENS = int(os.getenv("HISTORY_MAX_TOKENS", 4000))
+
+# Worker processes for CPU-heavy audio work (0 disables the pool)
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", 0))
+
+# Utterance Scheduling
+WORK_MAX_ACTIVE = int(os.getenv("WORK_MAX_ACTIVE", 32))
+WORK_MAX_QUEUED = int(os.getenv("WORK_MAX_QUEUED", 256))
+WORK_QUEUE_MAX_PENDING = int(os.getenv("WORK_QUEUE_MAX_PENDING", 2))
+WORK_QUEUE_POLICY = os.getenv("WORK_QUEUE_POLICY", "drop_oldest")  # drop_oldest, drop_newest or merge
+
+# Transcription engine: "dialogflow" or "faster_whisper" (local)
+TRANSCRIBER_ENGINE = os.getenv("TRANSCRIBER_ENGINE", "dialogflow")
+
+# Whisper Model Configuration (local faster-whisper engine)
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "tiny.en")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS", 2))
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", 8))
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", 1))
+WHISPER_BATCH_WAIT_MS = float(os.getenv("WHISPER_BATCH_WAIT_MS", 10.0))  # 0 disables micro-batching
+WHISPER_FALLBACK = os.getenv("WHISPER_FALLBACK", "false").lower() == "true"  # Use when Dialogflow times out
 
 # # TTS Configuration
 # TTS_MODEL = os.getenv("TTS_MODEL", "tts-1")
@@ -33,8 +78,15 @@ DIALOGFLOW_LANGUAGE_CODE = os.getenv("DIALOGFLOW_LANGUAGE_CODE")
 WEBSOCKET_HOST = os.getenv("WEBSOCKET_HOST", "0.0.0.0")
 WEBSOCKET_PORT = int(os.getenv("WEBSOCKET_PORT", 8000))
 
+# Server-side VAD (Silero)
+VAD_ENABLED = os.getenv("VAD_ENABLED", "false").lower() == "true"
+VAD_THRESHOLD = float(os.getenv("VAD_THRESHOLD", 0.5))
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", 600))
+VAD_SPEECH_PAD_MS = int(os.getenv("VAD_SPEECH_PAD_MS", 150))
+VAD_MAX_UTTERANCE_S = float(os.getenv("VAD_MAX_UTTERANCE_S", 30.0))
+VAD_WORKERS = int(os.getenv("VAD_WORKERS", 2))
+
 # # Audio Processing
-# VAD_THRESHOLD = float(os.getenv("VAD_THRESHOLD", 0.5))
 # VAD_BUFFER_SIZE = int(os.getenv("VAD_BUFFER_SIZE", 30))
 # AUDIO_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", 48000))
 
@@ -49,15 +101,49 @@ def get_config() -> Dict[str, Any]:
         "dialogflow_project_id": DIALOGFLOW_PROJECT_ID,
         "dialogflow_credentials_path": DIALOGFLOW_CREDENTIALS_PATH,
         "dialogflow_language_code": DIALOGFLOW_LANGUAGE_CODE,
+        "dialogflow_max_concurrent_requests": DIALOGFLOW_MAX_CONCURRENT_REQUESTS,
+        "dialogflow_request_timeout": DIALOGFLOW_REQUEST_TIMEOUT,
+        "dialogflow_channel_pool_size": DIALOGFLOW_CHANNEL_POOL_SIZE,
+        "dialogflow_max_sessions": DIALOGFLOW_MAX_SESSIONS,
+        "dialogflow_session_ttl": DIALOGFLOW_SESSION_TTL,
         # "llm_api_endpoint": LLM_API_ENDPOINT,
         # "tts_api_endpoint": TTS_API_ENDPOINT,
-        # "whisper_model": WHISPER_MODEL,
+        "llm_max_workers": LLM_MAX_WORKERS,
+        "transcription_cache_entries": TRANSCRIPTION_CACHE_ENTRIES,
+        "transcription_cache_max_bytes": TRANSCRIPTION_CACHE_MAX_BYTES,
+        "transcription_cache_dir": TRANSCRIPTION_CACHE_DIR,
+        "transcription_cache_disk_entries": TRANSCRIPTION_CACHE_DISK_ENTRIES,
+        "tts_cache_max_bytes": TTS_CACHE_MAX_BYTES,
+        "tts_cache_dir": TTS_CACHE_DIR,
+        "tts_cache_max_disk_bytes": TTS_CACHE_MAX_DISK_BYTES,
+        "tts_cache_warmup": TTS_CACHE_WARMUP,
+        "greeting_prewarm": GREETING_PREWARM,
+        "history_max_tokens": HISTORY_MAX_TOKENS,
+        "process_pool_workers": PROCESS_POOL_WORKERS,
+        "work_max_active": WORK_MAX_ACTIVE,
+        "work_max_queued": WORK_MAX_QUEUED,
+        "work_queue_max_pending": WORK_QUEUE_MAX_PENDING,
+        "work_queue_policy": WORK_QUEUE_POLICY,
+        "transcriber_engine": TRANSCRIBER_ENGINE,
+        "whisper_model": WHISPER_MODEL,
+        "whisper_device": WHISPER_DEVICE,
+        "whisper_compute_type": WHISPER_COMPUTE_TYPE,
+        "whisper_workers": WHISPER_WORKERS,
+        "whisper_batch_size": WHISPER_BATCH_SIZE,
+        "whisper_beam_size": WHISPER_BEAM_SIZE,
+        "whisper_batch_wait_ms": WHISPER_BATCH_WAIT_MS,
+        "whisper_fallback": WHISPER_FALLBACK,
         # "tts_model": TTS_MODEL,
         # "tts_voice": TTS_VOICE,
         # "tts_format": TTS_FORMAT,
         "websocket_host": WEBSOCKET_HOST,
         "websocket_port": WEBSOCKET_PORT,
-        # "vad_threshold": VAD_THRESHOLD,
+        "vad_enabled": VAD_ENABLED,
+        "vad_threshold": VAD_THRESHOLD,
+        "vad_hangover_ms": VAD_HANGOVER_MS,
+        "vad_speech_pad_ms": VAD_SPEECH_PAD_MS,
+        "vad_max_utterance_s": VAD_MAX_UTTERANCE_S,
+        "vad_workers": VAD_WORKERS,
         # "vad_buffer_size": VAD_BUFFER_SIZE,
         # "audio_sample_rate": AUDIO_SAMPLE_RATE,
     }
@@ -4,10 +4,23 @@ import logging
 import uvicorn
 from fastapi import FastAPI, WebSocket, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 import os
 
+from services.transcriber_registry import create_transcriber
+from services.transcription_cache import TranscriptionCache
+# Importing the engines registers them
 from services.transcriber import DialogflowTranscriber
+from services.whisper_transcriber import WhisperTranscriber
+from services.dialogflow_sessions import DialogflowSessionManager
+from services.vad import get_vad_model
+from services.shared_context import get_shared_context
+from services.async_llm import get_llm_executor
+from services.work_queue import get_work_scheduler
+from services.process_pool import get_process_pool
+from services.tts_cache import CachedTTS, TTSCache
+from services.metrics import CONTENT_TYPE, get_metrics
 from services.tts import DialogflowTTS
 from services.llm import OpenAILLM
 from routes.websocket import websocket_endpoint
@@ -21,23 +34,130 @@ logger = logging.getLogger(__name__)
 transcription_service = None
 llm_service = None
 tts_service = None
+vad_service = None
+whisper_service = None
+process_pool = None
+tts_cache = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global transcription_service, llm_service, tts_service
+    global transcription_service, llm_service, tts_service, vad_service, whisper_service, process_pool, tts_cache
 
     cfg = config.get_config()
     logger.info("Initializing services...")
 
-    transcription_service = DialogflowTranscriber(
-        project_id=cfg["dialogflow_project_id"],
-        session_id="vocalis-session-001",
-        language_code="en-US",
-        credentials_path=cfg.get("google_credentials_path")
+    # Repeated audio (short commands, retries, replays) is answered from the cache
+    transcription_cache = None
+    if cfg["transcription_cache_entries"] > 0:
+        transcription_cache = TranscriptionCache(
+            max_entries=cfg["transcription_cache_entries"],
+            max_bytes=cfg["transcription_cache_max_bytes"],
+            disk_dir=cfg["transcription_cache_dir"] or None,
+            max_disk_entries=cfg["transcription_cache_disk_entries"]
+        )
+
+    # The local engine is loaded once, either as the transcriber or as Dialogflow's fallback
+    if cfg["transcriber_engine"] == "faster_whisper" or cfg["whisper_fallback"]:
+        whisper_service = create_transcriber(
+            "faster_whisper",
+            model_size=cfg["whisper_model"],
+            language_code="en-US",
+            device=cfg["whisper_device"],
+            compute_type=cfg["whisper_compute_type"],
+            num_workers=cfg["whisper_workers"],
+            batch_size=cfg["whisper_batch_size"],
+            beam_size=cfg["whisper_beam_size"],
+            batch_wait_ms=cfg["whisper_batch_wait_ms"],
+            # As Dialogflow's fallback, results are cached by Dialogflow's transcriber
+            cache=transcription_cache if cfg["transcriber_engine"] == "faster_whisper" else None
+        )
+
+    if cfg["transcriber_engine"] == "dialogflow":
+        # Each WebSocket connection gets its own Dialogflow session from the pool;
+        # session_id is only used for requests made outside a connection
+        session_manager = DialogflowSessionManager(
+            project_id=cfg["dialogflow_project_id"],
+            pool_size=cfg["dialogflow_channel_pool_size"],
+            max_sessions=cfg["dialogflow_max_sessions"],
+            session_ttl=cfg["dialogflow_session_ttl"]
+        )
+
+        transcription_service = create_transcriber(
+            "dialogflow",
+            project_id=cfg["dialogflow_project_id"],
+            session_id="vocalis-session-001",
+            language_code="en-US",
+            credentials_path=cfg.get("google_credentials_path"),
+            max_concurrent_requests=cfg["dialogflow_max_concurrent_requests"],
+            request_timeout=cfg["dialogflow_request_timeout"],
+            session_manager=session_manager,
+            fallback=whisper_service,
+            cache=transcription_cache
+        )
+    else:
+        transcription_service = whisper_service or create_transcriber(cfg["transcriber_engine"])
+
+    if cfg["vad_enabled"]:
+        vad_service = get_vad_model(
+            threshold=cfg["vad_threshold"],
+            hangover_ms=cfg["vad_hangover_ms"],
+            speech_pad_ms=cfg["vad_speech_pad_ms"],
+            max_utterance_s=cfg["vad_max_utterance_s"],
+            max_workers=cfg["vad_workers"]
+        )
+
+    # Size the shared pool that runs synchronous LLM calls off the event loop
+    llm_executor = get_llm_executor(max_workers=cfg["llm_max_workers"])
+
+    # Bound queued and concurrently processed utterances across all connections
+    work_scheduler = get_work_scheduler(
+        max_active=cfg["work_max_active"],
+        max_queued=cfg["work_max_queued"],
+        max_pending=cfg["work_queue_max_pending"],
+        policy=cfg["work_queue_policy"]
     )
 
+    # Start the worker processes for CPU-heavy audio work up front
+    if cfg["process_pool_workers"] > 0:
+        process_pool = get_process_pool(max_workers=cfg["process_pool_workers"])
+        await process_pool.warm_up()
+
+    # Repeated phrases (greetings, acknowledgements, fallbacks) are spoken from the cache
+    if cfg["tts_cache_max_bytes"] > 0:
+        tts_cache = TTSCache(
+            max_bytes=cfg["tts_cache_max_bytes"],
+            disk_dir=cfg["tts_cache_dir"] or None,
+            max_disk_bytes=cfg["tts_cache_max_disk_bytes"]
+        )
+        # One wrapper for all connections, so concurrent requests for a phrase share one synthesis
+        if tts_service is not None:
+            tts_service = CachedTTS(tts_service, tts_cache)
+            if cfg["tts_cache_warmup"]:
+                await tts_service.warm_up(cfg["tts_cache_warmup"])
+
+    # Queue depths and cache counters are read from their owners at scrape time
+    metrics = get_metrics()
+    metrics.register_stats("suarasemar_work", work_scheduler.stats)
+    if transcription_cache is not None:
+        metrics.register_stats("suarasemar_cache", transcription_cache.stats, {"cache": "transcription"})
+    if tts_cache is not None:
+        metrics.register_stats("suarasemar_cache", tts_cache.stats, {"cache": "tts"})
+
+    # Load prompt, profile and settings once for all connections and watch for edits
+    shared_context = get_shared_context()
+    shared_context.start_watching()
+
     logger.info("All services initialized successfully")
     yield
+    shared_context.stop_watching()
+    metrics.clear_collectors()
+    llm_executor.shutdown(wait=False, cancel_futures=True)
+    if vad_service is not None:
+        vad_service.shutdown()
+    if whisper_service is not None:
+        whisper_service.shutdown()
+    if process_pool is not None:
+        process_pool.shutdown()
     logger.info("Shutting down services... Shutdown complete")
 
 app = FastAPI(
@@ -75,13 +195,22 @@ async def health_check():
         "services": {
             "transcription": transcription_service is not None,
             "llm": llm_service is not None,
-            "tts": tts_service is not None
+            "tts": tts_service is not None,
+            "vad": vad_service is not None,
+            "local_transcription": whisper_service is not None,
+            "process_pool": process_pool is not None,
+            "tts_cache": tts_cache is not None
         },
         "config": {
             "dialogflow_project_id": config.DIALOGFLOW_PROJECT_ID
         }
     }
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    # Pipeline latencies, connections, queue depths and cache counters for Prometheus
+    return PlainTextResponse(get_metrics().render(), media_type=CONTENT_TYPE)
+
 @app.get("/config")
 async def get_full_config():
     if not all([transcription_service, llm_service, tts_service]):
@@ -96,7 +225,8 @@ async def get_full_config():
 
 # @app.websocket("/ws")
 # async def websocket_route(websocket: WebSocket):
-#     await websocket_endpoint(websocket, transcription_service, llm_service, tts_service)
+#     await websocket_endpoint(websocket, transcription_service, llm_service, tts_service, vad_service, process_pool,
+#                              config.GREETING_PREWARM, config.HISTORY_MAX_TOKENS)
 
 # if __name__ == "__main__":
 #     uvicorn.run(
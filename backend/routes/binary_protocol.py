@@ -0,0 +1,78 @@
+"""
+Binary WebSocket Frame Protocol
+
+Audio travels as binary WebSocket frames instead of base64 inside JSON.
+Each frame is a fixed 8-byte header followed by the raw payload:
+
+    version (uint8) | frame type (uint8) | flags (uint16) | sequence (uint32)
+
+All header fields are big-endian. JSON text frames are still used for
+control messages. Clients opt in by offering BINARY_SUBPROTOCOL when
+opening the WebSocket.
+"""
+
+import struct
+from typing import Tuple
+
+# WebSocket subprotocol a client offers to switch audio to binary frames
+BINARY_SUBPROTOCOL = "suarasemar.binary.v1"
+
+PROTOCOL_VERSION = 1
+
+_HEADER = struct.Struct("!BBHI")
+HEADER_SIZE = _HEADER.size
+
+# Binary frame types
+class FrameType:
+    # Client -> server
+    AUDIO_WAV = 0x01  # Complete utterance as a WAV file (or in the negotiated uplink codec)
+    AUDIO_PCM = 0x02  # Raw PCM chunk for the active audio stream (format set by audio_stream_start)
+
+    # Server -> client
+    TTS_AUDIO = 0x10  # Synthesized speech audio
+
+# Frame flags
+class FrameFlag:
+    END_OF_SEGMENT = 0x0001  # Last frame of an audio segment
+
+class FrameError(ValueError):
+    """Raised when a binary frame cannot be decoded."""
+
+def encode_frame(frame_type: int, payload: bytes, flags: int = 0, sequence: int = 0) -> bytes:
+    """
+    Build a binary frame.
+
+    Args:
+        frame_type: One of the FrameType values
+        payload: Frame payload
+        flags: Bitwise OR of FrameFlag values
+        sequence: Sequence number of the frame within its stream
+
+    Returns:
+        bytes: Header followed by the payload
+    """
+    header = _HEADER.pack(PROTOCOL_VERSION, frame_type, flags, sequence & 0xFFFFFFFF)
+    return b"".join((header, payload))
+
+def decode_frame(data: bytes) -> Tuple[int, int, int, memoryview]:
+    """
+    Parse a binary frame without copying its payload.
+
+    Args:
+        data: Raw frame received from the WebSocket
+
+    Returns:
+        Tuple[int, int, int, memoryview]:
+            - Frame type
+            - Flags
+            - Sequence number
+            - Payload view into `data`
+    """
+    if len(data) < HEADER_SIZE:
+        raise FrameError(f"Frame too short: {len(data)} bytes")
+
+    version, frame_type, flags, sequence = _HEADER.unpack_from(data)
+    if version != PROTOCOL_VERSION:
+        raise FrameError(f"Unsupported frame version: {version}")
+
+    return frame_type, flags, sequence, memoryview(data)[HEADER_SIZE:]
@@ -10,24 +10,99 @@ import asyncio
 import numpy as np
 import base64
 import os
-from typing import Dict, Any, List, Optional, AsyncGenerator
+import time
+import uuid
+from contextlib import aclosing
+from typing import Dict, Any, List, Optional, AsyncGenerator, AsyncIterator, Tuple, Union
 from fastapi import WebSocket, WebSocketDisconnect, BackgroundTasks
 from pydantic import BaseModel
 from datetime import datetime
 
-from ..services.transcription import WhisperTranscriber
+from ..services.transcriber_registry import Transcriber
 from ..services.llm import LLMClient
 from ..services.tts import TTSClient
 from ..services.conversation_storage import ConversationStorage
+from ..services.async_llm import AsyncLLM, LLMCancelledError
+from ..services.audio_input import AudioInput, resample_to_mono
+from ..services.audio_normalizer import AudioNormalizer
+from ..services.audio_codec import (
+    OPUS_SAMPLE_RATES,
+    UPLINK_CODECS,
+    AudioCodec,
+    OggOpusEncoder,
+    OpusStreamDecoder,
+    decode_audio,
+    supported_codecs,
+)
+from ..services.speech_pipeline import SpeechPipeline
+from ..services.shared_context import SharedContext, get_shared_context
+from ..services.vad import SileroVADModel, VADEvent, VADSegmenter
+from ..services.process_pool import AudioProcessPool
+from ..services.conversation_history import ConversationHistory, HistorySlot
+from ..services.work_queue import SubmitOutcome, WorkScheduler, get_work_scheduler
+from ..services.metrics import get_metrics
+from .binary_protocol import (
+    BINARY_SUBPROTOCOL,
+    FrameError,
+    FrameFlag,
+    FrameType,
+    decode_frame,
+    encode_frame,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Size of each binary TTS audio frame
+TTS_CHUNK_SIZE = 16 * 1024
+
+# TTS audio is Opus-encoded in blocks of this length when the client negotiated it
+TTS_ENCODE_BLOCK_S = 1.0
+
+# How long a barge-in waits for the interrupted response to unwind
+BARGE_IN_TIMEOUT = 0.5
+
+# Maximum number of PCM chunks buffered for a streaming recognition
+STREAM_QUEUE_MAX_CHUNKS = 500
+
+# Utterances and streamed audio are normalized to this rate (mono) before transcription
+TRANSCRIPTION_SAMPLE_RATE = 16000
+
+# Sample types a client may stream, by the "encoding" of audio_stream_start
+STREAM_ENCODINGS = {"pcm_s16le": "int16", "pcm_f32le": "float32"}
+
+# Voice pipeline stages timed in STAGE_SECONDS
+class Stage:
+    RECEIVE = "receive"  # Utterance parsed (and decoded) until queued
+    DECODE = "decode"  # Codec decoding and resampling to 16 kHz mono
+    VAD = "vad"  # Voice activity detection over one streamed chunk
+    STT = "stt"  # Transcription of an utterance
+    LLM_FIRST_TOKEN = "llm_first_token"
+    LLM_TOTAL = "llm_total"
+    TTS_FIRST_BYTE = "tts_first_byte"  # Response start until the first sentence's audio is ready
+    TTS_TOTAL = "tts_total"  # Response start until the last sentence's audio is ready
+    SEND = "send"  # Encoding and sending one sentence's audio
+    TOTAL = "total"  # Whole utterance, from dequeue to the last audio sent
+
+METRICS = get_metrics()
+STAGE_SECONDS = METRICS.histogram("suarasemar_stage_seconds", "Latency of each voice pipeline stage", ["stage"])
+UTTERANCES = METRICS.counter("suarasemar_utterances_total", "Utterances received, by queue outcome", ["outcome"])
+ERRORS = METRICS.counter("suarasemar_errors_total", "Failed pipeline steps", ["stage"])
+CONNECTIONS = METRICS.gauge("suarasemar_active_connections", "Open WebSocket connections")
+STREAM_CHUNKS_DROPPED = METRICS.counter(
+    "suarasemar_stream_chunks_dropped_total", "Streamed audio chunks dropped because recognition fell behind"
+)
+
 # WebSocket message types
 class MessageType:
     AUDIO = "audio"
+    AUDIO_STREAM_START = "audio_stream_start"
+    AUDIO_STREAM_CHUNK = "audio_stream_chunk"
+    AUDIO_STREAM_END = "audio_stream_end"
+    AUDIO_CODEC = "audio_codec"
     TRANSCRIPTION = "transcription"
+    TRANSCRIPTION_INTERIM = "transcription_interim"
     LLM_RESPONSE = "llm_response"
     TTS_CHUNK = "tts_chunk"
     TTS_START = "tts_start"
@@ -66,86 +141,113 @@ class WebSocketManager:
     
     def __init__(
         self,
-        transcriber: WhisperTranscriber,
+        transcriber: Transcriber,
         llm_client: LLMClient,
-        tts_client: TTSClient
+        tts_client: TTSClient,
+        vad_model: Optional[SileroVADModel] = None,
+        shared_context: Optional[SharedContext] = None,
+        work_scheduler: Optional[WorkScheduler] = None,
+        process_pool: Optional[AudioProcessPool] = None,
+        prewarm_greeting: bool = True,
+        history_max_tokens: int = 4000
     ):
         """
         Initialize the WebSocket manager.
         
         Args:
-            transcriber: Whisper transcription service
-            llm_client: LLM client service
-            tts_client: TTS client service
+            transcriber: Transcription service (any registered engine)
+            llm_client: LLM client service, shared by all connections (each gets its own history)
+            tts_client: TTS client service (a process-wide CachedTTS when phrases are cached)
+            vad_model: Shared VAD model for server-side endpointing (optional)
+            shared_context: Process-wide shared state (defaults to the global one)
+            work_scheduler: Process-wide utterance scheduler (defaults to the global one)
+            process_pool: Worker processes for CPU-heavy audio work (optional)
+            prewarm_greeting: Generate the greeting at connect time, before the client asks for it
+            history_max_tokens: Token budget of the conversation history (0 for no limit)
         """
         self.transcriber = transcriber
-        self.llm_client = llm_client
         self.tts_client = tts_client
+        self.vad_model = vad_model
+        self.process_pool = process_pool
+        
+        # Non-blocking view of the LLM client; sync clients run in a shared pool.
+        # The client is shared by all connections, so this connection talks
+        # to it through a view holding its own conversation history, and
+        # older turns are summarized once it outgrows its token budget
+        self.history_max_tokens = history_max_tokens
+        self.llm = AsyncLLM(llm_client).with_history(
+            ConversationHistory(llm_client.conversation_history, max_tokens=history_max_tokens)
+        )
+        self.llm_client = self.llm.llm_client
+        
+        # Streams LLM output into sentence-level TTS
+        self.speech_pipeline = SpeechPipeline(self.tts_client)
         
         # State tracking
+        self.connection_id = uuid.uuid4().hex  # Keys this connection's Dialogflow session
         self.active_connections: List[WebSocket] = []
         self.is_processing = False
         self.speech_buffer = []
         self.current_audio_task = None
+        self.audio_stream_queue: Optional[asyncio.Queue] = None
+        self.vad_segmenter: Optional[VADSegmenter] = None
+        self.stream_normalizer: Optional[AudioNormalizer] = None  # Set when streamed audio is not 16 kHz mono PCM
+        self.stream_decoder: Optional[OpusStreamDecoder] = None  # Set when streamed audio is Opus
+        self.uplink_codec = AudioCodec.PCM  # Negotiated with an audio_codec message
+        self.downlink_codec = AudioCodec.PCM
         self.interrupt_playback = asyncio.Event()
         self.current_vision_context = None  # Store the latest vision context
+        self.binary_frames = False  # Negotiated at connect
+        self.tts_sequence = 0
         
-        # File paths
-        self.prompt_path = os.path.join("prompts", "system_prompt.md")
-        self.profile_path = os.path.join("prompts", "user_profile.json")
-        self.vision_settings_path = os.path.join("prompts", "vision_settings.json")
+        # Greeting generated speculatively at connect; dropped if anything else comes first
+        self.prewarm_greeting = prewarm_greeting
+        self.prepared_greeting: Optional[asyncio.Task] = None
         
-        # Load system prompt, user profile, and vision settings
-        self.system_prompt = self._load_system_prompt()
-        self.user_profile = self._load_user_profile()
-        self.vision_settings = self._load_vision_settings()
+        # Utterances wait in a small bounded queue; stale ones are dropped or merged
+        self.work_queue = (work_scheduler or get_work_scheduler()).create_queue(merge=AudioInput.concat)
+        self.utterance_worker: Optional[asyncio.Task] = None
+        self.backpressure = False
+        self.stream_chunks_dropped = 0
         
-        # Initialize conversation storage
-        self.conversation_storage = ConversationStorage()
+        # System prompt, user profile, vision settings and conversation storage
+        # are loaded once per process and shared by all connections
+        self.shared = shared_context or get_shared_context()
         
         logger.info("Initialized WebSocket Manager")
     
-    def _load_system_prompt(self) -> str:
+    def _conversation_history(self) -> ConversationHistory:
         """
-        Load system prompt from file or use default if file doesn't exist.
+        Get this connection's conversation history as a bounded ConversationHistory.
         
-        Returns:
-            str: The system prompt
-        """
-        default_prompt = (
-            "You are a helpful, friendly, and concise voice assistant."
-            "Respond to user queries in a natural, conversational manner."
-            "Keep responses brief and to the point, as you're communicating via voice."
-            "When providing information, focus on the most relevant details."
-            "If you don't know something, admit it rather than making up an answer"
-            "\n\n"
-            "Through the webapp, you can receive and understand photographs and pictures."
-            "\n\n"
-            "When the user sends a message like '[silent]', '[no response]', or '[still waiting]', it means they've gone quiet or haven't responded."
-            "When you see these signals, continue the conversation naturally based on the previous topic and context."
-            "Stay on topic, be helpful, and don't mention that they were silent - just carry on the conversation as if you're gently following up."
-        )
-        
-        try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.prompt_path), exist_ok=True)
-            
-            # Read from file if it exists
-            if os.path.exists(self.prompt_path):
-                with open(self.prompt_path, "r") as f:
-                    prompt = f.read().strip()
-                    if prompt:  # Only use if not empty
-                        return prompt
-            
-            # If file doesn't exist or is empty, write default prompt
-            with open(self.prompt_path, "w") as f:
-                f.write(default_prompt)
-            
-            return default_prompt
-            
-        except Exception as e:
-            logger.error(f"Error loading system prompt: {e}")
-            return default_prompt
+        Histories the client replaced with plain lists (e.g. when cleared)
+        are converted in place.
+        """
+        history = self.llm_client.conversation_history
+        if not isinstance(history, ConversationHistory):
+            history = ConversationHistory(history, max_tokens=self.history_max_tokens)
+            self.llm_client.conversation_history = history
+        return history
+    
+    @property
+    def system_prompt(self) -> str:
+        """The shared system prompt."""
+        return self.shared.system_prompt
+    
+    @property
+    def user_profile(self) -> Dict[str, Any]:
+        """The shared user profile."""
+        return self.shared.user_profile
+    
+    @property
+    def vision_settings(self) -> Dict[str, Any]:
+        """The shared vision settings."""
+        return self.shared.vision_settings
+    
+    @property
+    def conversation_storage(self) -> ConversationStorage:
+        """The shared conversation storage."""
+        return self.shared.conversation_storage
     
     async def connect(self, websocket: WebSocket):
         """
@@ -154,17 +256,26 @@ class WebSocketManager:
         Args:
             websocket: The WebSocket connection
         """
-        await websocket.accept()
+        # Use binary audio frames if the client offers the subprotocol
+        self.binary_frames = BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+        await websocket.accept(subprotocol=BINARY_SUBPROTOCOL if self.binary_frames else None)
         self.active_connections.append(websocket)
+        CONNECTIONS.inc()
         
         # Send initial status
         await self._send_status(websocket, "connected", {
             "transcription_active": self.transcriber.is_processing,
             "llm_active": self.llm_client.is_processing,
-            "tts_active": self.tts_client.is_processing
+            "tts_active": self.tts_client.is_processing,
+            "binary_frames": self.binary_frames,
+            "codecs": supported_codecs()
         })
         
-        logger.info(f"Client connected. Active connections: {len(self.active_connections)}")
+        # Most clients ask for the greeting first, so have it ready when they do
+        if self.prewarm_greeting:
+            self.prepared_greeting = asyncio.create_task(self._prepare_greeting())
+        
+        logger.info(f"Client connected (binary_frames={self.binary_frames}). Active connections: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
         """
@@ -175,6 +286,24 @@ class WebSocketManager:
         """
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+            CONNECTIONS.dec()
+        
+        # Release any streaming recognition still waiting for audio
+        self._handle_audio_stream_end()
+        
+        # Stop any response still being generated for this client
+        self.interrupt_playback.set()
+        if self.prepared_greeting is not None:
+            self.prepared_greeting.cancel()
+            self.prepared_greeting = None
+        if self.current_audio_task and not self.current_audio_task.done():
+            self.current_audio_task.cancel()
+        if self.utterance_worker is not None:
+            self.utterance_worker.cancel()
+        self.work_queue.clear()
+        
+        # Free this connection's Dialogflow session
+        self.transcriber.release_session(self.connection_id)
         logger.info(f"Client disconnected. Active connections: {len(self.active_connections)}")
     
     async def _send_status(self, websocket: WebSocket, status: str, data: Dict[str, Any]):
@@ -209,37 +338,47 @@ class WebSocketManager:
             "details": details or {}
         })
     
-    async def handle_audio(self, websocket: WebSocket, audio_data: bytes):
+    async def handle_audio(
+        self,
+        websocket: WebSocket,
+        audio_data: Union[bytes, memoryview, AudioInput],
+        codec: str = AudioCodec.PCM
+    ):
         """
         Process incoming audio data from a WebSocket client.
         
         Args:
             websocket: The WebSocket connection
-            audio_data: Raw audio data
+            audio_data: WAV data (bytes or a memoryview of a binary frame), parsed PCM,
+                or a compressed file in `codec`
+            codec: AudioCodec of `audio_data`
         """
         try:
-            # We're receiving WAV data, so we need to parse the WAV header
-            # WAV format: 44-byte header followed by PCM data
-            # Let whisper handle the WAV data directly - it can parse WAV headers
-            audio_array = np.frombuffer(audio_data, dtype=np.uint8)
-            
-            # Interrupt any ongoing TTS playback
-            if self.tts_client.is_processing:
-                logger.info("Interrupting TTS playback due to new speech")
-                self.interrupt_playback.set()
-                
-                # Let any current processing finish before starting new
-                if self.current_audio_task and not self.current_audio_task.done():
-                    try:
-                        await self.current_audio_task
-                    except asyncio.CancelledError:
-                        logger.info("Previous audio task cancelled")
-            
-            # Process the audio segment in a background task
-            # Whisper will handle voice activity detection internally
-            self.current_audio_task = asyncio.create_task(
-                self._process_speech_segment(websocket, audio_array)
-            )
+            received = time.perf_counter()
+            if codec != AudioCodec.PCM:
+                # Decode compressed audio straight to 16 kHz mono, off the event loop
+                with STAGE_SECONDS.labels(Stage.DECODE).time():
+                    audio_array = await asyncio.to_thread(decode_audio, audio_data, codec, TRANSCRIPTION_SAMPLE_RATE)
+            elif isinstance(audio_data, AudioInput):
+                audio_array = audio_data
+            else:
+                # Parse the WAV header once, keeping a view of the PCM payload
+                audio_array = AudioInput.from_wav(audio_data)
+            
+            # Queue the utterance; when the queue is full, stale ones are dropped or merged
+            outcome = self.work_queue.submit(audio_array)
+            UTTERANCES.labels(outcome).inc()
+            STAGE_SECONDS.labels(Stage.RECEIVE).observe(time.perf_counter() - received)
+            await self._report_queue_pressure(websocket, outcome)
+            if outcome in (SubmitOutcome.SHED, SubmitOutcome.DROPPED_NEWEST):
+                return
+            
+            # Barge in on any response still in flight
+            await self._interrupt(websocket, "new_speech")
+            
+            # Queued utterances are processed one at a time in the background
+            if self.utterance_worker is None or self.utterance_worker.done():
+                self.utterance_worker = asyncio.create_task(self._run_utterance_worker(websocket))
             
             # Send processing status update
             await self._send_status(websocket, "audio_processing", {
@@ -248,93 +387,423 @@ class WebSocketManager:
                 
         except Exception as e:
             logger.error(f"Error processing audio: {e}")
+            ERRORS.labels(Stage.RECEIVE).inc()
             await self._send_error(websocket, f"Audio processing error: {str(e)}")
     
-    async def _process_speech_segment(self, websocket: WebSocket, speech_audio: np.ndarray):
+    async def _run_utterance_worker(self, websocket: WebSocket):
+        """
+        Process this connection's queued utterances in order.
+        
+        Each utterance waits for a free processing slot in the process-wide
+        scheduler before it is transcribed.
+        
+        Args:
+            websocket: The WebSocket connection
+        """
+        while True:
+            speech_audio = await self.work_queue.get()
+            try:
+                await self._report_queue_pressure(websocket)
+                task = asyncio.create_task(self._process_speech_segment(websocket, speech_audio))
+                self.current_audio_task = task
+                await asyncio.wait({task})
+            finally:
+                self.work_queue.task_done()
+    
+    async def _report_queue_pressure(self, websocket: WebSocket, outcome: Optional[str] = None):
+        """
+        Tell the client when utterances are being dropped or the queue level changes.
+        
+        Args:
+            websocket: The WebSocket connection
+            outcome: SubmitOutcome of the utterance just submitted, if any
+        """
+        scheduler = self.work_queue.scheduler
+        high = len(self.work_queue) >= self.work_queue.max_pending or scheduler.overloaded
+        lossy = outcome not in (None, SubmitOutcome.QUEUED)
+        if not lossy and high == self.backpressure:
+            return
+        
+        self.backpressure = high
+        if lossy:
+            logger.warning(f"Utterance {outcome} (queued={len(self.work_queue)}, overloaded={scheduler.overloaded})")
+        
+        await self._send_status(websocket, "backpressure", {
+            "level": "high" if high else "normal",
+            "outcome": outcome,
+            "queued": len(self.work_queue),
+            "capacity": self.work_queue.max_pending,
+            "overloaded": scheduler.overloaded
+        })
+    
+    async def _interrupt(self, websocket: WebSocket, reason: str):
+        """
+        Cancel the in-flight response, if any (barge-in).
+        
+        Cancelling the task aborts its whole tree: the pending Dialogflow
+        request, the LLM call and any TTS requests synthesizing ahead. The
+        wait for it to unwind is bounded by BARGE_IN_TIMEOUT, so the next
+        utterance starts right away even if a task is slow to stop.
+        
+        Args:
+            websocket: The WebSocket connection
+            reason: Why the response is interrupted
+        """
+        self.interrupt_playback.set()
+        
+        # Anything but the greeting itself means the pre-generated greeting goes unused
+        if reason != "greeting":
+            await self._discard_prepared_greeting()
+        
+        task, self.current_audio_task = self.current_audio_task, None
+        if task is None or task.done():
+            return
+        
+        start_time = time.perf_counter()
+        task.cancel()
+        done, _ = await asyncio.wait({task}, timeout=BARGE_IN_TIMEOUT)
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        
+        if done:
+            logger.info(f"Cancelled in-flight response ({reason}) in {latency_ms:.1f} ms")
+        else:
+            logger.warning(f"In-flight response still unwinding after {latency_ms:.1f} ms ({reason}), continuing")
+        
+        await self._send_status(websocket, "response_cancelled", {
+            "reason": reason,
+            "cancel_latency_ms": round(latency_ms, 1),
+            "completed": bool(done)
+        })
+    
+    async def _process_speech_segment(self, websocket: WebSocket, speech_audio: AudioInput):
         """
         Process a complete speech segment.
         
         Args:
             websocket: The WebSocket connection
-            speech_audio: Speech audio as numpy array
+            speech_audio: Speech audio as 16-bit PCM
         """
+        started = time.perf_counter()
+        stage = Stage.DECODE
         try:
             # Set processing flag
             self.is_processing = True
             self.interrupt_playback.clear()
             
-            # Transcribe speech
+            # Downmix and resample in a worker process, off the event loop and the GIL
+            # (or in a thread without one), so recognizers always get 16 kHz mono
+            if speech_audio.channels != 1 or speech_audio.sample_rate != TRANSCRIPTION_SAMPLE_RATE:
+                with STAGE_SECONDS.labels(Stage.DECODE).time():
+                    if self.process_pool is not None:
+                        samples = await self.process_pool.run_audio(resample_to_mono, speech_audio, TRANSCRIPTION_SAMPLE_RATE)
+                    else:
+                        samples = await asyncio.to_thread(resample_to_mono, speech_audio, TRANSCRIPTION_SAMPLE_RATE)
+                speech_audio = AudioInput.from_pcm(samples, TRANSCRIPTION_SAMPLE_RATE)
+            
+            # Transcribe speech without blocking other connections on this worker
+            stage = Stage.STT
             await self._send_status(websocket, "transcribing", {})
-            transcript, metadata = self.transcriber.transcribe(speech_audio)
+            with STAGE_SECONDS.labels(Stage.STT).time():
+                transcript, metadata = await self.transcriber.async_transcribe(speech_audio, self.connection_id)
+            if "error" in metadata:
+                ERRORS.labels(Stage.STT).inc()
             
-            # Send transcription result
+            stage = Stage.TOTAL
+            await self._respond_to_transcript(websocket, transcript, metadata)
+            STAGE_SECONDS.labels(Stage.TOTAL).observe(time.perf_counter() - started)
+            
+        except LLMCancelledError:
+            logger.info("LLM response cancelled by interrupt")
+        except Exception as e:
+            logger.error(f"Error processing speech segment: {e}")
+            ERRORS.labels(stage).inc()
+            await self._send_error(websocket, f"Speech processing error: {str(e)}")
+        finally:
+            self.is_processing = False
+    
+    async def _handle_audio_stream_start(
+        self,
+        websocket: WebSocket,
+        sample_rate: int,
+        server_vad: bool = False,
+        channels: int = 1,
+        encoding: str = "pcm_s16le"
+    ):
+        """
+        Start streaming audio from the client.
+        
+        Without server VAD the client decides the endpoints, so recognition
+        starts immediately. With server VAD the client streams continuously and
+        recognition starts and ends at the endpoints found by the VAD stage.
+        
+        Chunks in any other format than 16 kHz mono 16-bit PCM are normalized
+        to it as they arrive, so the VAD and recognizer see one format.
+        
+        Args:
+            websocket: The WebSocket connection
+            sample_rate: Sample rate of the PCM chunks that will follow
+            server_vad: Whether the server should detect speech endpoints
+            channels: Number of interleaved channels in each chunk
+            encoding: Sample type of the chunks ("pcm_s16le" or "pcm_f32le"), or an
+                Opus AudioCodec, in which case the chunks are pieces of an Ogg or WebM stream
+        """
+        # Close any stream the client forgot to end
+        self._handle_audio_stream_end()
+        
+        if encoding in (AudioCodec.OGG_OPUS, AudioCodec.WEBM_OPUS):
+            # Opus decodes straight to 16 kHz mono
+            self.stream_decoder = OpusStreamDecoder(encoding, TRANSCRIPTION_SAMPLE_RATE)
+            sample_rate = TRANSCRIPTION_SAMPLE_RATE
+        elif encoding not in STREAM_ENCODINGS:
+            await self._send_error(websocket, f"Unsupported audio stream encoding: {encoding}")
+            return
+        elif (sample_rate, channels, encoding) != (TRANSCRIPTION_SAMPLE_RATE, 1, "pcm_s16le"):
+            self.stream_normalizer = AudioNormalizer(sample_rate, channels, STREAM_ENCODINGS[encoding])
+            sample_rate = TRANSCRIPTION_SAMPLE_RATE
+        
+        if server_vad and self.vad_model is not None:
+            self.vad_segmenter = self.vad_model.create_segmenter(sample_rate)
+        else:
+            await self._start_recognition_stream(websocket, sample_rate)
+        
+        await self._send_status(websocket, "audio_streaming", {
+            "sample_rate": sample_rate,
+            "server_vad": self.vad_segmenter is not None,
+            "normalized": self.stream_normalizer is not None,
+            "codec": encoding if self.stream_decoder is not None else AudioCodec.PCM
+        })
+    
+    async def _start_recognition_stream(self, websocket: WebSocket, sample_rate: int):
+        """
+        Start a streaming recognition for an utterance that is still being spoken.
+        
+        Args:
+            websocket: The WebSocket connection
+            sample_rate: Sample rate of the PCM chunks that will follow
+        """
+        self._end_recognition_stream()
+        
+        # Barge in on any response still in flight
+        await self._interrupt(websocket, "new_speech")
+        
+        self.audio_stream_queue = asyncio.Queue(maxsize=STREAM_QUEUE_MAX_CHUNKS)
+        self.stream_chunks_dropped = 0
+        self.current_audio_task = asyncio.create_task(
+            self._process_audio_stream(websocket, self.audio_stream_queue, sample_rate)
+        )
+    
+    def _end_recognition_stream(self):
+        """Signal the end of the audio for the active streaming recognition."""
+        if self.audio_stream_queue is not None:
+            if self.audio_stream_queue.full():
+                # Make room for the end marker
+                self.audio_stream_queue.get_nowait()
+            self.audio_stream_queue.put_nowait(None)
+            self.audio_stream_queue = None
+    
+    async def _handle_audio_stream_chunk(self, websocket: WebSocket, audio_bytes: bytes):
+        """
+        Forward a PCM chunk to the active streaming recognition.
+        
+        With server VAD, only speech (plus padding) is forwarded and silence
+        is dropped before it reaches Dialogflow.
+        
+        Args:
+            websocket: The WebSocket connection
+            audio_bytes: Raw PCM audio, or compressed audio, in the format given at stream start
+        """
+        if self.stream_decoder is not None:
+            # Pages may be split across chunks; the decoder keeps the remainder
+            with STAGE_SECONDS.labels(Stage.DECODE).time():
+                audio_bytes = self.stream_decoder.feed(audio_bytes).tobytes()
+            if not audio_bytes:
+                return
+        elif self.stream_normalizer is not None:
+            # Chunks may split frames; the normalizer keeps the remainder
+            with STAGE_SECONDS.labels(Stage.DECODE).time():
+                audio_bytes = self.stream_normalizer.process(audio_bytes).tobytes()
+            if not audio_bytes:
+                return
+        
+        if self.vad_segmenter is None:
+            if self.audio_stream_queue is None:
+                logger.warning("Received audio stream chunk without an active stream, dropping")
+                return
+            await self._queue_stream_chunk(websocket, audio_bytes)
+            return
+        
+        with STAGE_SECONDS.labels(Stage.VAD).time():
+            vad_results = await self.vad_segmenter.process(audio_bytes)
+        for event, audio in vad_results:
+            if event == VADEvent.START:
+                await self._start_recognition_stream(websocket, self.vad_segmenter.sample_rate)
+                await self._send_status(websocket, "speech_started", {})
+            
+            if self.audio_stream_queue is not None and len(audio):
+                await self._queue_stream_chunk(websocket, audio.tobytes())
+            
+            if event == VADEvent.END:
+                self._end_recognition_stream()
+                await self._send_status(websocket, "speech_ended", {})
+    
+    async def _queue_stream_chunk(self, websocket: WebSocket, audio_bytes: bytes):
+        """
+        Buffer a PCM chunk for the active streaming recognition.
+        
+        If recognition falls behind and the buffer is full, new chunks are
+        dropped instead of buffered without bound, and the client is told once
+        per stream.
+        
+        Args:
+            websocket: The WebSocket connection
+            audio_bytes: Raw 16-bit PCM audio
+        """
+        try:
+            self.audio_stream_queue.put_nowait(audio_bytes)
+        except asyncio.QueueFull:
+            self.stream_chunks_dropped += 1
+            STREAM_CHUNKS_DROPPED.inc()
+            if self.stream_chunks_dropped == 1:
+                logger.warning("Streaming recognition is falling behind, dropping audio")
+                await self._send_status(websocket, "backpressure", {
+                    "level": "high",
+                    "outcome": SubmitOutcome.DROPPED_NEWEST,
+                    "stream": True
+                })
+    
+    def _handle_audio_stream_end(self):
+        """Stop streaming audio from the client."""
+        self.vad_segmenter = None
+        self.stream_normalizer = None
+        self.stream_decoder = None
+        self._end_recognition_stream()
+    
+    async def _process_audio_stream(self, websocket: WebSocket, queue: asyncio.Queue, sample_rate: int):
+        """
+        Run streaming recognition over queued PCM chunks, then respond to the final transcript.
+        
+        Args:
+            websocket: The WebSocket connection
+            queue: Queue of PCM chunks, terminated by None
+            sample_rate: Sample rate of the PCM chunks
+        """
+        async def audio_chunks():
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    return
+                yield chunk
+        
+        try:
+            self.is_processing = True
+            self.interrupt_playback.clear()
+            
+            transcript, metadata = "", {}
+            # With server VAD the endpoint comes from the VAD stage, not Dialogflow
+            single_utterance = self.vad_segmenter is None
+            results = self.transcriber.stream_transcribe(
+                audio_chunks(), sample_rate, single_utterance=single_utterance, connection_id=self.connection_id
+            )
+            async with aclosing(results):
+                async for text, is_final, result_metadata in results:
+                    if is_final:
+                        transcript, metadata = text, result_metadata
+                        break
+                    
+                    await websocket.send_json({
+                        "type": MessageType.TRANSCRIPTION_INTERIM,
+                        "text": text,
+                        "metadata": result_metadata,
+                        "timestamp": datetime.now().isoformat()
+                    })
+            
+            # Dialogflow may end the utterance before the client does
+            if self.audio_stream_queue is queue:
+                self.audio_stream_queue = None
+            
+            await self._respond_to_transcript(websocket, transcript, metadata)
+            
+        except LLMCancelledError:
+            logger.info("LLM response cancelled by interrupt")
+        except Exception as e:
+            logger.error(f"Error processing audio stream: {e}")
+            await self._send_error(websocket, f"Speech processing error: {str(e)}")
+        finally:
+            self.is_processing = False
+    
+    async def _respond_to_transcript(self, websocket: WebSocket, transcript: str, metadata: Dict[str, Any]):
+        """
+        Send a final transcript to the client and generate the spoken reply.
+        
+        Args:
+            websocket: The WebSocket connection
+            transcript: Final transcript of the utterance
+            metadata: Transcription metadata
+        """
+        # Send transcription result
+        await websocket.send_json({
+            "type": MessageType.TRANSCRIPTION,
+            "text": transcript,
+            "metadata": metadata,
+            "timestamp": datetime.now().isoformat()
+        })
+        
+        # Skip LLM and TTS if transcription is empty
+        if not transcript.strip():
+            logger.info("Empty transcription, skipping LLM and TTS")
+            
+            # Notify frontend that transcription occurred (even if it's just "...") to let it reset
             await websocket.send_json({
                 "type": MessageType.TRANSCRIPTION,
                 "text": transcript,
-                "metadata": metadata,
+                "metadata": {},
                 "timestamp": datetime.now().isoformat()
             })
-            
-            # Skip LLM and TTS if transcription is empty
-            if not transcript.strip():
-                logger.info("Empty transcription, skipping LLM and TTS")
-                
-                # Notify frontend that transcription occurred (even if it's just "...") to let it reset
-                await websocket.send_json({
-                    "type": MessageType.TRANSCRIPTION,
-                    "text": transcript,
-                    "metadata": {},
-                    "timestamp": datetime.now().isoformat()
-                })
 
-                # Still send TTS_END to fully reset UI
-                await websocket.send_json({
-                    "type": MessageType.TTS_END,
-                    "timestamp": datetime.now().isoformat()
-                })
-                return
-                
-            # Check if we have recent vision context to incorporate
-            has_vision_context = self.current_vision_context is not None
-            
-            if has_vision_context:
-                logger.info("Processing speech with vision context")
-                
-                # Add vision context to conversation history
-                self._add_vision_context_to_conversation(self.current_vision_context)
-                
-                # Enhance user query with vision context reference
-                enhanced_transcript = f"{transcript} [Note: This question refers to the image I just analyzed.]"
-                
-                # Get LLM response with vision-aware context
-                await self._send_status(websocket, "processing_llm", {"has_vision_context": True})
-                llm_response = self.llm_client.get_response(enhanced_transcript, self.system_prompt)
-                
-                # Clear vision context after use to avoid affecting future non-vision conversations
-                # Only clear after successful processing
-                self.current_vision_context = None
-                logger.info("Vision context processed and cleared")
-            else:
-                # Normal non-vision processing
-                await self._send_status(websocket, "processing_llm", {})
-                llm_response = self.llm_client.get_response(transcript, self.system_prompt)
-            
-            # Send LLM response
+            # Still send TTS_END to fully reset UI
             await websocket.send_json({
-                "type": MessageType.LLM_RESPONSE,
-                "text": llm_response["text"],
-                "metadata": {k: v for k, v in llm_response.items() if k != "text"},
+                "type": MessageType.TTS_END,
                 "timestamp": datetime.now().isoformat()
             })
+            return
             
-            # Generate and send TTS audio
-            await self._send_tts_response(websocket, llm_response["text"])
+        # Check if we have recent vision context to incorporate
+        has_vision_context = self.current_vision_context is not None
+        
+        if has_vision_context:
+            logger.info("Processing speech with vision context")
             
-        except Exception as e:
-            logger.error(f"Error processing speech segment: {e}")
-            await self._send_error(websocket, f"Speech processing error: {str(e)}")
-        finally:
-            self.is_processing = False
+            # Add vision context to conversation history
+            self._add_vision_context_to_conversation(self.current_vision_context)
+            
+            # Enhance user query with vision context reference
+            user_input = f"{transcript} [Note: This question refers to the image I just analyzed.]"
+            await self._send_status(websocket, "processing_llm", {"has_vision_context": True})
+        else:
+            # Normal non-vision processing
+            user_input = transcript
+            await self._send_status(websocket, "processing_llm", {})
+        
+        # Stream the LLM response straight into sentence-level TTS
+        tokens = self.llm.stream_response(user_input, self.system_prompt, cancel_event=self.interrupt_playback)
+        await self._stream_spoken_response(websocket, self._timed_tokens(tokens))
+        
+        if has_vision_context:
+            # Clear vision context after use to avoid affecting future non-vision conversations
+            # Only clear after successful processing
+            self.current_vision_context = None
+            logger.info("Vision context processed and cleared")
+    
+    async def _timed_tokens(self, tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Pass LLM tokens through, recording the time to the first token and to the end."""
+        started = time.perf_counter()
+        first = True
+        async for token in tokens:
+            if first:
+                STAGE_SECONDS.labels(Stage.LLM_FIRST_TOKEN).observe(time.perf_counter() - started)
+                first = False
+            yield token
+        STAGE_SECONDS.labels(Stage.LLM_TOTAL).observe(time.perf_counter() - started)
     
     async def _send_tts_response(self, websocket: WebSocket, text: str):
         """
@@ -348,31 +817,95 @@ class WebSocketManager:
             logger.info("Empty text for TTS, skipping")
             return
         
+        async def complete_text():
+            yield text
+        
+        await self._stream_spoken_response(websocket, complete_text(), send_text=False)
+    
+    async def _stream_spoken_response(self, websocket: WebSocket, tokens: AsyncIterator[str], send_text: bool = True):
+        """
+        Speak streamed text as it is produced.
+        
+        Sentences are synthesized while later ones are still being generated,
+        and each sentence's audio is sent as soon as it is ready, in order.
+        Time-to-first-audio therefore depends on the first sentence only.
+        Interrupts are checked between every chunk sent.
+        
+        Args:
+            websocket: The WebSocket connection
+            tokens: Streamed response text
+            send_text: Whether to send the growing response text as LLM_RESPONSE messages
+        """
+        await self._send_spoken_segments(websocket, self.speech_pipeline.run(tokens, self.interrupt_playback), send_text)
+    
+    async def _send_spoken_segments(
+        self,
+        websocket: WebSocket,
+        segments: AsyncIterator[Tuple[str, bytes]],
+        send_text: bool = True
+    ):
+        """
+        Send spoken sentences to the client as they become available.
+        
+        Args:
+            websocket: The WebSocket connection
+            segments: Each sentence with its audio, in order
+            send_text: Whether to send the growing response text as LLM_RESPONSE messages
+        """
+        start_time = time.time()
+        started = time.perf_counter()
+        sentences: List[str] = []
+        
         try:
-            # Signal TTS start
-            await websocket.send_json({
-                "type": MessageType.TTS_START,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            await self._send_status(websocket, "generating_speech", {})
+            async with aclosing(segments):
+                async for sentence, audio_data in segments:
+                    # Check if playback should be interrupted
+                    if self.interrupt_playback.is_set():
+                        logger.info("TTS generation interrupted")
+                        return
+                    
+                    last_ready = time.perf_counter()
+                    sentences.append(sentence)
+                    if send_text:
+                        await websocket.send_json({
+                            "type": MessageType.LLM_RESPONSE,
+                            "text": " ".join(sentences),
+                            "metadata": {"partial": True},
+                            "timestamp": datetime.now().isoformat()
+                        })
+                    
+                    if len(sentences) == 1:
+                        STAGE_SECONDS.labels(Stage.TTS_FIRST_BYTE).observe(last_ready - started)
+                        logger.info(f"First TTS audio ready after {time.time() - start_time:.2f}s")
+                        
+                        # Signal TTS start
+                        await websocket.send_json({
+                            "type": MessageType.TTS_START,
+                            "format": self._tts_format(),
+                            "timestamp": datetime.now().isoformat()
+                        })
+                        await self._send_status(websocket, "generating_speech", {})
+                    
+                    with STAGE_SECONDS.labels(Stage.SEND).time():
+                        sent = await self._send_tts_audio(websocket, audio_data, len(sentences) - 1)
+                    if not sent:
+                        logger.info("TTS streaming interrupted")
+                        return
             
-            # Get the complete audio file
-            audio_data = await self.tts_client.async_text_to_speech(text)
+            if sentences:
+                STAGE_SECONDS.labels(Stage.TTS_TOTAL).observe(last_ready - started)
             
-            # Check if playback should be interrupted
-            if self.interrupt_playback.is_set():
-                logger.info("TTS generation interrupted")
-                return
-            
-            # Encode and send the complete audio file
-            encoded_audio = base64.b64encode(audio_data).decode("utf-8")
-            await websocket.send_json({
-                "type": MessageType.TTS_CHUNK,
-                "audio_chunk": encoded_audio,
-                "format": self.tts_client.output_format,
-                "timestamp": datetime.now().isoformat()
-            })
+            if send_text:
+                await websocket.send_json({
+                    "type": MessageType.LLM_RESPONSE,
+                    "text": " ".join(sentences),
+                    "metadata": {
+                        "partial": False,
+                        "sentences": len(sentences),
+                        "total_time": time.time() - start_time
+                    },
+                    "timestamp": datetime.now().isoformat()
+                })
             
             # Signal TTS end
             if not self.interrupt_playback.is_set():
@@ -381,64 +914,130 @@ class WebSocketManager:
                     "timestamp": datetime.now().isoformat()
                 })
             
+        except LLMCancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error streaming TTS: {e}")
+            ERRORS.labels(Stage.TTS_TOTAL).inc()
             await self._send_error(websocket, f"TTS streaming error: {str(e)}")
     
-    def _load_user_profile(self) -> Dict[str, Any]:
+    async def _handle_audio_codec(self, websocket: WebSocket, uplink: str, downlink: str):
         """
-        Load user profile from file or create a default one if it doesn't exist.
+        Switch this connection's audio codecs.
         
-        Returns:
-            Dict[str, Any]: The user profile
+        The uplink codec is the default for utterances and audio streams that
+        do not name their encoding; the downlink codec is used for TTS audio.
+        
+        Args:
+            websocket: The WebSocket connection
+            uplink: AudioCodec for client audio
+            downlink: AudioCodec for TTS audio
         """
-        default_profile = {
-            "name": "",
-            "preferences": {}
-        }
+        available = supported_codecs()
+        if uplink not in available["uplink"] or downlink not in available["downlink"]:
+            await self._send_error(websocket, f"Unsupported audio codec: uplink={uplink}, downlink={downlink}", {
+                "codecs": available
+            })
+            return
         
-        try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.profile_path), exist_ok=True)
-            
-            # Read from file if it exists
-            if os.path.exists(self.profile_path):
-                with open(self.profile_path, "r") as f:
-                    profile = json.load(f)
-                    if profile:  # Only use if not empty
-                        return profile
-            
-            # If file doesn't exist or is empty, write default profile
-            with open(self.profile_path, "w") as f:
-                json.dump(default_profile, f, indent=2)
-            
-            return default_profile
+        self.uplink_codec = uplink
+        self.downlink_codec = downlink
+        logger.info(f"Audio codecs: uplink={uplink}, downlink={downlink}")
+        await self._send_status(websocket, "audio_codec", {"uplink": uplink, "downlink": downlink})
+    
+    def _tts_format(self) -> str:
+        """Format of the TTS audio sent to this client."""
+        if self.downlink_codec == AudioCodec.OGG_OPUS:
+            return AudioCodec.OGG_OPUS
+        return self.tts_client.output_format
+    
+    async def _encode_tts_audio(self, audio_data: bytes) -> AsyncIterator[bytes]:
+        """
+        Encode a segment's audio in the negotiated downlink codec.
+        
+        Opus is encoded block by block in a thread, so the first pages can be
+        sent before the whole segment is encoded. Audio that is not WAV, or a
+        connection without a compressed downlink, gets the audio unchanged.
+        
+        Args:
+            audio_data: Synthesized audio for one segment
             
-        except Exception as e:
-            logger.error(f"Error loading user profile: {e}")
-            return default_profile
+        Yields:
+            bytes: Consecutive pieces of the encoded segment
+        """
+        if self.downlink_codec != AudioCodec.OGG_OPUS or self.tts_client.output_format != "wav":
+            yield audio_data
+            return
+        
+        audio = AudioInput.from_wav(audio_data)
+        samples, sample_rate = audio.samples(), audio.sample_rate
+        if audio.channels != 1 or sample_rate not in OPUS_SAMPLE_RATES:
+            sample_rate = 48000
+            samples = await asyncio.to_thread(resample_to_mono, audio, sample_rate)
+        
+        encoder = OggOpusEncoder(sample_rate)
+        block = int(sample_rate * TTS_ENCODE_BLOCK_S)
+        for offset in range(0, len(samples), block):
+            yield await asyncio.to_thread(encoder.encode, samples[offset:offset + block])
+        yield encoder.flush()
+    
+    async def _send_tts_frame(self, websocket: WebSocket, payload: memoryview, flags: int = 0) -> bool:
+        """Send one binary TTS frame unless playback was interrupted."""
+        if self.interrupt_playback.is_set():
+            return False
+        await websocket.send_bytes(encode_frame(FrameType.TTS_AUDIO, payload, flags, self.tts_sequence))
+        self.tts_sequence += 1
+        return True
     
-    def _save_user_profile(self) -> bool:
+    async def _send_tts_audio(self, websocket: WebSocket, audio_data: bytes, segment: int = 0) -> bool:
         """
-        Save user profile to file.
+        Send the synthesized audio for one segment.
+        
+        Binary clients receive fixed-size frames, the last one flagged with
+        END_OF_SEGMENT. Legacy clients receive the segment as one base64 JSON
+        message, since they decode each TTS chunk as a complete audio file.
+        With an Opus downlink, binary frames are sent as encoding progresses.
         
+        Args:
+            websocket: The WebSocket connection
+            audio_data: Encoded audio bytes for the segment
+            segment: Index of the segment within the response
+            
         Returns:
-            bool: Whether the save was successful
-        """
-        try:
-            os.makedirs(os.path.dirname(self.profile_path), exist_ok=True)
-            with open(self.profile_path, "w") as f:
-                json.dump(self.user_profile, f, indent=2)
-            return True
-        except Exception as e:
-            logger.error(f"Error saving user profile: {e}")
+            bool: False if playback was interrupted before the segment was fully sent
+        """
+        if self.binary_frames:
+            # Frames are sent one behind, so the last one can be flagged
+            previous = None
+            async with aclosing(self._encode_tts_audio(audio_data)) as pieces:
+                async for piece in pieces:
+                    view = memoryview(piece)
+                    for offset in range(0, len(view), TTS_CHUNK_SIZE):
+                        if previous is not None and not await self._send_tts_frame(websocket, previous):
+                            return False
+                        previous = view[offset:offset + TTS_CHUNK_SIZE]
+            return previous is None or await self._send_tts_frame(websocket, previous, FrameFlag.END_OF_SEGMENT)
+        
+        if self.interrupt_playback.is_set():
             return False
+        
+        async with aclosing(self._encode_tts_audio(audio_data)) as pieces:
+            audio_data = b"".join([piece async for piece in pieces])
+        encoded_audio = base64.b64encode(audio_data).decode("utf-8")
+        await websocket.send_json({
+            "type": MessageType.TTS_CHUNK,
+            "audio_chunk": encoded_audio,
+            "format": self._tts_format(),
+            "segment": segment,
+            "timestamp": datetime.now().isoformat()
+        })
+        return True
     
     def _get_user_name(self) -> str:
         """Get the user's name from the profile, or empty string if not set."""
         return self.user_profile.get("name", "")
     
-    def _set_user_name(self, name: str) -> bool:
+    async def _set_user_name(self, name: str) -> bool:
         """
         Set the user's name in the profile.
         
@@ -449,7 +1048,7 @@ class WebSocketManager:
             bool: Whether the update was successful
         """
         self.user_profile["name"] = name
-        return self._save_user_profile()
+        return await self.shared.save_user_profile()
     
     def _get_greeting_prompt(self, is_returning_user: bool = False) -> str:
         """
@@ -519,43 +1118,111 @@ class WebSocketManager:
             "content": f"USER CONTEXT: The user's name is {user_name}."
         }
         
-        # Check if we already have a system prompt as the first message
-        if self.llm_client.conversation_history and self.llm_client.conversation_history[0]["role"] == "system":
-            # Check if we already have a user context message
-            if len(self.llm_client.conversation_history) > 1 and "USER CONTEXT" in self.llm_client.conversation_history[1].get("content", ""):
-                # Replace existing context message
-                self.llm_client.conversation_history[1] = context_message
-            else:
-                # Insert after system prompt
-                self.llm_client.conversation_history.insert(1, context_message)
-        else:
-            # No system prompt, add context as first message
-            self.llm_client.conversation_history.insert(0, context_message)
-            
+        # Placed right after the system prompt, replacing any previous context
+        self._conversation_history().set_slot(HistorySlot.USER_CONTEXT, context_message)
+        
         return True
 
+    async def _generate_greeting(self, instruction: str, cancel_event: Optional[asyncio.Event] = None) -> Dict[str, Any]:
+        """
+        Get the greeting text from the LLM, without the conversation so far.
+        
+        Args:
+            instruction: Greeting prompt from _get_greeting_prompt()
+            cancel_event: Event that cancels the call when set
+            
+        Returns:
+            Dict[str, Any]: The LLM response ("text" plus metadata)
+        """
+        # Get response from LLM through a view with an empty history, with moderate temperature,
+        # so the connection's history is neither read nor changed while the greeting is generated
+        # Use instruction as user message, not as system message
+        return await self.llm.with_history([]).get_response(
+            instruction, self.system_prompt, cancel_event=cancel_event,
+            add_to_history=False, temperature=0.7
+        )
+    
+    async def _prepare_greeting(self) -> Optional[Dict[str, Any]]:
+        """
+        Generate the greeting text and audio before the client asks for it.
+        
+        Returns:
+            Optional[Dict[str, Any]]: The system prompt and greeting prompt it was
+                generated for, the LLM response and its spoken segments, or None on failure
+        """
+        try:
+            start_time = time.time()
+            system_prompt = self.system_prompt
+            instruction = self._get_greeting_prompt(is_returning_user=len(self._conversation_history()) > 0)
+            llm_response = await self._generate_greeting(instruction)
+            
+            async def complete_text():
+                yield llm_response["text"]
+            
+            async with aclosing(self.speech_pipeline.run(complete_text())) as segments:
+                spoken = [segment async for segment in segments]
+            
+            logger.info(f"Pre-generated greeting in {time.time() - start_time:.2f}s")
+            return {
+                "system_prompt": system_prompt,
+                "instruction": instruction,
+                "response": llm_response,
+                "segments": spoken
+            }
+        except Exception as e:
+            logger.warning(f"Could not pre-generate greeting: {e}")
+            return None
+    
+    async def _take_prepared_greeting(self) -> Optional[Dict[str, Any]]:
+        """
+        Claim the pre-generated greeting, waiting for it if it is still being generated.
+        
+        Returns:
+            Optional[Dict[str, Any]]: The prepared greeting, or None if there is none
+        """
+        task, self.prepared_greeting = self.prepared_greeting, None
+        if task is None:
+            return None
+        return await task
+    
+    async def _discard_prepared_greeting(self):
+        """Cancel the pre-generated greeting so it stops using the LLM and TTS clients."""
+        task, self.prepared_greeting = self.prepared_greeting, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.wait({task}, timeout=BARGE_IN_TIMEOUT)
+    
     async def _handle_greeting(self, websocket: WebSocket):
         """
         Handle greeting request when user first clicks microphone.
+        
+        The greeting generated at connect is served if it is still valid
+        for the current system prompt, user name and history; otherwise a
+        new one is generated.
         """
         try:
-            # Check if user has conversation history
-            has_history = len(self.llm_client.conversation_history) > 0
+            self.interrupt_playback.clear()
+            
+            prepared = await self._take_prepared_greeting()
             
-            # Save current conversation history and temporarily clear it
-            saved_history = self.llm_client.conversation_history.copy()
-            self.llm_client.conversation_history = []
+            # Check if user has conversation history
+            has_history = len(self._conversation_history()) > 0
             
             # Get customized greeting prompt
             instruction = self._get_greeting_prompt(is_returning_user=has_history)
             
-            # Get response from LLM without adding to conversation history, with moderate temperature
-            # Use instruction as user message, not as system message
-            logger.info("Generating greeting")
-            llm_response = self.llm_client.get_response(instruction, self.system_prompt, add_to_history=False, temperature=0.7)
-            
-            # Restore saved conversation history
-            self.llm_client.conversation_history = saved_history
+            if (
+                prepared is not None
+                and prepared["instruction"] == instruction
+                and prepared["system_prompt"] == self.system_prompt
+            ):
+                logger.info("Serving pre-generated greeting")
+                llm_response = prepared["response"]
+                segments = prepared["segments"]
+            else:
+                logger.info("Generating greeting")
+                llm_response = await self._generate_greeting(instruction, self.interrupt_playback)
+                segments = None
             
             # Initialize conversation context with user information
             # This ensures the LLM knows the user's name in subsequent interactions
@@ -565,13 +1232,25 @@ class WebSocketManager:
             await websocket.send_json({
                 "type": MessageType.LLM_RESPONSE,
                 "text": llm_response["text"],
-                "metadata": {k: v for k, v in llm_response.items() if k != "text"},
+                "metadata": {
+                    **{k: v for k, v in llm_response.items() if k != "text"},
+                    "prepared": segments is not None
+                },
                 "timestamp": datetime.now().isoformat()
             })
             
             # Generate and send TTS audio
-            await self._send_tts_response(websocket, llm_response["text"])
+            if segments is None:
+                await self._send_tts_response(websocket, llm_response["text"])
+            elif segments:
+                async def prepared_segments():
+                    for segment in segments:
+                        yield segment
+                
+                await self._send_spoken_segments(websocket, prepared_segments(), send_text=False)
             
+        except LLMCancelledError:
+            logger.info("Greeting cancelled by interrupt")
         except Exception as e:
             logger.error(f"Error generating greeting: {e}")
             await self._send_error(websocket, f"Greeting error: {str(e)}")
@@ -585,8 +1264,9 @@ class WebSocketManager:
             tier: Current follow-up tier (0-2)
         """
         try:
-            # Save full conversation history
-            full_history = self.llm_client.conversation_history.copy()
+            self.interrupt_playback.clear()
+            
+            full_history = self._conversation_history()
             
             # Extract recent conversation context (keeping last few exchanges)
             context_messages = []
@@ -603,18 +1283,16 @@ class WebSocketManager:
             num_context_messages = min(6, len(recent_history))
             context_messages.extend(recent_history[-num_context_messages:])
             
-            # Temporarily set conversation history to just these context messages
-            self.llm_client.conversation_history = context_messages
-            
             # Select appropriate silence indicator based on tier
             user_input = "[silent]" if tier == 0 else "[no response]" if tier == 1 else "[still waiting]"
             
-            # Generate the follow-up with the silence indicator as user input
+            # Generate the follow-up with the silence indicator as user input,
+            # through a view that sees only the context messages
             logger.info(f"Generating contextual follow-up (tier {tier+1})")
-            llm_response = self.llm_client.get_response(user_input, self.system_prompt, add_to_history=False, temperature=0.7)
-            
-            # Restore original conversation history
-            self.llm_client.conversation_history = full_history
+            llm_response = await self.llm.with_history(context_messages).get_response(
+                user_input, self.system_prompt, cancel_event=self.interrupt_playback,
+                add_to_history=False, temperature=0.7
+            )
             
             # Send LLM response
             await websocket.send_json({
@@ -627,6 +1305,8 @@ class WebSocketManager:
             # Generate and send TTS audio
             await self._send_tts_response(websocket, llm_response["text"])
             
+        except LLMCancelledError:
+            logger.info("Silent follow-up cancelled by interrupt")
         except Exception as e:
             logger.error(f"Error generating silent follow-up: {e}")
             await self._send_error(websocket, f"Follow-up error: {str(e)}")
@@ -701,7 +1381,9 @@ class WebSocketManager:
                 return
             
             # Update LLM client's conversation history
-            self.llm_client.conversation_history = session.get("messages", [])
+            self.llm_client.conversation_history = ConversationHistory(
+                session.get("messages", []), max_tokens=self.history_max_tokens
+            )
             
             # Send confirmation
             await websocket.send_json({
@@ -719,21 +1401,41 @@ class WebSocketManager:
             logger.error(f"Error loading session: {e}")
             await self._send_error(websocket, f"Failed to load conversation: {str(e)}")
     
-    async def _handle_list_sessions(self, websocket: WebSocket):
+    async def _handle_list_sessions(
+        self,
+        websocket: WebSocket,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        query: Optional[str] = None
+    ):
         """
         Handle list sessions request.
         
+        Sessions are listed from the storage index without their messages,
+        most recently updated first. Clients that page through them pass
+        `limit` and `offset`; without a limit every session is listed.
+        
         Args:
             websocket: The WebSocket connection
+            limit: Maximum number of sessions to send (None for all)
+            offset: Number of sessions to skip
+            query: Only sessions whose title contains this text
         """
         try:
-            # Get sessions (now async)
-            sessions = await self.conversation_storage.list_sessions()
+            # Read one page from the index, and the total only when paging
+            sessions = await self.conversation_storage.list_sessions(limit=limit, offset=offset, query=query)
+            if limit is None:
+                total = offset + len(sessions)
+            else:
+                total = await self.conversation_storage.count_sessions(query=query)
 
             # Send list
             await websocket.send_json({
                 "type": MessageType.LIST_SESSIONS_RESULT,
                 "sessions": sessions,
+                "offset": offset,
+                "total": total,
+                "has_more": offset + len(sessions) < total,
                 "timestamp": datetime.now().isoformat()
             })
             
@@ -772,6 +1474,36 @@ class WebSocketManager:
             logger.error(f"Error deleting session: {e}")
             await self._send_error(websocket, f"Failed to delete conversation: {str(e)}")
     
+    async def handle_binary_frame(self, websocket: WebSocket, data: bytes):
+        """
+        Handle a binary audio frame from a WebSocket client.
+        
+        Args:
+            websocket: The WebSocket connection
+            data: Raw frame (header followed by payload)
+        """
+        try:
+            frame_type, flags, sequence, payload = decode_frame(data)
+            
+            if frame_type == FrameType.AUDIO_WAV:
+                # Complete utterance, same as the JSON audio message
+                await self.handle_audio(websocket, payload, self.uplink_codec)
+                
+            elif frame_type == FrameType.AUDIO_PCM:
+                # Chunk for the active streaming recognition
+                await self._handle_audio_stream_chunk(websocket, payload)
+                
+            else:
+                logger.warning(f"Unknown binary frame type: {frame_type}")
+                await self._send_error(websocket, f"Unknown binary frame type: {frame_type}")
+                
+        except FrameError as e:
+            logger.error(f"Invalid binary frame: {e}")
+            await self._send_error(websocket, f"Invalid binary frame: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error handling binary frame: {e}")
+            await self._send_error(websocket, f"Binary frame handling error: {str(e)}")
+    
     async def handle_client_message(self, websocket: WebSocket, message: Dict[str, Any]):
         """
         Handle a message from a WebSocket client.
@@ -788,7 +1520,40 @@ class WebSocketManager:
                 audio_base64 = message.get("audio_data", "")
                 if audio_base64:
                     audio_bytes = base64.b64decode(audio_base64)
-                    await self.handle_audio(websocket, audio_bytes)
+                    if message.get("encoding") == "pcm_s16le":
+                        # Raw PCM with explicit metadata, no WAV header to parse
+                        sample_rate = int(message.get("sample_rate", 16000))
+                        channels = int(message.get("channels", 1))
+                        await self.handle_audio(websocket, AudioInput.from_pcm(audio_bytes, sample_rate, channels))
+                    else:
+                        # A WAV file, or a compressed file in the negotiated uplink codec
+                        codec = message.get("encoding", self.uplink_codec)
+                        await self.handle_audio(websocket, audio_bytes, codec if codec in UPLINK_CODECS else AudioCodec.PCM)
+            
+            elif message_type == MessageType.AUDIO_STREAM_START:
+                # Start streaming recognition of raw PCM chunks
+                sample_rate = int(message.get("sample_rate", 16000))
+                server_vad = bool(message.get("server_vad", False))
+                channels = int(message.get("channels", 1))
+                default_encoding = self.uplink_codec if self.uplink_codec != AudioCodec.PCM else "pcm_s16le"
+                encoding = message.get("encoding", default_encoding)
+                await self._handle_audio_stream_start(websocket, sample_rate, server_vad, channels, encoding)
+            
+            elif message_type == MessageType.AUDIO_STREAM_CHUNK:
+                # Forward a PCM chunk to the active stream
+                audio_base64 = message.get("audio_data", "")
+                if audio_base64:
+                    await self._handle_audio_stream_chunk(websocket, base64.b64decode(audio_base64))
+            
+            elif message_type == MessageType.AUDIO_STREAM_END:
+                # Client-side end of utterance
+                self._handle_audio_stream_end()
+            
+            elif message_type == MessageType.AUDIO_CODEC:
+                # Negotiate compressed audio for this connection
+                uplink = message.get("uplink", self.uplink_codec)
+                downlink = message.get("downlink", self.downlink_codec)
+                await self._handle_audio_codec(websocket, uplink, downlink)
                     
             elif message_type == MessageType.VISION_FILE_UPLOAD:
                 # Handle vision image upload
@@ -799,12 +1564,13 @@ class WebSocketManager:
             elif message_type == "interrupt":
                 # Handle interrupt request
                 logger.info("Received interrupt request from client")
-                self.interrupt_playback.set()
+                await self._interrupt(websocket, "client_interrupt")
                 await self._send_status(websocket, "interrupted", {})
                 
             elif message_type == "clear_history":
                 # Clear conversation history
                 self.llm_client.clear_history(keep_system_prompt=True)
+                self._conversation_history()
                 
                 # Reinitialize conversation context to maintain user name awareness
                 # This ensures the LLM retains knowledge of the user's name even after history is cleared
@@ -814,13 +1580,15 @@ class WebSocketManager:
                 await self._send_status(websocket, "history_cleared", {})
                 
             elif message_type == MessageType.GREETING:
-                # Handle greeting request
-                await self._handle_greeting(websocket)
+                # Handle greeting request in the background so interrupts are still received
+                await self._interrupt(websocket, "greeting")
+                self.current_audio_task = asyncio.create_task(self._handle_greeting(websocket))
                 
             elif message_type == MessageType.SILENT_FOLLOWUP:
-                # Handle silent follow-up
+                # Handle silent follow-up in the background so interrupts are still received
                 tier = message.get("tier", 0)
-                await self._handle_silent_followup(websocket, tier)
+                await self._interrupt(websocket, "silent_followup")
+                self.current_audio_task = asyncio.create_task(self._handle_silent_followup(websocket, tier))
                 
             elif message_type == "get_system_prompt":
                 # Send current system prompt to client
@@ -868,8 +1636,14 @@ class WebSocketManager:
                 await self._handle_load_session(websocket, session_id)
                 
             elif message_type == MessageType.LIST_SESSIONS:
-                # List available sessions
-                await self._handle_list_sessions(websocket)
+                # List available sessions, optionally one page at a time
+                limit = message.get("limit")
+                await self._handle_list_sessions(
+                    websocket,
+                    limit=int(limit) if limit is not None else None,
+                    offset=int(message.get("offset", 0)),
+                    query=message.get("query") or None
+                )
                 
             elif message_type == MessageType.DELETE_SESSION:
                 # Delete a session
@@ -927,7 +1701,7 @@ class WebSocketManager:
         """
         try:
             # Update name
-            success = self._set_user_name(name)
+            success = await self._set_user_name(name)
             
             # Update conversation context with the new name
             if success:
@@ -969,54 +1743,6 @@ class WebSocketManager:
             logger.error(f"Error sending system prompt: {e}")
             await self._send_error(websocket, f"Error sending system prompt: {str(e)}")
     
-    def _load_vision_settings(self) -> Dict[str, Any]:
-        """
-        Load vision settings from file or create a default one if it doesn't exist.
-        
-        Returns:
-            Dict[str, Any]: The vision settings
-        """
-        default_settings = {
-            "enabled": False
-        }
-        
-        try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.vision_settings_path), exist_ok=True)
-            
-            # Read from file if it exists
-            if os.path.exists(self.vision_settings_path):
-                with open(self.vision_settings_path, "r") as f:
-                    settings = json.load(f)
-                    if settings:  # Only use if not empty
-                        return settings
-            
-            # If file doesn't exist or is empty, write default settings
-            with open(self.vision_settings_path, "w") as f:
-                json.dump(default_settings, f, indent=2)
-            
-            return default_settings
-            
-        except Exception as e:
-            logger.error(f"Error loading vision settings: {e}")
-            return default_settings
-    
-    def _save_vision_settings(self) -> bool:
-        """
-        Save vision settings to file.
-        
-        Returns:
-            bool: Whether the save was successful
-        """
-        try:
-            os.makedirs(os.path.dirname(self.vision_settings_path), exist_ok=True)
-            with open(self.vision_settings_path, "w") as f:
-                json.dump(self.vision_settings, f, indent=2)
-            return True
-        except Exception as e:
-            logger.error(f"Error saving vision settings: {e}")
-            return False
-    
     async def _handle_get_vision_settings(self, websocket: WebSocket):
         """
         Send the current vision settings to the client.
@@ -1048,7 +1774,7 @@ class WebSocketManager:
             self.vision_settings["enabled"] = enabled
             
             # Save to file
-            success = self._save_vision_settings()
+            success = await self.shared.save_vision_settings()
             
             # Send confirmation
             await websocket.send_json({
@@ -1076,18 +1802,13 @@ class WebSocketManager:
                 await self._send_error(websocket, "System prompt cannot be empty")
                 return
             
-            # Update in memory
-            self.system_prompt = new_prompt
-            
-            # Save to file
-            os.makedirs(os.path.dirname(self.prompt_path), exist_ok=True)
-            with open(self.prompt_path, "w") as f:
-                f.write(new_prompt)
+            # Update in memory and save to file
+            success = await self.shared.save_system_prompt(new_prompt)
             
             # Send confirmation
             await websocket.send_json({
                 "type": MessageType.SYSTEM_PROMPT_UPDATED,
-                "success": True,
+                "success": success,
                 "timestamp": datetime.now().isoformat()
             })
             
@@ -1109,22 +1830,9 @@ class WebSocketManager:
             "content": f"[VISION CONTEXT]: {vision_context}"
         }
         
-        # If conversation history is empty, add it as the first message
-        # Otherwise, insert after the main system prompt
-        if not self.llm_client.conversation_history:
-            self.llm_client.conversation_history.append(vision_message)
-        else:
-            # Find the last system message that's not a vision context
-            last_system_idx = -1
-            for i, msg in enumerate(self.llm_client.conversation_history):
-                if msg["role"] == "system" and not msg["content"].startswith("[VISION CONTEXT]"):
-                    last_system_idx = i
-            
-            # Insert after the last system message, or at the beginning if none found
-            if last_system_idx >= 0:
-                self.llm_client.conversation_history.insert(last_system_idx + 1, vision_message)
-            else:
-                self.llm_client.conversation_history.insert(0, vision_message)
+        # Placed after the system prompt and user context; a previous image is
+        # replaced and noted in the conversation summary
+        self._conversation_history().set_slot(HistorySlot.VISION, vision_message)
     
     async def _handle_vision_file_upload(self, websocket: WebSocket, image_base64: str):
         """
@@ -1187,21 +1895,32 @@ class WebSocketManager:
 
 async def websocket_endpoint(
     websocket: WebSocket,
-    transcriber: WhisperTranscriber,
+    transcriber: Transcriber,
     llm_client: LLMClient,
-    tts_client: TTSClient
+    tts_client: TTSClient,
+    vad_model: Optional[SileroVADModel] = None,
+    process_pool: Optional[AudioProcessPool] = None,
+    prewarm_greeting: bool = True,
+    history_max_tokens: int = 4000
 ):
     """
     FastAPI WebSocket endpoint.
     
     Args:
         websocket: The WebSocket connection
-        transcriber: Whisper transcription service
+        transcriber: Transcription service (any registered engine)
         llm_client: LLM client service
-        tts_client: TTS client service
+        tts_client: TTS client service (a process-wide CachedTTS when phrases are cached)
+        vad_model: Shared VAD model for server-side endpointing (optional)
+        process_pool: Worker processes for CPU-heavy audio work (optional)
+        prewarm_greeting: Generate the greeting at connect time, before the client asks for it
+        history_max_tokens: Token budget of the conversation history (0 for no limit)
     """
-    # Create WebSocket manager
-    manager = WebSocketManager(transcriber, llm_client, tts_client)
+    # Create the per-connection manager on top of the shared context
+    manager = WebSocketManager(
+        transcriber, llm_client, tts_client, vad_model, get_shared_context(), get_work_scheduler(), process_pool,
+        prewarm_greeting, history_max_tokens
+    )
     
     try:
         # Accept connection
@@ -1212,12 +1931,18 @@ async def websocket_endpoint(
             try:
                 # Receive message with a timeout
                 message = await asyncio.wait_for(
-                    websocket.receive_json(),
+                    websocket.receive(),
                     timeout=30.0  # 30 second timeout
                 )
                 
-                # Process message
-                await manager.handle_client_message(websocket, message)
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                
+                # Binary frames carry audio, text frames carry JSON control messages
+                if message.get("bytes") is not None:
+                    await manager.handle_binary_frame(websocket, message["bytes"])
+                else:
+                    await manager.handle_client_message(websocket, json.loads(message["text"]))
                 
             except asyncio.TimeoutError:
                 # Send a ping to keep the connection alive
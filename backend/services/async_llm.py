@@ -0,0 +1,223 @@
+# Async LLM Interface
+
+import asyncio
+import copy
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class LLMCancelledError(Exception):
+    """Raised when an LLM call is cancelled through its cancel event."""
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_llm_executor(max_workers: int = 8) -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool for synchronous LLM clients.
+
+    Args:
+        max_workers: Pool size used when the pool is first created
+
+    Returns:
+        ThreadPoolExecutor: The shared pool
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        return _executor
+
+class AsyncLLM:
+    """
+    Non-blocking facade over an LLM client.
+
+    Clients with native async methods (`async_get_response`,
+    `async_stream_response`) are awaited directly. Synchronous clients run in
+    a bounded, process-wide thread pool, so a long generation for one
+    connection never blocks the event loop for the others.
+
+    Every call takes an optional cancel event (the connection's
+    interrupt_playback). Setting it abandons the call immediately with
+    LLMCancelledError. A synchronous call that is already running in a
+    thread cannot be stopped; its result is discarded when it finishes, and
+    a synchronous stream stops at the next token.
+    """
+
+    def __init__(self, llm_client, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Wrap an LLM client.
+
+        Args:
+            llm_client: Client exposing get_response() and, optionally,
+                stream_response() or their async_ variants
+            executor: Pool for synchronous calls (defaults to the shared pool)
+        """
+        self.llm_client = llm_client
+        self.executor = executor or get_llm_executor()
+
+    @property
+    def conversation_history(self):
+        """The wrapped client's conversation history."""
+        return self.llm_client.conversation_history
+
+    def with_history(self, messages: List[Dict[str, Any]]) -> "AsyncLLM":
+        """
+        Get a view of the client that uses its own conversation history.
+
+        The view wraps a shallow copy of the client, so it shares the
+        client's connection and settings but reads and writes only
+        `messages`. Calls through it never touch the original client's
+        history, even when they are abandoned while still running in a thread.
+
+        Args:
+            messages: Conversation history of the view
+
+        Returns:
+            AsyncLLM: The view, using the same executor
+        """
+        client = copy.copy(self.llm_client)
+        client.conversation_history = messages
+        return AsyncLLM(client, self.executor)
+
+    async def get_response(
+        self,
+        user_input: str,
+        system_prompt: Optional[str] = None,
+        cancel_event: Optional[asyncio.Event] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Get a complete response without blocking the event loop.
+
+        Args:
+            user_input: User message
+            system_prompt: System prompt
+            cancel_event: Event that cancels the call when set
+            **kwargs: Passed through to the client (add_to_history, temperature, ...)
+
+        Returns:
+            Dict[str, Any]: The client's response dictionary ("text" plus metadata)
+        """
+        native = getattr(self.llm_client, "async_get_response", None)
+        if native is not None:
+            call = native(user_input, system_prompt, **kwargs)
+        else:
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(
+                self.executor,
+                partial(self.llm_client.get_response, user_input, system_prompt, **kwargs)
+            )
+        return await self._cancellable(call, cancel_event)
+
+    async def stream_response(
+        self,
+        user_input: str,
+        system_prompt: Optional[str] = None,
+        cancel_event: Optional[asyncio.Event] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream response tokens as they are generated.
+
+        Clients without any streaming method produce a single chunk holding
+        the complete response.
+
+        Args:
+            user_input: User message
+            system_prompt: System prompt
+            cancel_event: Event that cancels the stream when set
+            **kwargs: Passed through to the client
+
+        Yields:
+            str: Text chunks in order
+        """
+        native = getattr(self.llm_client, "async_stream_response", None)
+        if native is not None:
+            stream = native(user_input, system_prompt, **kwargs)
+            try:
+                while True:
+                    try:
+                        token = await self._cancellable(stream.__anext__(), cancel_event)
+                    except StopAsyncIteration:
+                        return
+                    yield token
+            finally:
+                await stream.aclose()
+
+        elif hasattr(self.llm_client, "stream_response"):
+            async for token in self._stream_in_thread(user_input, system_prompt, cancel_event, **kwargs):
+                yield token
+
+        else:
+            response = await self.get_response(user_input, system_prompt, cancel_event, **kwargs)
+            yield response["text"]
+
+    async def _stream_in_thread(
+        self,
+        user_input: str,
+        system_prompt: Optional[str],
+        cancel_event: Optional[asyncio.Event],
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Drive a synchronous token generator in the pool and hand tokens to the loop."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for token in self.llm_client.stream_response(user_input, system_prompt, **kwargs):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, token)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        loop.run_in_executor(self.executor, produce)
+        try:
+            while True:
+                item = await self._cancellable(queue.get(), cancel_event)
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # The thread notices `stop` at its next token and frees its pool slot
+            stop.set()
+
+    async def _cancellable(self, call: Awaitable, cancel_event: Optional[asyncio.Event]):
+        """Await `call`, abandoning it as soon as `cancel_event` is set."""
+        if cancel_event is None:
+            return await call
+        if cancel_event.is_set():
+            if asyncio.isfuture(call):
+                call.cancel()
+            elif hasattr(call, "close"):
+                call.close()
+            raise LLMCancelledError("LLM call cancelled")
+
+        call_task = asyncio.ensure_future(call)
+        cancel_task = asyncio.ensure_future(cancel_event.wait())
+        try:
+            await asyncio.wait((call_task, cancel_task), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            cancel_task.cancel()
+            if not call_task.done():
+                call_task.cancel()
+                # Let the cancellation land before the caller touches the client again
+                await asyncio.gather(call_task, return_exceptions=True)
+
+        if call_task.cancelled():
+            raise LLMCancelledError("LLM call cancelled")
+        return call_task.result()
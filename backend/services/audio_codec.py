@@ -0,0 +1,500 @@
+# Compressed Audio Transport (Opus in Ogg/WebM)
+
+import logging
+import struct
+from typing import List, Optional
+
+import numpy as np
+
+from .audio_input import AudioInput, BufferLike
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sample rates libopus encodes and decodes at; granule positions are always in 48 kHz samples
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+OPUS_GRANULE_RATE = 48000
+
+# Longest Opus packet (120 ms) and the encoder lookahead libopus reports at its default settings
+OPUS_MAX_FRAME_MS = 120
+OPUS_PRE_SKIP = 312
+
+# Downlink encoder settings: speech-tuned bitrate and 20 ms frames
+DEFAULT_BITRATE = 24000
+DEFAULT_FRAME_MS = 20
+
+# Vendor string written to the OpusTags header
+VENDOR = b"suarasemar"
+
+# Audio codecs a connection can negotiate
+class AudioCodec:
+    PCM = "pcm"  # Uncompressed: WAV or raw PCM up, TTS audio as synthesized down
+    OGG_OPUS = "ogg_opus"  # Opus in Ogg pages (uplink and downlink)
+    WEBM_OPUS = "webm_opus"  # Opus in WebM clusters, as MediaRecorder writes it (uplink only)
+
+UPLINK_CODECS = (AudioCodec.PCM, AudioCodec.OGG_OPUS, AudioCodec.WEBM_OPUS)
+DOWNLINK_CODECS = (AudioCodec.PCM, AudioCodec.OGG_OPUS)
+
+class CodecError(ValueError):
+    """Raised when compressed audio cannot be demuxed or decoded."""
+
+def _import_opuslib():
+    try:
+        import opuslib
+    except ImportError as e:
+        raise CodecError("Opus support requires the opuslib package and libopus") from e
+    return opuslib
+
+def opus_available() -> bool:
+    """Whether Opus encoding and decoding are available in this process."""
+    try:
+        _import_opuslib()
+    except CodecError:
+        return False
+    return True
+
+def supported_codecs() -> dict:
+    """
+    Codecs this server can use, as offered to clients at connect.
+
+    Returns:
+        dict: "uplink" and "downlink" lists of AudioCodec values
+    """
+    if not opus_available():
+        return {"uplink": [AudioCodec.PCM], "downlink": [AudioCodec.PCM]}
+    return {"uplink": list(UPLINK_CODECS), "downlink": list(DOWNLINK_CODECS)}
+
+def parse_opus_head(packet: bytes) -> dict:
+    """
+    Parse an OpusHead identification header (RFC 7845, section 5.1).
+
+    Returns:
+        dict: channels, pre_skip (48 kHz samples) and input_rate
+    """
+    if len(packet) < 19 or not packet.startswith(b"OpusHead"):
+        raise CodecError("Invalid OpusHead header")
+    _, channels, pre_skip, input_rate = struct.unpack_from("<BBHI", packet, 8)
+    return {"channels": channels, "pre_skip": pre_skip, "input_rate": input_rate}
+
+# CRC-32 of Ogg pages: polynomial 0x04C11DB7, not reflected, zero initial value
+def _make_crc_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else crc << 1
+        table.append(crc & 0xFFFFFFFF)
+    return table
+
+_CRC_TABLE = _make_crc_table()
+
+def ogg_crc(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ _CRC_TABLE[(crc >> 24) ^ byte]
+    return crc
+
+_OGG_HEADER = struct.Struct("<4sBBqIIIB")
+
+class OggFlag:
+    CONTINUED = 0x01  # First packet on the page continues one from the previous page
+    BOS = 0x02  # Beginning of stream
+    EOS = 0x04  # End of stream
+
+def ogg_page(packets: List[bytes], granule: int, serial: int, sequence: int, flags: int = 0) -> bytes:
+    """
+    Build one Ogg page holding whole packets (at most 255 lacing values in total).
+
+    Args:
+        packets: Packets that start and end on this page
+        granule: Granule position after the last packet
+        serial: Stream serial number
+        sequence: Page sequence number within the stream
+        flags: Bitwise OR of OggFlag values
+
+    Returns:
+        bytes: The page, with its CRC
+    """
+    lacing = bytearray()
+    for packet in packets:
+        lacing += b"\xff" * (len(packet) // 255) + bytes([len(packet) % 255])
+    header = _OGG_HEADER.pack(b"OggS", 0, flags, granule, serial, sequence, 0, len(lacing))
+    page = bytearray(header + lacing + b"".join(packets))
+    struct.pack_into("<I", page, 22, ogg_crc(page))
+    return bytes(page)
+
+class OggDemuxer:
+    """
+    Incremental Ogg demuxer.
+
+    Bytes can be fed in arbitrary pieces (WebSocket chunks need not line up
+    with pages); complete packets of the first logical stream are returned
+    as soon as the page that ends them has arrived. Page CRCs are not
+    checked, since the transport is already reliable.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._packet = bytearray()  # Packet continued on the next page
+        self.serial: Optional[int] = None
+
+    def feed(self, data: BufferLike) -> List[bytes]:
+        """
+        Add received bytes.
+
+        Returns:
+            List[bytes]: Packets completed by these bytes, in order
+        """
+        self._buffer += memoryview(data).cast("B")
+        packets = []
+
+        while True:
+            start = self._buffer.find(b"OggS")
+            if start < 0:
+                # Keep a possible partial capture pattern
+                del self._buffer[:max(len(self._buffer) - 3, 0)]
+                return packets
+            if start:
+                logger.warning(f"Skipped {start} bytes of non-Ogg data")
+                del self._buffer[:start]
+            if len(self._buffer) < _OGG_HEADER.size:
+                return packets
+
+            _, version, flags, _, serial, _, _, segments = _OGG_HEADER.unpack_from(self._buffer)
+            if version != 0:
+                raise CodecError(f"Unsupported Ogg version: {version}")
+            body = _OGG_HEADER.size + segments
+            if len(self._buffer) < body:
+                return packets
+            lacing = self._buffer[_OGG_HEADER.size:body]
+            end = body + sum(lacing)
+            if len(self._buffer) < end:
+                return packets
+
+            if self.serial is None:
+                self.serial = serial
+            if serial == self.serial:
+                if not flags & OggFlag.CONTINUED:
+                    self._packet.clear()
+                offset = body
+                for size in lacing:
+                    self._packet += self._buffer[offset:offset + size]
+                    offset += size
+                    # A lacing value below 255 ends the packet
+                    if size < 255:
+                        packets.append(bytes(self._packet))
+                        self._packet.clear()
+
+            del self._buffer[:end]
+
+def _read_vint(data: bytearray, offset: int, keep_marker: bool = False):
+    """
+    Read an EBML variable-length integer.
+
+    Returns:
+        Tuple[Optional[int], int]: The value (None for the reserved "unknown
+            size") and its length, or (None, 0) if more bytes are needed
+    """
+    if offset >= len(data):
+        return None, 0
+    first = data[offset]
+    if first == 0:
+        raise CodecError("Invalid EBML variable-length integer")
+    length = 9 - first.bit_length()
+    if offset + length > len(data):
+        return None, 0
+
+    value = int.from_bytes(data[offset:offset + length], "big")
+    if keep_marker:
+        return value, length
+    value &= (1 << (7 * length)) - 1
+    if value == (1 << (7 * length)) - 1:
+        return None, length
+    return value, length
+
+class WebMDemuxer:
+    """
+    Incremental WebM (Matroska) demuxer for single-track audio.
+
+    Only the elements needed to get at the audio are read: the container
+    elements are entered, the track's CodecPrivate (an OpusHead for Opus)
+    is returned as the first packet, and each SimpleBlock or Block yields
+    its frame. Everything else is skipped without being buffered. Live
+    recordings use "unknown" sizes for the segment and clusters, which is
+    fine since container elements are never skipped as a whole.
+    """
+
+    # Segment, Cluster, BlockGroup, Tracks and TrackEntry contain the elements we need
+    CONTAINERS = {0x18538067, 0x1F43B675, 0xA0, 0x1654AE6B, 0xAE}
+    SIMPLE_BLOCK = 0xA3
+    BLOCK = 0xA1
+    CODEC_PRIVATE = 0x63A2
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._skip = 0  # Bytes of an uninteresting element still to discard
+
+    def feed(self, data: BufferLike) -> List[bytes]:
+        """
+        Add received bytes.
+
+        Returns:
+            List[bytes]: Codec header and audio frames completed by these bytes, in order
+        """
+        self._buffer += memoryview(data).cast("B")
+        packets = []
+
+        while True:
+            if self._skip:
+                skipped = min(self._skip, len(self._buffer))
+                del self._buffer[:skipped]
+                self._skip -= skipped
+                if self._skip:
+                    return packets
+
+            element_id, id_length = _read_vint(self._buffer, 0, keep_marker=True)
+            if not id_length:
+                return packets
+            size, size_length = _read_vint(self._buffer, id_length)
+            if not size_length:
+                return packets
+            header = id_length + size_length
+
+            if element_id in self.CONTAINERS:
+                del self._buffer[:header]
+                continue
+            if size is None:
+                raise CodecError(f"Unknown size for WebM element {element_id:#x}")
+
+            if element_id not in (self.SIMPLE_BLOCK, self.BLOCK, self.CODEC_PRIVATE):
+                del self._buffer[:header]
+                self._skip = size
+                continue
+
+            if len(self._buffer) < header + size:
+                return packets
+            payload = bytes(self._buffer[header:header + size])
+            del self._buffer[:header + size]
+
+            if element_id == self.CODEC_PRIVATE:
+                packets.append(payload)
+                continue
+
+            # Track number, 16-bit relative timecode, flags, then the frame
+            _, track_length = _read_vint(bytearray(payload), 0)
+            flags = payload[track_length + 2]
+            if flags & 0x06:
+                logger.warning("Skipping laced WebM block")
+                continue
+            packets.append(payload[track_length + 3:])
+
+class OpusStreamDecoder:
+    """
+    Streaming Opus decoder for Ogg or WebM input.
+
+    Bytes go in as they arrive and 16-bit PCM comes out at the requested
+    rate and channel count; libopus resamples and downmixes internally, so
+    decoding straight to 16 kHz mono needs no separate normalization. The
+    encoder's pre-skip, announced in the OpusHead, is dropped.
+    """
+
+    def __init__(self, codec: str, sample_rate: int = 16000, channels: int = 1):
+        """
+        Initialize the decoder.
+
+        Args:
+            codec: AudioCodec.OGG_OPUS or AudioCodec.WEBM_OPUS
+            sample_rate: Output sample rate (one of OPUS_SAMPLE_RATES)
+            channels: Output channels (1 or 2)
+        """
+        if codec == AudioCodec.OGG_OPUS:
+            self.demuxer = OggDemuxer()
+        elif codec == AudioCodec.WEBM_OPUS:
+            self.demuxer = WebMDemuxer()
+        else:
+            raise CodecError(f"Not an Opus codec: {codec}")
+        if sample_rate not in OPUS_SAMPLE_RATES:
+            raise CodecError(f"Opus cannot decode to {sample_rate} Hz")
+
+        opuslib = _import_opuslib()
+        self.codec = codec
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._decoder = opuslib.Decoder(sample_rate, channels)
+        self._max_frame = sample_rate * OPUS_MAX_FRAME_MS // 1000
+        self._skip = 0  # Output samples still to drop
+        self.packets = 0
+
+    def feed(self, data: BufferLike) -> np.ndarray:
+        """
+        Decode the next piece of the stream.
+
+        Returns:
+            np.ndarray: Interleaved int16 samples (may be empty)
+        """
+        pcm = []
+        for packet in self.demuxer.feed(data):
+            if packet.startswith(b"OpusHead"):
+                self._skip = parse_opus_head(packet)["pre_skip"] * self.sample_rate // OPUS_GRANULE_RATE
+                continue
+            if packet.startswith(b"OpusTags") or not packet:
+                continue
+
+            try:
+                decoded = self._decoder.decode(packet, self._max_frame)
+            except Exception as e:
+                raise CodecError(f"Opus decoding failed: {e}") from e
+            self.packets += 1
+
+            if self._skip:
+                dropped = min(self._skip * self.channels * 2, len(decoded))
+                decoded = decoded[dropped:]
+                self._skip -= dropped // (self.channels * 2)
+            pcm.append(decoded)
+
+        return np.frombuffer(b"".join(pcm), dtype="<i2")
+
+def decode_audio(data: BufferLike, codec: str, sample_rate: int = 16000) -> AudioInput:
+    """
+    Decode a complete compressed utterance.
+
+    Args:
+        data: Ogg or WebM file
+        codec: AudioCodec.OGG_OPUS or AudioCodec.WEBM_OPUS
+        sample_rate: Output sample rate
+
+    Returns:
+        AudioInput: Mono 16-bit PCM at `sample_rate`
+    """
+    samples = OpusStreamDecoder(codec, sample_rate).feed(data)
+    return AudioInput.from_pcm(samples, sample_rate)
+
+class OggOpusEncoder:
+    """
+    Chunked Ogg Opus encoder.
+
+    Each call to encode() returns complete Ogg pages for the audio given so
+    far, so the first part of a long TTS segment can be sent while the rest
+    is still being encoded. The first call also returns the OpusHead and
+    OpusTags header pages; flush() returns the final page, which carries
+    the end-of-stream flag and the exact length. Concatenated, the output
+    of one encoder is a complete Ogg Opus file.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int = 1,
+        bitrate: int = DEFAULT_BITRATE,
+        frame_ms: int = DEFAULT_FRAME_MS,
+        serial: int = 1
+    ):
+        """
+        Initialize the encoder.
+
+        Args:
+            sample_rate: Input sample rate (one of OPUS_SAMPLE_RATES)
+            channels: Input channels (1 or 2)
+            bitrate: Target bitrate in bits per second
+            frame_ms: Opus frame duration (10, 20, 40 or 60 ms)
+            serial: Ogg stream serial number
+        """
+        if sample_rate not in OPUS_SAMPLE_RATES:
+            raise CodecError(f"Opus cannot encode {sample_rate} Hz audio")
+
+        opuslib = _import_opuslib()
+        self._encoder = opuslib.Encoder(sample_rate, channels, opuslib.APPLICATION_VOIP)
+        self._encoder.bitrate = bitrate
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.serial = serial
+
+        self._pending = np.zeros(0, dtype=np.int16)  # Samples short of a whole frame
+        self._page_sequence = 0
+        self._granule = 0  # Decoded samples (48 kHz) through the last packet written
+        self._input_frames = 0
+        self._started = False
+
+    def _page(self, packets: List[bytes], granule: int, flags: int = 0) -> bytes:
+        page = ogg_page(packets, granule, self.serial, self._page_sequence, flags)
+        self._page_sequence += 1
+        return page
+
+    def _headers(self) -> bytes:
+        head = b"OpusHead" + struct.pack("<BBHIhB", 1, self.channels, OPUS_PRE_SKIP, self.sample_rate, 0, 0)
+        tags = b"OpusTags" + struct.pack("<I", len(VENDOR)) + VENDOR + struct.pack("<I", 0)
+        return self._page([head], 0, OggFlag.BOS) + self._page([tags], 0)
+
+    def _encode_frames(self, samples: np.ndarray) -> List[bytes]:
+        """Encode whole frames and keep the remainder for later."""
+        samples = np.concatenate([self._pending, samples])
+        frame_samples = self.frame_size * self.channels
+        whole = len(samples) - len(samples) % frame_samples
+        self._pending = samples[whole:]
+
+        packets = []
+        for offset in range(0, whole, frame_samples):
+            packets.append(self._encoder.encode(samples[offset:offset + frame_samples].tobytes(), self.frame_size))
+        return packets
+
+    def _pages(self, packets: List[bytes], last_granule: Optional[int] = None) -> bytes:
+        """Pack packets into pages of at most 255 lacing values."""
+        step = OPUS_GRANULE_RATE // self.sample_rate * self.frame_size
+        pages = []
+        batch: List[bytes] = []
+        lacing = 0
+        for packet in packets:
+            needed = len(packet) // 255 + 1
+            if batch and lacing + needed > 255:
+                pages.append(self._page(batch, self._granule))
+                batch, lacing = [], 0
+            batch.append(packet)
+            lacing += needed
+            self._granule += step
+        if batch or last_granule is not None:
+            flags = OggFlag.EOS if last_granule is not None else 0
+            pages.append(self._page(batch, self._granule if last_granule is None else last_granule, flags))
+        return b"".join(pages)
+
+    def encode(self, samples: np.ndarray) -> bytes:
+        """
+        Encode the next block of audio.
+
+        Args:
+            samples: Interleaved int16 samples
+
+        Returns:
+            bytes: Ogg pages for every whole frame so far (possibly empty)
+        """
+        samples = np.asarray(samples, dtype=np.int16).reshape(-1)
+        self._input_frames += len(samples) // self.channels
+
+        out = b""
+        if not self._started:
+            out = self._headers()
+            self._started = True
+        packets = self._encode_frames(samples)
+        return out + (self._pages(packets) if packets else b"")
+
+    def flush(self) -> bytes:
+        """
+        Finish the stream.
+
+        Returns:
+            bytes: The final page(s)
+        """
+        out = b"" if self._started else self._headers()
+        self._started = True
+
+        # Pad with enough silence that the lookahead-delayed end of the audio is encoded
+        pre_skip = -(-OPUS_PRE_SKIP * self.sample_rate // OPUS_GRANULE_RATE)
+        frame_samples = self.frame_size * self.channels
+        padding = pre_skip * self.channels
+        padding += -(len(self._pending) + padding) % frame_samples
+        packets = self._encode_frames(np.zeros(padding, dtype=np.int16))
+
+        # The final granule position trims the padding (RFC 7845, section 4.4)
+        end = OPUS_PRE_SKIP + self._input_frames * OPUS_GRANULE_RATE // self.sample_rate
+        return out + self._pages(packets, last_granule=end)
@@ -0,0 +1,170 @@
+# Zero-Copy Audio Input
+
+import struct
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+# WAVE format tags accepted as PCM
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+_CHUNK_HEADER = struct.Struct("<4sI")
+_FMT = struct.Struct("<HHIIHH")
+
+BufferLike = Union[bytes, bytearray, memoryview, np.ndarray]
+
+class AudioFormatError(ValueError):
+    """Raised when audio is not 16-bit PCM in a well-formed container."""
+
+@lru_cache(maxsize=64)
+def _parse_fmt(fmt: bytes) -> Tuple[int, int, int]:
+    """
+    Parse and validate a WAV fmt chunk.
+
+    Clients send the same few formats over and over, so parsed headers are
+    cached by the raw bytes of their fmt chunk.
+
+    Returns:
+        Tuple[int, int, int]: Sample rate, channels, sample width in bytes
+    """
+    if len(fmt) < _FMT.size:
+        raise AudioFormatError(f"fmt chunk too short: {len(fmt)} bytes")
+
+    format_tag, channels, sample_rate, _, _, bits_per_sample = _FMT.unpack_from(fmt)
+    if format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_EXTENSIBLE):
+        raise AudioFormatError(f"Unsupported WAV format tag: {format_tag:#06x}")
+    if bits_per_sample != 16:
+        raise AudioFormatError(f"Only 16-bit PCM is supported, got {bits_per_sample}-bit")
+    if channels < 1 or sample_rate <= 0:
+        raise AudioFormatError(f"Invalid WAV format: {channels} channels at {sample_rate} Hz")
+
+    return sample_rate, channels, bits_per_sample // 8
+
+class AudioInput:
+    """
+    16-bit PCM audio with its format, backed by a view of the caller's buffer.
+
+    WAV input is parsed from a memoryview once and only the PCM payload is
+    kept, so no intermediate copies are made before the audio is handed to a
+    recognizer.
+    """
+
+    def __init__(self, pcm: BufferLike, sample_rate: int, channels: int = 1, sample_width: int = 2):
+        """
+        Wrap raw PCM audio.
+
+        Args:
+            pcm: Raw little-endian PCM samples
+            sample_rate: Sample rate in Hz
+            channels: Number of interleaved channels
+            sample_width: Bytes per sample (only 2 is supported)
+        """
+        if sample_width != 2:
+            raise AudioFormatError(f"Only 16-bit PCM is supported, got {sample_width * 8}-bit")
+
+        self.pcm = memoryview(pcm).cast("B")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+
+    @classmethod
+    def from_wav(cls, data: BufferLike) -> "AudioInput":
+        """
+        Parse a WAV file without copying its payload.
+
+        Args:
+            data: Complete WAV file
+
+        Returns:
+            AudioInput: View of the data chunk with the format from the fmt chunk
+        """
+        view = memoryview(data).cast("B")
+        if len(view) < 12 or view[0:4] != b"RIFF" or view[8:12] != b"WAVE":
+            raise AudioFormatError("Not a RIFF/WAVE file")
+
+        fmt = None
+        offset = 12
+        while offset + _CHUNK_HEADER.size <= len(view):
+            chunk_id, chunk_size = _CHUNK_HEADER.unpack_from(view, offset)
+            body = offset + _CHUNK_HEADER.size
+
+            if chunk_id == b"fmt ":
+                fmt = _parse_fmt(view[body:body + chunk_size].tobytes())
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise AudioFormatError("data chunk before fmt chunk")
+                # Streaming writers may leave the size unset; clamp to what was received
+                end = min(body + chunk_size, len(view))
+                sample_rate, channels, sample_width = fmt
+                frame_size = channels * sample_width
+                end -= (end - body) % frame_size
+                return cls(view[body:end], sample_rate, channels, sample_width)
+
+            # Chunks are padded to an even size
+            offset = body + chunk_size + (chunk_size & 1)
+
+        raise AudioFormatError("WAV file has no data chunk")
+
+    @classmethod
+    def from_pcm(cls, data: BufferLike, sample_rate: int, channels: int = 1) -> "AudioInput":
+        """
+        Wrap raw 16-bit PCM with explicit metadata, skipping the WAV round-trip.
+
+        Args:
+            data: Raw 16-bit little-endian PCM samples
+            sample_rate: Sample rate in Hz
+            channels: Number of interleaved channels
+
+        Returns:
+            AudioInput: The wrapped audio
+        """
+        if len(memoryview(data).cast("B")) % (2 * channels):
+            raise AudioFormatError("PCM length is not a whole number of frames")
+        return cls(data, sample_rate, channels)
+
+    @classmethod
+    def concat(cls, first: "AudioInput", second: "AudioInput") -> Optional["AudioInput"]:
+        """
+        Join two utterances recorded in the same format.
+
+        Args:
+            first: Earlier audio
+            second: Later audio
+
+        Returns:
+            Optional[AudioInput]: The joined audio, or None if the formats differ
+        """
+        if (first.sample_rate, first.channels) != (second.sample_rate, second.channels):
+            return None
+        return cls(bytes(first.pcm) + bytes(second.pcm), first.sample_rate, first.channels)
+
+    @property
+    def num_frames(self) -> int:
+        """Number of sample frames."""
+        return len(self.pcm) // (self.channels * self.sample_width)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        return self.num_frames / self.sample_rate
+
+    def samples(self) -> np.ndarray:
+        """View the PCM payload as int16 samples (no copy)."""
+        return np.frombuffer(self.pcm, dtype="<i2")
+
+def resample_to_mono(audio: AudioInput, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Downmix 16-bit PCM to mono and resample it.
+
+    Args:
+        audio: PCM audio at any sample rate and channel count
+        sample_rate: Target sample rate in Hz
+
+    Returns:
+        np.ndarray: Mono int16 samples at `sample_rate`
+    """
+    from .audio_normalizer import AudioNormalizer
+
+    return AudioNormalizer(audio.sample_rate, audio.channels, output_rate=sample_rate).convert(audio.pcm)
@@ -0,0 +1,246 @@
+# Streaming Audio Format Normalizer
+
+import logging
+from math import gcd
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from .audio_input import BufferLike
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Every stage after the normalizer works on 16 kHz mono 16-bit PCM
+TARGET_SAMPLE_RATE = 16000
+
+# Kaiser window shape and half-length (in zero crossings of the slower rate) of the anti-aliasing filter
+KAISER_BETA = 5.0
+FILTER_HALF_LENGTH = 10
+
+# Outputs computed per vectorized step, bounding the temporary window matrix
+MAX_BLOCK_OUTPUTS = 4096
+
+# Scale that maps each input dtype onto the int16 range
+INPUT_SCALES = {
+    "int16": 1.0,
+    "int32": 1.0 / 65536.0,
+    "float32": 32768.0,
+    "float64": 32768.0,
+}
+
+OUTPUT_DTYPES = ("int16", "float32")
+
+def design_filter(up: int, down: int) -> np.ndarray:
+    """
+    Design the polyphase anti-aliasing filter for resampling by up/down.
+
+    A Kaiser-windowed sinc low-pass at the lower of the two Nyquist
+    frequencies, with a gain of `up` to make up for zero stuffing (the same
+    design as scipy.signal.resample_poly).
+
+    Args:
+        up: Upsampling factor
+        down: Downsampling factor
+
+    Returns:
+        np.ndarray: Filter taps, odd length, centered on the middle tap
+    """
+    half_length = FILTER_HALF_LENGTH * max(up, down)
+    taps = np.arange(-half_length, half_length + 1, dtype=np.float64)
+    cutoff = 1.0 / max(up, down)
+    h = cutoff * np.sinc(cutoff * taps) * np.kaiser(len(taps), KAISER_BETA)
+    return h * (up / h.sum())
+
+class AudioNormalizer:
+    """
+    Streaming conversion of captured audio to 16 kHz mono PCM.
+
+    Chunks of any size, sample rate, channel count and dtype are downmixed,
+    resampled with a polyphase FIR filter and converted to the output dtype.
+    Filter history is kept between chunks, so a stream normalized chunk by
+    chunk is identical to the whole stream normalized at once, with no
+    clicks at chunk boundaries. The filter is centered: output sample n is
+    aligned with input time n / output_rate, and flush() emits the tail.
+
+    Work is vectorized per chunk: each output sample is the dot product of
+    one filter phase with a window of the input, and all windows are views
+    of one buffer.
+    """
+
+    def __init__(
+        self,
+        input_rate: int,
+        channels: int = 1,
+        dtype: str = "int16",
+        output_rate: int = TARGET_SAMPLE_RATE,
+        output_dtype: str = "int16"
+    ):
+        """
+        Initialize the normalizer.
+
+        Args:
+            input_rate: Sample rate of the incoming audio in Hz
+            channels: Number of interleaved input channels
+            dtype: Input sample type ("int16", "int32", "float32" or "float64"; floats in [-1, 1])
+            output_rate: Sample rate of the output in Hz
+            output_dtype: "int16", or "float32" in [-1, 1]
+        """
+        if input_rate <= 0 or output_rate <= 0 or channels < 1:
+            raise ValueError(f"Invalid audio format: {channels} channels at {input_rate} Hz")
+        if dtype not in INPUT_SCALES:
+            raise ValueError(f"Unsupported input dtype: {dtype} (supported: {', '.join(INPUT_SCALES)})")
+        if output_dtype not in OUTPUT_DTYPES:
+            raise ValueError(f"Unsupported output dtype: {output_dtype} (supported: {', '.join(OUTPUT_DTYPES)})")
+
+        self.input_rate = input_rate
+        self.channels = channels
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        self.output_rate = output_rate
+        self.output_dtype = output_dtype
+        self._scale = INPUT_SCALES[dtype]
+
+        factor = gcd(input_rate, output_rate)
+        self.up = output_rate // factor
+        self.down = input_rate // factor
+        self.passthrough = self.up == self.down
+
+        if not self.passthrough:
+            h = design_filter(self.up, self.down)
+            self._center = len(h) // 2
+            self.taps_per_phase = -(-len(h) // self.up)
+            h = np.concatenate([h, np.zeros(self.taps_per_phase * self.up - len(h))])
+            # Row p holds the taps h[p], h[p + up], ... applied to x[m], x[m - 1], ...;
+            # reversed so a window of oldest-to-newest samples can be multiplied directly
+            self._phases = np.ascontiguousarray(h.reshape(self.taps_per_phase, self.up).T[:, ::-1], dtype=np.float32)
+
+        self.reset()
+
+    def reset(self):
+        """Forget all buffered audio and start a new stream."""
+        # Trailing bytes that did not make up a whole frame
+        self._partial = b""
+        self.input_frames = 0
+        self.output_frames = 0
+
+        if not self.passthrough:
+            # Input samples from index _buffer_start on; the stream starts after silence
+            history = self.taps_per_phase - 1
+            self._buffer = np.zeros(history, dtype=np.float32)
+            self._buffer_start = -history
+
+    def _to_mono(self, data: Union[BufferLike, np.ndarray]) -> np.ndarray:
+        """Convert a chunk to mono float32 samples on the int16 scale."""
+        if isinstance(data, np.ndarray):
+            samples = data.reshape(-1).astype(np.float32)
+        else:
+            raw = memoryview(data).cast("B")
+            frame_size = self.channels * self.dtype.itemsize
+            if self._partial:
+                raw = memoryview(self._partial + raw.tobytes())
+            whole = len(raw) - len(raw) % frame_size
+            self._partial = raw[whole:].tobytes()
+            samples = np.frombuffer(raw[:whole], dtype=self.dtype).astype(np.float32)
+
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1, dtype=np.float32)
+        if self._scale != 1.0:
+            samples *= np.float32(self._scale)
+        return samples
+
+    def _from_mono(self, samples: np.ndarray) -> np.ndarray:
+        """Convert float32 samples on the int16 scale to the output dtype."""
+        if self.output_dtype == "float32":
+            return np.clip(samples / np.float32(32768.0), -1.0, 1.0).astype(np.float32)
+        return np.clip(np.round(samples), -32768, 32767).astype(np.int16)
+
+    def _resample(self, samples: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+        """Append input samples and compute every output sample they complete."""
+        self._buffer = np.concatenate([self._buffer, samples])
+        self.input_frames += len(samples)
+
+        # Output n reads inputs up to (n * down + center) // up, which must have arrived
+        available = (self.input_frames * self.up - self._center - 1) // self.down + 1
+        if limit is not None:
+            available = min(available, limit)
+        count = max(available - self.output_frames, 0)
+
+        k = self.taps_per_phase
+        out = np.empty(count, dtype=np.float32)
+        if count:
+            windows = np.lib.stride_tricks.sliding_window_view(self._buffer, k)
+        for start in range(0, count, MAX_BLOCK_OUTPUTS):
+            n = self.output_frames + start + np.arange(min(MAX_BLOCK_OUTPUTS, count - start))
+            newest, phase = np.divmod(n * self.down + self._center, self.up)
+            # Window i covers inputs _buffer_start + i .. _buffer_start + i + k - 1
+            rows = windows[newest - (k - 1) - self._buffer_start]
+            out[start:start + len(n)] = np.einsum("ij,ij->i", rows, self._phases[phase])
+        self.output_frames += count
+
+        # Keep only the history the next output needs
+        next_oldest = (self.output_frames * self.down + self._center) // self.up - (k - 1)
+        drop = min(max(next_oldest - self._buffer_start, 0), len(self._buffer))
+        if drop:
+            self._buffer = self._buffer[drop:].copy()
+            self._buffer_start += drop
+        return out
+
+    def process(self, data: Union[BufferLike, np.ndarray]) -> np.ndarray:
+        """
+        Normalize the next chunk of the stream.
+
+        Args:
+            data: Interleaved samples of the input dtype, as raw bytes or an
+                array (a NumPy array is taken as samples, bytes may split a frame)
+
+        Returns:
+            np.ndarray: Mono samples at the output rate (may be empty while the filter fills)
+        """
+        samples = self._to_mono(data)
+        if self.passthrough:
+            self.input_frames += len(samples)
+            self.output_frames += len(samples)
+            return self._from_mono(samples)
+        return self._from_mono(self._resample(samples))
+
+    def flush(self) -> np.ndarray:
+        """
+        End the stream: emit the output still held back by the filter and reset.
+
+        Returns:
+            np.ndarray: The remaining output samples
+        """
+        if self.passthrough:
+            self.reset()
+            return self._from_mono(np.zeros(0, dtype=np.float32))
+
+        total = -(-self.input_frames * self.up // self.down)
+        needed = ((total - 1) * self.down + self._center) // self.up + 1 if total else 0
+        padding = np.zeros(max(needed - self.input_frames, 0), dtype=np.float32)
+        out = self._resample(padding, limit=total)
+        self.reset()
+        return self._from_mono(out)
+
+    def convert(self, data: Union[BufferLike, np.ndarray]) -> np.ndarray:
+        """
+        Normalize a complete recording in one call.
+
+        Args:
+            data: All samples of the recording
+
+        Returns:
+            np.ndarray: ceil(frames * output_rate / input_rate) mono output samples
+        """
+        self.reset()
+        out = self.process(data)
+        tail = self.flush()
+        return np.concatenate([out, tail]) if len(tail) else out
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "input_rate": self.input_rate,
+            "output_rate": self.output_rate,
+            "input_frames": self.input_frames,
+            "output_frames": self.output_frames,
+        }
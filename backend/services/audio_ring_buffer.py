@@ -0,0 +1,243 @@
+# Preallocated Audio Capture Ring Buffer
+
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+class AudioRingBuffer:
+    """
+    Single-producer, single-consumer ring of fixed-size audio blocks.
+
+    The producer is an audio driver callback, which must never block: it
+    copies incoming samples into preallocated blocks and publishes them by
+    advancing a counter, without taking any lock. The consumer reads
+    committed blocks as memoryviews of the ring itself, so no data is
+    copied or allocated per block.
+
+    A block handed to the consumer stays valid until the consumer asks for
+    the next one; only then is its slot given back to the producer.
+    Consumers that keep audio longer must copy it.
+
+    When every slot is full the producer drops the incoming audio and
+    counts an overrun rather than overwriting a block the consumer may
+    still be reading. A read that finds no audio, or times out waiting
+    for it, counts an underrun.
+
+    Every block records the stream position (frame index) of its first
+    frame, and dropped audio still advances the position, so a reader can
+    tell from `position` where audio is missing.
+    """
+
+    def __init__(self, block_frames: int, channels: int = 1, dtype: str = "int16", num_blocks: int = 64):
+        """
+        Allocate the ring.
+
+        Args:
+            block_frames: Frames per block (the capture blocksize)
+            channels: Number of interleaved channels
+            dtype: Sample type of the captured audio
+            num_blocks: Number of blocks in the ring
+        """
+        self.block_frames = block_frames
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self.num_blocks = num_blocks
+        self.block_samples = block_frames * channels
+
+        self._blocks = np.zeros((num_blocks, self.block_samples), dtype=self.dtype)
+        self._views = [memoryview(block).cast("B") for block in self._blocks]
+        self._positions = np.zeros(num_blocks, dtype=np.int64)
+
+        # Only the producer advances _written and _fill; only the consumer advances _read
+        self._written = 0
+        self._read = 0
+        self._fill = 0
+        self._held = False
+        self._next_position = 0
+        self.position = 0  # Position of the block last handed to the reader
+        self.closed = False
+
+        self._ready = threading.Event()
+        self._waiter: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = None
+
+        self.overruns = 0
+        self.underruns = 0
+        self.input_overflows = 0
+        self.dropped_frames = 0
+
+    def __len__(self) -> int:
+        """Number of complete blocks not yet given back, including the one being read."""
+        return self._written - self._read
+
+    def write(self, data, position: Optional[int] = None) -> int:
+        """
+        Append captured samples (called from the audio callback).
+
+        Args:
+            data: Interleaved samples of the ring's dtype (any buffer, e.g. a NumPy array or cffi buffer)
+            position: Stream position of the first frame (defaults to right after the previous write)
+
+        Returns:
+            int: Number of frames stored; the rest were dropped
+        """
+        samples = np.frombuffer(data, dtype=self.dtype)
+        if position is not None and self._fill == 0:
+            self._next_position = position
+        offset = 0
+        committed = False
+
+        while offset < len(samples):
+            # A slot is claimed when writing into it starts; it must not be one the consumer holds
+            if self._fill == 0 and self._written - self._read >= self.num_blocks:
+                self.overruns += 1
+                self.dropped_frames += (len(samples) - offset) // self.channels
+                break
+
+            slot = self._written % self.num_blocks
+            if self._fill == 0:
+                self._positions[slot] = self._next_position + offset // self.channels
+            block = self._blocks[slot]
+            count = min(self.block_samples - self._fill, len(samples) - offset)
+            block[self._fill:self._fill + count] = samples[offset:offset + count]
+            self._fill += count
+            offset += count
+
+            if self._fill == self.block_samples:
+                self._fill = 0
+                self._written += 1
+                committed = True
+
+        self._next_position += len(samples) // self.channels
+        if committed:
+            self._notify()
+        return offset // self.channels
+
+    def flush(self):
+        """Pad a partly filled block with silence and make it readable (at the end of a stream)."""
+        if self._fill == 0:
+            return
+        block = self._blocks[self._written % self.num_blocks]
+        block[self._fill:] = 0
+        self._next_position += (self.block_samples - self._fill) // self.channels
+        self._fill = 0
+        self._written += 1
+        self._notify()
+
+    def read_nowait(self) -> Optional[memoryview]:
+        """
+        Take the next block without waiting.
+
+        Returns:
+            Optional[memoryview]: The block as raw bytes, or None (an underrun) if none is ready
+        """
+        view = self._next()
+        if view is None:
+            self.underruns += 1
+        return view
+
+    def read(self, timeout: Optional[float] = None) -> Optional[memoryview]:
+        """
+        Take the next block, waiting for the producer if needed.
+
+        Args:
+            timeout: Seconds to wait (None waits until a block arrives or the ring is closed)
+
+        Returns:
+            Optional[memoryview]: The block as raw bytes, or None on timeout or once closed and drained
+        """
+        while True:
+            self._ready.clear()
+            view = self._next()
+            if view is not None or self.closed:
+                return view
+            if not self._ready.wait(timeout):
+                self.underruns += 1
+                return None
+
+    async def frames(self, timeout: Optional[float] = None) -> AsyncIterator[memoryview]:
+        """
+        Iterate over blocks as they are captured, until the ring is closed.
+
+        Each block is only valid until the next one is requested.
+
+        Args:
+            timeout: Seconds to wait for a block before counting an underrun and waiting again
+
+        Yields:
+            memoryview: Each block as raw bytes
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                view = self._next()
+                if view is not None:
+                    yield view
+                    continue
+                if self.closed:
+                    return
+
+                waiter = loop.create_future()
+                self._waiter = (loop, waiter)
+                try:
+                    # The producer may have committed a block before seeing the waiter
+                    if len(self) == 0 and not self.closed:
+                        await asyncio.wait_for(waiter, timeout)
+                except asyncio.TimeoutError:
+                    self.underruns += 1
+                finally:
+                    self._waiter = None
+        finally:
+            self._release()
+
+    def close(self):
+        """Stop accepting audio and wake any waiting reader."""
+        self.closed = True
+        self._notify()
+
+    def stats(self) -> Dict[str, int]:
+        """Capture health counters."""
+        return {
+            "buffered_blocks": len(self),
+            "overruns": self.overruns,
+            "underruns": self.underruns,
+            "input_overflows": self.input_overflows,
+            "dropped_frames": self.dropped_frames
+        }
+
+    def _next(self) -> Optional[memoryview]:
+        """Give back the held block and take the next committed one, if any."""
+        self._release()
+        if self._written == self._read:
+            return None
+        self._held = True
+        slot = self._read % self.num_blocks
+        self.position = int(self._positions[slot])
+        return self._views[slot]
+
+    def _release(self):
+        if self._held:
+            self._held = False
+            self._read += 1
+
+    def _notify(self):
+        """Wake a reader waiting in read() or frames()."""
+        self._ready.set()
+        waiter = self._waiter
+        if waiter is not None:
+            loop, future = waiter
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # The reader's loop has already been closed
+                pass
@@ -0,0 +1,400 @@
+# Multi-Device Audio Capture
+
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from time import monotonic
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .audio_input import AudioInput
+from .audio_ring_buffer import AudioRingBuffer
+from .stream_registry import create_stream, register_stream
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class GeneratedStream(ABC):
+    """
+    Capture stream whose audio is produced by a background thread.
+
+    It has the same interface as SounddeviceStream in callback mode
+    (open/start/stop/close, read(), frames(), stats()) and feeds the same
+    AudioRingBuffer, so the capture pipeline can be run and load-tested on
+    machines without audio hardware. Subclasses implement _generate().
+    """
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        channels: int = 1,
+        chunk: int = 512,
+        realtime: bool = True,
+        ring_blocks: int = 64
+    ):
+        """
+        Initialize the stream.
+
+        Args:
+            samplerate: Sample rate in Hz
+            channels: Number of channels
+            chunk: Frames per block
+            realtime: Pace blocks at the sample rate (False produces them as fast as possible)
+            ring_blocks: Number of blocks in the ring buffer
+        """
+        self.samplerate = samplerate
+        self.channels = channels
+        self.chunk = chunk
+        self.dtype = "int16"
+        self.realtime = realtime
+        self.ring_blocks = ring_blocks
+
+        self.ring: Optional[AudioRingBuffer] = None
+        self.start_time: Optional[float] = None  # Monotonic time of the first captured frame
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._reported_overruns = 0
+
+    def open(self):
+        self.ring = AudioRingBuffer(self.chunk, self.channels, self.dtype, self.ring_blocks)
+        self._reported_overruns = 0
+        self.start_time = None
+
+    def start(self):
+        self._stopping.clear()
+        self.start_time = monotonic()
+        self._thread = threading.Thread(target=self._produce, name=f"{type(self).__name__}-producer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def close(self):
+        self.stop()
+        if self.ring is not None:
+            self.ring.close()
+
+    def terminate(self):
+        self.close()
+
+    def is_active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[Optional[memoryview], bool]:
+        """
+        Read one chunk.
+
+        Returns:
+            Tuple[Optional[memoryview], bool]: The chunk (None on timeout or at the end)
+                and whether audio was lost since the previous read
+        """
+        view = self.ring.read(timeout)
+        lost = self.ring.overruns
+        overflowed, self._reported_overruns = lost != self._reported_overruns, lost
+        return view, overflowed
+
+    async def frames(self, timeout: Optional[float] = None) -> AsyncIterator[memoryview]:
+        """
+        Iterate over chunks as they are produced.
+
+        Yields:
+            memoryview: Raw bytes of each chunk, valid until the next one is requested
+        """
+        async for view in self.ring.frames(timeout):
+            yield view
+
+    def stats(self) -> Dict[str, int]:
+        return self.ring.stats() if self.ring is not None else {}
+
+    def _produce(self):
+        """Producer thread: write blocks into the ring until stopped or out of audio."""
+        block_duration = self.chunk / self.samplerate
+        deadline = self.start_time
+        position = 0
+        try:
+            while not self._stopping.is_set():
+                block = self._generate(position, self.chunk)
+                if block is None:
+                    self.ring.flush()
+                    break
+                self.ring.write(block, position)
+                position += len(block)
+
+                if self.realtime:
+                    deadline += block_duration
+                    delay = deadline - monotonic()
+                    if delay > 0:
+                        self._stopping.wait(delay)
+        except Exception as e:
+            logger.error(f"Capture stream {type(self).__name__} failed: {e}")
+        finally:
+            self.ring.close()
+
+    @abstractmethod
+    def _generate(self, position: int, frames: int) -> Optional[np.ndarray]:
+        """
+        Produce the next block.
+
+        Args:
+            position: Stream position of the first frame
+            frames: Number of frames wanted
+
+        Returns:
+            Optional[np.ndarray]: Up to `frames` int16 frames of shape (frames, channels), or None at the end
+        """
+
+@register_stream("synthetic")
+class SyntheticStream(GeneratedStream):
+    """
+    Stream of a generated test tone, optionally with noise.
+
+    One second of signal is computed up front and every block is a view
+    of it, so producing audio costs no allocation or math per block.
+    """
+
+    def __init__(
+        self,
+        frequency: float = 440.0,
+        amplitude: float = 0.3,
+        noise: float = 0.0,
+        seed: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Initialize the stream.
+
+        Args:
+            frequency: Tone frequency in Hz (rounded to a whole number of cycles per second)
+            amplitude: Tone amplitude (0-1 of full scale)
+            noise: Standard deviation of added white noise (0-1 of full scale)
+            seed: Seed of the noise generator
+            **kwargs: GeneratedStream settings (samplerate, channels, chunk, realtime, ring_blocks)
+        """
+        super().__init__(**kwargs)
+        # Extra `chunk` frames at the end let every block be one contiguous slice
+        t = np.arange(self.samplerate + self.chunk) / self.samplerate
+        signal = amplitude * np.sin(2 * np.pi * round(frequency) * t)
+        signal = np.repeat(signal[:, None], self.channels, axis=1)
+        if noise:
+            signal += np.random.default_rng(seed).normal(0, noise, signal.shape)
+        self._table = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+
+    def _generate(self, position: int, frames: int) -> np.ndarray:
+        start = position % self.samplerate
+        return self._table[start:start + frames]
+
+@register_stream("file")
+class FileStream(GeneratedStream):
+    """Stream of a 16-bit PCM WAV file, optionally looped."""
+
+    def __init__(self, path: str, loop: bool = False, **kwargs):
+        """
+        Initialize the stream. Sample rate and channels come from the file.
+
+        Args:
+            path: WAV file to play
+            loop: Start over at the end instead of ending the stream
+            **kwargs: GeneratedStream settings (chunk, realtime, ring_blocks)
+        """
+        with open(path, "rb") as f:
+            audio = AudioInput.from_wav(f.read())
+        super().__init__(samplerate=audio.sample_rate, channels=audio.channels, **kwargs)
+        self.path = path
+        self.loop = loop
+        self._samples = audio.samples().reshape(-1, audio.channels)
+
+    def _generate(self, position: int, frames: int) -> Optional[np.ndarray]:
+        total = len(self._samples)
+        if not total or (position >= total and not self.loop):
+            return None
+        start = position % total if self.loop else position
+        block = self._samples[start:start + frames]
+        if self.loop and len(block) < frames:
+            # Wrap around within one block
+            block = np.concatenate([block, self._samples[:frames - len(block)]])
+        return block
+
+class _AlignedReader:
+    """Reads one stream as a continuous run of frames, zero-filling audio the stream dropped."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._frames = stream.frames()
+        self._block: Optional[np.ndarray] = None
+        self._offset = 0
+        self._expected: Optional[int] = None
+        self.gap = 0
+        self.skip = 0
+        self.position = 0  # Stream position of the next frame handed out
+        self.zero_filled = 0
+
+    async def next_block(self) -> bool:
+        """Fetch the next block from the stream; False once it has ended."""
+        try:
+            view = await self._frames.__anext__()
+        except StopAsyncIteration:
+            return False
+        self._block = np.frombuffer(view, dtype=self.stream.dtype).reshape(-1, self.stream.channels)
+        self._offset = 0
+        position = self.stream.ring.position
+        if self._expected is None:
+            self.position = position
+        elif position > self._expected:
+            self.gap += position - self._expected
+        self._expected = position + len(self._block)
+        return True
+
+    async def fill(self, out: np.ndarray) -> bool:
+        """
+        Fill `out` (channels x frames) with the next frames.
+
+        Returns:
+            bool: False if the stream ended first
+        """
+        wanted = out.shape[1]
+        filled = 0
+        while filled < wanted:
+            if self.gap:
+                # Frames the stream dropped come before the block that revealed them
+                count = min(self.gap, self.skip or (wanted - filled))
+                self.gap -= count
+                source = None
+            else:
+                if self._block is None or self._offset == len(self._block):
+                    if not await self.next_block():
+                        return False
+                    continue
+                count = min(len(self._block) - self._offset, self.skip or (wanted - filled))
+                source = self._block[self._offset:self._offset + count]
+                self._offset += count
+
+            if self.skip:
+                self.skip -= count
+            elif source is None:
+                out[:, filled:filled + count] = 0
+                self.zero_filled += count
+                filled += count
+            else:
+                out[:, filled:filled + count] = source.T
+                filled += count
+            self.position += count
+        return True
+
+    async def aclose(self):
+        await self._frames.aclose()
+
+class MultiStreamCapture:
+    """
+    Captures from several streams at once and hands out time-aligned frames.
+
+    The streams (any registered engines, e.g. several microphones, or one
+    multi-channel device) must share a sample rate. Once every stream has
+    produced audio, streams that started earlier skip ahead so that all
+    of them line up with the one that started last. After that, each frame
+    holds the same instant on every channel; audio a stream drops is
+    replaced with silence so the channels never drift apart.
+    """
+
+    def __init__(self, streams: List[Any], block_frames: Optional[int] = None):
+        """
+        Initialize the capture.
+
+        Args:
+            streams: Streams to capture from (not yet opened)
+            block_frames: Frames per output block (defaults to the first stream's chunk)
+        """
+        if not streams:
+            raise ValueError("At least one stream is required")
+        rates = {stream.samplerate for stream in streams}
+        if len(rates) > 1:
+            raise ValueError(f"Streams must share one sample rate, got {sorted(rates)}")
+
+        self.streams = streams
+        self.samplerate = streams[0].samplerate
+        self.channels = sum(stream.channels for stream in streams)
+        self.block_frames = block_frames or streams[0].chunk
+        self.start_time: Optional[float] = None  # Monotonic time of the first aligned frame
+
+        self._readers: List[_AlignedReader] = []
+        self._out = np.zeros((self.channels, self.block_frames), dtype=np.int16)
+
+    @classmethod
+    def from_config(cls, engine: str, devices: List[Dict[str, Any]], block_frames: Optional[int] = None) -> "MultiStreamCapture":
+        """
+        Create the streams of one engine.
+
+        Args:
+            engine: Registered stream engine (e.g. "sounddevice", "synthetic")
+            devices: Settings of each stream, e.g. [{"device_index": 1}, {"device_index": 2}]
+            block_frames: Frames per output block
+
+        Returns:
+            MultiStreamCapture: The capture
+        """
+        return cls([create_stream(engine, **settings) for settings in devices], block_frames)
+
+    def open(self):
+        for stream in self.streams:
+            stream.open()
+
+    def start(self):
+        for stream in self.streams:
+            stream.start()
+
+    def stop(self):
+        for stream in self.streams:
+            stream.stop()
+
+    def close(self):
+        for stream in self.streams:
+            stream.close()
+
+    async def frames(self) -> AsyncIterator[Tuple[float, np.ndarray]]:
+        """
+        Iterate over aligned blocks until any stream ends.
+
+        Yields:
+            Tuple[float, np.ndarray]:
+                - Monotonic capture time of the block's first frame
+                - int16 array of shape (channels, block_frames); row i is channel i,
+                  streams in order. It is reused, so it is only valid until the next block.
+        """
+        self._readers = [_AlignedReader(stream) for stream in self.streams]
+        try:
+            # Wait for audio from every stream, then skip to the latest first frame
+            for reader in self._readers:
+                if not await reader.next_block():
+                    return
+            first_frames = [
+                reader.stream.start_time + reader.position / self.samplerate for reader in self._readers
+            ]
+            self.start_time = max(first_frames)
+            for reader, first_frame in zip(self._readers, first_frames):
+                reader.skip = round((self.start_time - first_frame) * self.samplerate)
+            logger.info(f"Aligned {len(self.streams)} capture streams (skipped {[r.skip for r in self._readers]} frames)")
+
+            position = 0
+            while True:
+                row = 0
+                for reader in self._readers:
+                    if not await reader.fill(self._out[row:row + reader.stream.channels]):
+                        return
+                    row += reader.stream.channels
+                yield self.start_time + position / self.samplerate, self._out
+                position += self.block_frames
+        finally:
+            await asyncio.gather(*(reader.aclose() for reader in self._readers), return_exceptions=True)
+
+    def stats(self) -> List[Dict[str, int]]:
+        """Capture counters of each stream, plus the silence inserted for dropped audio."""
+        zero_filled = [reader.zero_filled for reader in self._readers] or [0] * len(self.streams)
+        return [
+            {**stream.stats(), "zero_filled_frames": filled}
+            for stream, filled in zip(self.streams, zero_filled)
+        ]
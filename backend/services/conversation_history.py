@@ -0,0 +1,357 @@
+# Bounded Conversation History
+
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .sentences import split_sentences
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Per-message overhead of the chat format (role, separators), in tokens
+MESSAGE_OVERHEAD = 4
+
+# Longest excerpt of a single message kept in the summary
+SUMMARY_LINE_CHARS = 200
+
+class HistorySlot:
+    """Named system messages kept at the start of the history, in this order."""
+    SYSTEM = "system"
+    USER_CONTEXT = "user_context"
+    VISION = "vision"
+    SUMMARY = "summary"
+
+SLOT_ORDER = (HistorySlot.SYSTEM, HistorySlot.USER_CONTEXT, HistorySlot.VISION, HistorySlot.SUMMARY)
+
+# Content prefixes that identify the slot of a system message
+USER_CONTEXT_PREFIX = "USER CONTEXT:"
+VISION_PREFIX = "[VISION CONTEXT]"
+SUMMARY_PREFIX = "[CONVERSATION SUMMARY]"
+SUMMARY_HEADER = f"{SUMMARY_PREFIX}: Earlier in this conversation:"
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+def summarize_turns(messages: List[Dict[str, Any]]) -> List[str]:
+    """
+    Summarize evicted turns without calling the LLM.
+
+    Each message is reduced to its first sentence, clipped to
+    SUMMARY_LINE_CHARS.
+
+    Args:
+        messages: Evicted user and assistant messages, oldest first
+
+    Returns:
+        List[str]: One summary line per non-empty message
+    """
+    lines = []
+    for message in messages:
+        content = str(message.get("content") or "").strip()
+        if not content:
+            continue
+        first = split_sentences(content, min_length=0)[0]
+        if len(first) > SUMMARY_LINE_CHARS:
+            first = first[:SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+        lines.append(f"{message.get('role', 'user').capitalize()}: {first}")
+    return lines
+
+class ConversationHistory(list):
+    """
+    Conversation history bounded by a token budget.
+
+    It is a list of chat messages, so LLM clients use it unchanged, laid
+    out as the filled slots in SLOT_ORDER followed by the turns:
+
+        [system] [user context] [vision] [summary] turn, turn, ...
+
+    System messages are routed to their slot however they are added, so
+    placing or replacing a slot never scans the history. Token counts are
+    updated on every change. Once the total exceeds `max_tokens`, the
+    oldest turns are folded into the rolling summary until the history is
+    back under the budget with room for the summary, always keeping the
+    last `min_recent` turns verbatim.
+    """
+
+    def __init__(
+        self,
+        messages: Iterable[Dict[str, Any]] = (),
+        max_tokens: int = 4000,
+        min_recent: int = 6,
+        summary_max_tokens: Optional[int] = None,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+        summarizer: Callable[[List[Dict[str, Any]]], List[str]] = summarize_turns
+    ):
+        """
+        Initialize the history.
+
+        Args:
+            messages: Initial messages, e.g. a loaded session
+            max_tokens: Token budget of the whole history (0 for no limit)
+            min_recent: Number of most recent turns never summarized
+            summary_max_tokens: Token budget of the summary (defaults to a quarter of max_tokens)
+            count_tokens: Token counter for message content
+            summarizer: Turns evicted messages into summary lines
+        """
+        super().__init__()
+        self.max_tokens = max_tokens
+        self.min_recent = min_recent
+        self.summary_max_tokens = summary_max_tokens if summary_max_tokens is not None else max_tokens // 4
+        self.count_tokens = count_tokens
+        self.summarizer = summarizer
+
+        self.tokens = 0
+        self.compacted_turns = 0
+        self._slots: Dict[str, Dict[str, Any]] = {}
+        self._summary: Optional[Dict[str, Any]] = None
+        # (line, tokens), oldest first
+        self._summary_lines: Deque[Tuple[str, int]] = deque()
+        self._summary_tokens = 0
+
+        self.extend(messages)
+
+    def get_slot(self, slot: str) -> Optional[Dict[str, Any]]:
+        """Get the message in a slot, if any."""
+        return self._slots.get(slot)
+
+    def set_slot(self, slot: str, message: Dict[str, Any]):
+        """
+        Place or replace the message in a slot.
+
+        Args:
+            slot: One of the HistorySlot names
+            message: System message
+        """
+        index = self._slot_index(slot)
+        previous = self._slots.get(slot)
+        if previous is not None:
+            self.tokens -= self._cost(previous)
+            list.__setitem__(self, index, message)
+        else:
+            list.insert(self, index, message)
+        self._slots[slot] = message
+        self.tokens += self._cost(message)
+
+        if slot == HistorySlot.SUMMARY and message is not self._summary:
+            # Set from outside, e.g. a loaded session: continue from its text
+            content = str(message.get("content") or "")
+            if content.startswith(SUMMARY_HEADER):
+                lines = content[len(SUMMARY_HEADER):].splitlines()
+            else:
+                lines = [content[len(SUMMARY_PREFIX):].lstrip(": ")]
+            self._summary_lines.clear()
+            self._summary_tokens = 0
+            self._add_summary_lines([line.strip() for line in lines], update_slot=False)
+        elif slot == HistorySlot.VISION and previous is not None:
+            # Keep a trace of the image the user talked about before
+            self._add_summary_lines(summarize_turns([
+                {"role": "image", "content": previous["content"][len(VISION_PREFIX):].lstrip(": ")}
+            ]))
+
+    def clear_slot(self, slot: str):
+        """Remove the message in a slot, if any."""
+        message = self._slots.pop(slot, None)
+        if message is None:
+            return
+        list.__delitem__(self, self._slot_index(slot))
+        self.tokens -= self._cost(message)
+        if slot == HistorySlot.SUMMARY:
+            self._summary_lines.clear()
+            self._summary_tokens = 0
+
+    @property
+    def turns(self) -> List[Dict[str, Any]]:
+        """The user and assistant messages, oldest first."""
+        return list.__getitem__(self, slice(len(self._slots), None))
+
+    def stats(self) -> Dict[str, int]:
+        """Current size and how much has been summarized."""
+        return {
+            "messages": len(self),
+            "tokens": self.tokens,
+            "summary_tokens": self._summary_tokens,
+            "compacted_turns": self.compacted_turns
+        }
+
+    def append(self, message: Dict[str, Any]):
+        slot = self._slot_for(message)
+        if slot is not None:
+            self.set_slot(slot, message)
+            return
+        list.append(self, message)
+        self.tokens += self._cost(message)
+        self._compact()
+
+    def extend(self, messages: Iterable[Dict[str, Any]]):
+        for message in list(messages):
+            self.append(message)
+
+    def __iadd__(self, messages: Iterable[Dict[str, Any]]):
+        self.extend(messages)
+        return self
+
+    def insert(self, index: int, message: Dict[str, Any]):
+        slot = self._slot_for(message)
+        if slot is not None:
+            self.set_slot(slot, message)
+            return
+        # Turns always come after the slots
+        index = self._normalize(index, insert=True)
+        list.insert(self, max(index, len(self._slots)), message)
+        self.tokens += self._cost(message)
+        self._compact()
+
+    def __setitem__(self, index, message):
+        if isinstance(index, slice):
+            messages = list(self)
+            messages[index] = message
+            self._reset(messages)
+            return
+
+        index = self._normalize(index)
+        if index < len(self._slots):
+            self.clear_slot(self._filled_slots()[index])
+            self.append(message)
+            return
+
+        slot = self._slot_for(message)
+        if slot is not None:
+            self._delete_turn(index)
+            self.set_slot(slot, message)
+            return
+        self.tokens += self._cost(message) - self._cost(list.__getitem__(self, index))
+        list.__setitem__(self, index, message)
+        self._compact()
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            messages = list(self)
+            del messages[index]
+            self._reset(messages)
+            return
+
+        index = self._normalize(index)
+        if index < len(self._slots):
+            self.clear_slot(self._filled_slots()[index])
+        else:
+            self._delete_turn(index)
+
+    def pop(self, index: int = -1) -> Dict[str, Any]:
+        message = self[index]
+        del self[index]
+        return message
+
+    def remove(self, message: Dict[str, Any]):
+        del self[self.index(message)]
+
+    def clear(self):
+        list.clear(self)
+        self._slots.clear()
+        self._summary_lines.clear()
+        self._summary_tokens = 0
+        self.tokens = 0
+
+    def __reduce__(self):
+        # Rebuild through the constructor so copies get their own slot index
+        return (
+            self.__class__,
+            (list(self), self.max_tokens, self.min_recent, self.summary_max_tokens, self.count_tokens, self.summarizer)
+        )
+
+    def _cost(self, message: Dict[str, Any]) -> int:
+        return self.count_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD
+
+    @staticmethod
+    def _slot_for(message: Dict[str, Any]) -> Optional[str]:
+        """The slot a message belongs to, or None for a turn."""
+        if message.get("role") != "system":
+            return None
+        content = str(message.get("content") or "")
+        if content.startswith(USER_CONTEXT_PREFIX):
+            return HistorySlot.USER_CONTEXT
+        if content.startswith(VISION_PREFIX):
+            return HistorySlot.VISION
+        if content.startswith(SUMMARY_PREFIX):
+            return HistorySlot.SUMMARY
+        return HistorySlot.SYSTEM
+
+    def _filled_slots(self) -> List[str]:
+        return [slot for slot in SLOT_ORDER if slot in self._slots]
+
+    def _slot_index(self, slot: str) -> int:
+        """Position of a slot: the number of filled slots before it."""
+        index = 0
+        for other in SLOT_ORDER:
+            if other == slot:
+                return index
+            index += other in self._slots
+        raise ValueError(f"Unknown history slot: {slot}")
+
+    def _normalize(self, index: int, insert: bool = False) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if insert:
+            return min(max(index, 0), length)
+        if not 0 <= index < length:
+            raise IndexError("list index out of range")
+        return index
+
+    def _delete_turn(self, index: int):
+        message = list.__getitem__(self, index)
+        list.__delitem__(self, index)
+        self.tokens -= self._cost(message)
+
+    def _reset(self, messages: List[Dict[str, Any]]):
+        self.clear()
+        self.extend(messages)
+
+    def _compact(self):
+        """Fold the oldest turns into the summary once the budget is exceeded."""
+        if not self.max_tokens or self.tokens <= self.max_tokens:
+            return
+
+        # Free enough that the grown summary still fits in the budget
+        target = self.max_tokens - self.summary_max_tokens
+        head = len(self._slots)
+        turns = len(self) - head
+        evict = 0
+        freed = 0
+        while turns - evict > self.min_recent and self.tokens - freed > target:
+            freed += self._cost(list.__getitem__(self, head + evict))
+            evict += 1
+        # Do not leave a reply without the message it answers
+        while 0 < evict < turns - 1 and list.__getitem__(self, head + evict).get("role") != "user":
+            freed += self._cost(list.__getitem__(self, head + evict))
+            evict += 1
+        if not evict:
+            return
+
+        evicted = list.__getitem__(self, slice(head, head + evict))
+        list.__delitem__(self, slice(head, head + evict))
+        self.tokens -= freed
+        self.compacted_turns += evict
+        self._add_summary_lines(self.summarizer(evicted))
+        logger.info(f"Summarized {evict} old messages, history now {self.tokens} tokens")
+
+    def _add_summary_lines(self, lines: List[str], update_slot: bool = True):
+        """Append to the rolling summary, dropping its oldest lines beyond summary_max_tokens."""
+        for line in lines:
+            if not line:
+                continue
+            cost = self.count_tokens(line)
+            self._summary_lines.append((line, cost))
+            self._summary_tokens += cost
+        while len(self._summary_lines) > 1 and self._summary_tokens > self.summary_max_tokens:
+            _, cost = self._summary_lines.popleft()
+            self._summary_tokens -= cost
+
+        if update_slot and self._summary_lines:
+            self._summary = {
+                "role": "system",
+                "content": "\n".join([SUMMARY_HEADER, *(line for line, _ in self._summary_lines)])
+            }
+            self.set_slot(HistorySlot.SUMMARY, self._summary)
@@ -0,0 +1,276 @@
+# Conversation Session Storage
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    user_name TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS sessions_by_updated_at ON sessions (updated_at DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_user_name ON sessions (user_name, updated_at DESC);
+CREATE TABLE IF NOT EXISTS session_messages (
+    session_id TEXT PRIMARY KEY REFERENCES sessions (id) ON DELETE CASCADE,
+    messages TEXT NOT NULL
+);
+"""
+
+class ConversationStorage:
+    """
+    Saved conversation sessions, indexed in SQLite.
+
+    Session metadata (title, timestamps, counts) and message bodies are kept
+    in separate tables, so listing sessions reads only the small metadata
+    rows through an index on the update time, however many or however long
+    the saved conversations are. Message bodies are only read when a
+    session is loaded. All I/O runs in a thread off the event loop.
+
+    Sessions saved as one JSON file each in the storage directory are
+    imported into the index the first time it is opened.
+    """
+
+    def __init__(self, storage_dir: str = "conversations"):
+        """
+        Open (and if needed create) the session index.
+
+        Args:
+            storage_dir: Directory holding the session database
+        """
+        self.storage_dir = storage_dir
+        os.makedirs(storage_dir, exist_ok=True)
+        self.db_path = os.path.join(storage_dir, "sessions.db")
+
+        # One connection shared by the worker threads, one statement at a time
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+        self._import_json_sessions()
+
+        logger.info(f"Initialized conversation storage at {self.db_path}")
+
+    async def save_session(
+        self,
+        messages: List[Dict[str, Any]],
+        title: Optional[str] = None,
+        session_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Save a conversation, overwriting the session if it already exists.
+
+        Args:
+            messages: Conversation messages
+            title: Session title
+            session_id: ID of the session to overwrite (a new ID is generated if None)
+            metadata: Extra metadata (message counts, user name, ...)
+
+        Returns:
+            str: ID of the saved session
+        """
+        return await asyncio.to_thread(self._save, list(messages), title, session_id, metadata or {})
+
+    async def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a session with its messages.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            Optional[Dict[str, Any]]: The session (id, title, timestamps, metadata, messages), or None
+        """
+        return await asyncio.to_thread(self._load, session_id)
+
+    async def list_sessions(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        query: Optional[str] = None,
+        user_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List sessions, most recently updated first, without their messages.
+
+        Args:
+            limit: Maximum number of sessions to return (None for all)
+            offset: Number of sessions to skip
+            query: Only sessions whose title contains this text (case-insensitive)
+            user_name: Only sessions saved for this user
+
+        Returns:
+            List[Dict[str, Any]]: Session summaries (id, title, timestamps, metadata)
+        """
+        return await asyncio.to_thread(self._list, limit, offset, query, user_name)
+
+    async def count_sessions(self, query: Optional[str] = None, user_name: Optional[str] = None) -> int:
+        """
+        Count the sessions list_sessions() would return without a limit.
+
+        Args:
+            query: Only sessions whose title contains this text (case-insensitive)
+            user_name: Only sessions saved for this user
+
+        Returns:
+            int: Number of matching sessions
+        """
+        return await asyncio.to_thread(self._count, query, user_name)
+
+    async def delete_session(self, session_id: str) -> bool:
+        """
+        Delete a session.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            bool: Whether the session existed
+        """
+        return await asyncio.to_thread(self._delete, session_id)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _save(
+        self,
+        messages: List[Dict[str, Any]],
+        title: Optional[str],
+        session_id: Optional[str],
+        metadata: Dict[str, Any]
+    ) -> str:
+        session_id = session_id or uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        metadata = {"message_count": len(messages), **metadata}
+        body = json.dumps(messages)
+
+        with self._lock, self._conn:
+            existing = self._conn.execute(
+                "SELECT title FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+            if existing is not None and title is None:
+                # Keep the title when an existing session is saved again
+                title = existing["title"]
+            self._conn.execute(
+                "INSERT INTO sessions (id, title, created_at, updated_at, user_name, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET title = excluded.title, updated_at = excluded.updated_at, "
+                "user_name = excluded.user_name, metadata = excluded.metadata",
+                (session_id, title or "", now, now, metadata.get("user_name"), json.dumps(metadata, default=str))
+            )
+            self._conn.execute(
+                "INSERT INTO session_messages (session_id, messages) VALUES (?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET messages = excluded.messages",
+                (session_id, body)
+            )
+        return session_id
+
+    def _load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT s.*, m.messages FROM sessions s "
+                "LEFT JOIN session_messages m ON m.session_id = s.id WHERE s.id = ?",
+                (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        session = self._summary(row)
+        session["messages"] = json.loads(row["messages"] or "[]")
+        return session
+
+    @staticmethod
+    def _filters(query: Optional[str], user_name: Optional[str]):
+        """WHERE clause and parameters for the listing filters."""
+        clauses, params = [], []
+        if query:
+            clauses.append("title LIKE ? ESCAPE '\\'")
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if user_name:
+            clauses.append("user_name = ?")
+            params.append(user_name)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _list(self, limit: Optional[int], offset: int, query: Optional[str], user_name: Optional[str]) -> List[Dict[str, Any]]:
+        where, params = self._filters(query, user_name)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM sessions{where} ORDER BY updated_at DESC, rowid DESC LIMIT ? OFFSET ?",
+                (*params, -1 if limit is None else limit, max(0, offset))
+            ).fetchall()
+        return [self._summary(row) for row in rows]
+
+    def _count(self, query: Optional[str], user_name: Optional[str]) -> int:
+        where, params = self._filters(query, user_name)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM sessions{where}", params).fetchone()[0]
+
+    def _delete(self, session_id: str) -> bool:
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount
+        return deleted > 0
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict[str, Any]:
+        """Session fields sent to clients, without the messages."""
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "metadata": json.loads(row["metadata"])
+        }
+
+    def _import_json_sessions(self):
+        """Index sessions saved as <id>.json files, then set the files aside."""
+        for name in sorted(os.listdir(self.storage_dir)):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.storage_dir, name)
+            try:
+                with open(path, "r") as f:
+                    session = json.load(f)
+                messages = session.get("messages", [])
+                metadata = session.get("metadata") or {}
+                session_id = session.get("id") or name[:-len(".json")]
+                now = datetime.now().isoformat()
+
+                with self._lock, self._conn:
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO sessions (id, title, created_at, updated_at, user_name, metadata) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            session_id, session.get("title") or "",
+                            session.get("created_at") or now, session.get("updated_at") or now,
+                            metadata.get("user_name"),
+                            json.dumps({"message_count": len(messages), **metadata}, default=str)
+                        )
+                    )
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO session_messages (session_id, messages) VALUES (?, ?)",
+                        (session_id, json.dumps(messages))
+                    )
+                os.replace(path, f"{path}.imported")
+                logger.info(f"Imported conversation session {session_id} from {name}")
+            except Exception as e:
+                logger.warning(f"Could not import conversation session file {name}: {e}")
@@ -0,0 +1,125 @@
+# Dialogflow Session Pool
+
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Tuple
+from google.cloud import dialogflow_v2 as dialogflow
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class DialogflowSessionManager:
+    """
+    Maps each connection to its own Dialogflow session.
+
+    Sessions are spread over a small pool of async clients, each with its own
+    gRPC channel, so channels are reused instead of reconnected per
+    conversation. Idle sessions are evicted in LRU order, either when they
+    exceed the TTL or when the pool is over capacity.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        pool_size: int = 4,
+        max_sessions: int = 1000,
+        session_ttl: float = 1800.0,
+        session_prefix: str = "suarasemar"
+    ):
+        """
+        Initialize the session manager.
+
+        Args:
+            project_id: Google Cloud Dialogflow project ID
+            pool_size: Number of gRPC channels (async clients) to share
+            max_sessions: Maximum number of sessions kept at once
+            session_ttl: Seconds of inactivity after which a session is evicted
+            session_prefix: Prefix of generated Dialogflow session IDs
+        """
+        self.project_id = project_id
+        self.pool_size = pool_size
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.session_prefix = session_prefix
+
+        # Async clients bind to the running event loop, so they are created on first use
+        self._clients: List[dialogflow.SessionsAsyncClient] = []
+        self._client_load: List[int] = [0] * pool_size
+
+        # connection_id -> (session path, client index, last used), least recently used first
+        self._sessions: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+
+        logger.info(f"Initialized Dialogflow session pool with {pool_size} channels, max_sessions={max_sessions}")
+
+    def _get_clients(self) -> List[dialogflow.SessionsAsyncClient]:
+        """Create the pooled clients on first use."""
+        if not self._clients:
+            self._clients = [dialogflow.SessionsAsyncClient() for _ in range(self.pool_size)]
+        return self._clients
+
+    def acquire(self, connection_id: str) -> Tuple[str, dialogflow.SessionsAsyncClient]:
+        """
+        Get the session path and pooled client for a connection.
+
+        A new session is created on the least loaded channel the first time a
+        connection is seen, or after its previous session was evicted.
+
+        Args:
+            connection_id: Unique ID of the connection
+
+        Returns:
+            Tuple[str, SessionsAsyncClient]:
+                - Dialogflow session path
+                - Client to send the connection's requests with
+        """
+        clients = self._get_clients()
+        now = time.monotonic()
+
+        entry = self._sessions.get(connection_id)
+        if entry is not None:
+            session, client_index, _ = entry
+            self._sessions[connection_id] = (session, client_index, now)
+            self._sessions.move_to_end(connection_id)
+            return session, clients[client_index]
+
+        self._evict(now)
+
+        client_index = min(range(self.pool_size), key=self._client_load.__getitem__)
+        session = dialogflow.SessionsAsyncClient.session_path(
+            self.project_id, f"{self.session_prefix}-{uuid.uuid4().hex}"
+        )
+        self._sessions[connection_id] = (session, client_index, now)
+        self._client_load[client_index] += 1
+
+        logger.info(f"Created Dialogflow session for connection {connection_id} on channel {client_index}")
+        return session, clients[client_index]
+
+    def release(self, connection_id: str):
+        """
+        Drop the session of a closed connection.
+
+        Args:
+            connection_id: Unique ID of the connection
+        """
+        entry = self._sessions.pop(connection_id, None)
+        if entry is not None:
+            self._client_load[entry[1]] -= 1
+
+    def _evict(self, now: float):
+        """Evict expired sessions, then the least recently used ones above capacity."""
+        while self._sessions:
+            connection_id, (_, client_index, last_used) = next(iter(self._sessions.items()))
+            expired = now - last_used > self.session_ttl
+            if not expired and len(self._sessions) < self.max_sessions:
+                break
+            self._sessions.popitem(last=False)
+            self._client_load[client_index] -= 1
+            logger.info(f"Evicted {'idle' if expired else 'least recently used'} Dialogflow session for connection {connection_id}")
+
+    @property
+    def active_sessions(self) -> int:
+        """Number of sessions currently held."""
+        return len(self._sessions)
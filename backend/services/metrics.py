@@ -0,0 +1,335 @@
+# Process Metrics (Prometheus Text Format)
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from audio-chunk scale to slow LLM responses
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# A sample reported by a collector: name, type, help, labels, value
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Timer:
+    """Context manager that observes its elapsed time in a histogram."""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "Histogram"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+class _Metric(ABC):
+    """
+    Base of the metric types.
+
+    A metric with label names is a family: labels() returns (and caches)
+    the child for one combination of label values, and only children hold
+    values. Hot paths can keep the child to skip the lookup.
+    """
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._label_values: Tuple[str, ...] = ()
+        self._children: Dict[Tuple[str, ...], "_Metric"] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any) -> "_Metric":
+        """
+        Get the child for a combination of label values.
+
+        Args:
+            *values: One value per label name, in order
+
+        Returns:
+            The child metric
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child()
+                    child._label_values = key
+                    self._children[key] = child
+        return child
+
+    def _new_child(self) -> "_Metric":
+        return type(self)(self.name, self.help)
+
+    def _series(self) -> Iterable["_Metric"]:
+        """Metrics holding values: the children, or the metric itself without labels."""
+        if self.labelnames:
+            return list(self._children.values())
+        return [self]
+
+    def _labels_dict(self, child: "_Metric") -> Dict[str, str]:
+        return dict(zip(self.labelnames, child._label_values))
+
+    @abstractmethod
+    def _lines(self, labels: Dict[str, str]) -> List[str]:
+        """Exposition lines of one series, with its labels."""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for child in self._series():
+            lines.extend(child._lines(self._labels_dict(child)))
+        return lines
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def _lines(self, labels: Dict[str, str]) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(self.value)}"]
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def _lines(self, labels: Dict[str, str]) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(self.value)}"]
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in fixed buckets.
+
+    Observing is a binary search over the bucket bounds and two additions
+    under a lock, so it is cheap enough to time every stage of every
+    utterance. Buckets are stored non-cumulatively and summed at render time.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self) -> "Histogram":
+        return Histogram(self.name, self.help, buckets=self.buckets)
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> _Timer:
+        """Time a block of code: `with histogram.time(): ...`"""
+        return _Timer(self)
+
+    def _lines(self, labels: Dict[str, str]) -> List[str]:
+        with self._lock:
+            counts, total, count = list(self._counts), self.sum, self.count
+
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            bucket_labels = {**labels, "le": _format_value(float(bound))}
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Process-wide set of metrics, rendered in the Prometheus text format.
+
+    Instrumented code creates its metrics once (creating a metric that
+    already exists returns it) and updates them as it runs. State that
+    already lives elsewhere, like cache counters and queue lengths, is
+    read at scrape time through collectors instead of being mirrored.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """
+        Add a function that reports samples at scrape time.
+
+        Args:
+            collector: Returns (name, type, help, labels, value) samples
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def register_stats(
+        self,
+        prefix: str,
+        stats: Callable[[], Dict[str, Any]],
+        labels: Optional[Dict[str, str]] = None,
+        counters: Sequence[str] = ("hits", "misses")
+    ):
+        """
+        Export a component's stats() dictionary.
+
+        Each numeric key becomes `<prefix>_<key>`: a counter (with a
+        `_total` suffix) for the keys in `counters`, a gauge otherwise.
+
+        Args:
+            prefix: Metric name prefix
+            stats: Function returning the current stats
+            labels: Labels identifying the component (e.g. {"cache": "tts"})
+            counters: Keys that only ever increase
+        """
+        labels = labels or {}
+
+        def collect() -> List[Sample]:
+            samples = []
+            for key, value in stats().items():
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    continue
+                if key in counters:
+                    samples.append((f"{prefix}_{key}_total", "counter", f"{key} counter", labels, value))
+                else:
+                    samples.append((f"{prefix}_{key}", "gauge", f"Current {key}", labels, value))
+            return samples
+
+        self.register_collector(collect)
+
+    def clear_collectors(self):
+        """Remove all collectors (their components are being shut down)."""
+        with self._lock:
+            self._collectors.clear()
+
+    def render(self) -> str:
+        """
+        Render every metric and collected sample.
+
+        Returns:
+            str: Prometheus text exposition format
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        # Samples of the same name from several collectors share one header
+        collected: Dict[str, Tuple[str, str, List[str]]] = {}
+        for collector in collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+                continue
+            for name, metric_type, help, labels, value in samples:
+                entry = collected.setdefault(name, (metric_type, help, []))
+                entry[2].append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name, (metric_type, help, samples) in collected.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples)
+
+        return "\n".join(lines) + "\n"
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Get the process-wide metrics registry.
+
+    Returns:
+        MetricsRegistry: The shared registry
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
@@ -0,0 +1,95 @@
+# Micro-Batching Dispatcher
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Groups concurrent requests into batches for one model call.
+
+    The first request to arrive opens a short collection window
+    (`max_wait_ms`); every request submitted before it closes, up to
+    `max_batch_size`, is run through `run_batch` together in the executor,
+    and each caller gets its own result back. Under light load a request
+    waits at most `max_wait_ms`; under heavy load batches fill up and are
+    dispatched immediately.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], List[Any]],
+        executor: Executor,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            run_batch: Maps a list of items to a list of results in the same order
+                (called in the executor)
+            executor: Pool that runs the batches
+            max_batch_size: Maximum number of items per batch
+            max_wait_ms: How long the first item of a batch waits for others
+        """
+        self.run_batch = run_batch
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item for the next batch and wait for its result.
+
+        Args:
+            item: Input for run_batch
+
+        Returns:
+            Any: The item's result
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Dispatch the pending items, skipping callers that stopped waiting."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending = [(item, future) for item, future in self._pending if not future.done()]
+        self._pending = []
+
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(pending), self.max_batch_size):
+            batch = pending[start:start + self.max_batch_size]
+            task = loop.run_in_executor(self.executor, self.run_batch, [item for item, _ in batch])
+            task.add_done_callback(lambda done, batch=batch: self._resolve(batch, done))
+
+    def _resolve(self, batch, done: asyncio.Future):
+        """Route batch results back to the waiting callers."""
+        if done.exception() is not None:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(done.exception())
+            return
+
+        for (_, future), result in zip(batch, done.result()):
+            if not future.done():
+                future.set_result(result)
@@ -1,33 +1,45 @@
 import sounddevice as sd
-from typing import Dict, Tuple, Union
+from time import monotonic
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
 import logging
 import numpy as np
 from config.components.config import ConfigurationManager
 
+from .audio_ring_buffer import AudioRingBuffer
+from .stream_registry import STREAM_REGISTRY, register_stream
+
 
 
 logger = logging.getLogger(__name__)
 
-STREAM_REGISTRY = {}
 CONFIG = ConfigurationManager()
 
-def register_stream(engine: str):
-    def decorator(cls):
-        STREAM_REGISTRY[engine] = cls
-        return cls
-
-    return decorator
-
 @register_stream("sounddevice")
 class SounddeviceStream:
-    def __init__(self):
+    """
+    Microphone capture through sounddevice.
+
+    In "blocking" capture mode read() calls the stream's blocking read.
+    In "callback" mode PortAudio's callback fills a preallocated
+    AudioRingBuffer instead: read() and frames() hand out blocks of the
+    ring as memoryviews, valid until the next block is requested, and
+    stats() reports overruns and underruns.
+
+    Settings come from CONFIG["microphone"]; `device_index` and
+    `channels` can be overridden to capture from several devices at once
+    (see MultiStreamCapture in capture.py).
+    """
+
+    def __init__(self, device_index: Optional[int] = None, channels: Optional[int] = None, capture_mode: Optional[str] = None):
         config = CONFIG["microphone"]
-        self.channels: int = int(config["channels"])
+        self.channels: int = int(channels if channels is not None else config["channels"])
         self.samplerate: int = int(config["samplerate"])
-        self.device_index: int = int(config["device_index"])
+        self.device_index: int = int(device_index if device_index is not None else config["device_index"])
         self.chunk: int = int(config["chunk"])
         self.dtype: str = str(config["dtype"])
         self.stream_type = config["sounddevice"]["stream_type"]
+        self.capture_mode: str = str(capture_mode or config["sounddevice"].get("capture_mode", "blocking"))
+        self.ring_blocks: int = int(config["sounddevice"].get("ring_blocks", 64))
         self.stream_cls = None
         input_stream_registry = {"raw": sd.RawInputStream, "numpy": sd.InputStream}
 
@@ -35,33 +47,86 @@ class SounddeviceStream:
 
         if self.stream_cls == None:
             raise ValueError(f"Unknown stream type: {self.stream_type}")
+        if self.capture_mode not in ("blocking", "callback"):
+            raise ValueError(f"Unknown capture mode: {self.capture_mode}")
 
         self.mic_audio = self.stream_cls
         self.stream = self.mic_audio
+        self.ring: Optional[AudioRingBuffer] = None
+        self._reported_overruns = 0
+        self.start_time: Optional[float] = None  # Monotonic time of the first captured frame
 
     def start(self):
         self.stream.start()
 
     def close(self):
         self.stream.close()
+        if self.ring is not None:
+            self.ring.close()
 
     def stop(self):
         self.stream.stop()
 
     def terminate(self):
         self.stream.abort()
+        if self.ring is not None:
+            self.ring.close()
 
     def open(self):
+        kwargs = {}
+        if self.capture_mode == "callback":
+            self.ring = AudioRingBuffer(self.chunk, self.channels, self.dtype, self.ring_blocks)
+            self._reported_overruns = 0
+            self.start_time = None
+            kwargs["callback"] = self._callback
+
         self.stream = self.mic_audio(
             channels=self.channels,
             samplerate=self.samplerate,
             device=self.device_index,
             blocksize=self.chunk,
             dtype=self.dtype,
-        )        
+            **kwargs
+        )
+
+    def _callback(self, indata, frames, time, status):
+        # Runs on PortAudio's thread: copy into the ring and return, never block
+        if self.start_time is None:
+            self.start_time = monotonic() - frames / self.samplerate
+        if status.input_overflow:
+            self.ring.input_overflows += 1
+        self.ring.write(indata)
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[Union[np.ndarray, memoryview, None], bool]:
+        """
+        Read one chunk.
+
+        Returns:
+            Tuple: The audio and whether audio was lost since the previous read.
+                In callback mode the audio is a memoryview of the ring (None on timeout).
+        """
+        if self.ring is None:
+            return self.stream.read(self.chunk)
+
+        view = self.ring.read(timeout)
+        lost = self.ring.overruns + self.ring.input_overflows
+        overflowed, self._reported_overruns = lost != self._reported_overruns, lost
+        return view, overflowed
+
+    async def frames(self, timeout: Optional[float] = None) -> AsyncIterator[memoryview]:
+        """
+        Iterate over captured chunks without blocking the event loop (callback mode only).
+
+        Yields:
+            memoryview: Raw bytes of each chunk, valid until the next one is requested
+        """
+        if self.ring is None:
+            raise RuntimeError("frames() requires capture_mode 'callback'")
+        async for view in self.ring.frames(timeout):
+            yield view
+
+    def stats(self) -> Dict[str, int]:
+        return self.ring.stats() if self.ring is not None else {}
 
-    def read(self):
-        return self.stream.read(self.chunk)
-    
     def is_active(self):
-        return self.stream.active
\ No newline at end of file
+        return self.stream.active
@@ -0,0 +1,181 @@
+# Multi-Process Audio Worker Pool
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional
+
+from .audio_input import AudioInput
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Shared memory blocks are reused in power-of-two sizes, starting at 64 KiB
+MIN_BLOCK_SIZE = 64 * 1024
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to a block owned by the parent without handing it to this process's resource tracker."""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers attached blocks, and the tracker
+        # would unlink them when the worker exits
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args: None
+        try:
+            return SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+def _run_with_shared_audio(fn: Callable, name: str, nbytes: int, sample_rate: int, channels: int, args: tuple) -> Any:
+    """Rebuild the AudioInput from shared memory and call `fn` on it (runs in a worker process)."""
+    shm = _attach(name)
+    audio = AudioInput(shm.buf[:nbytes], sample_rate, channels)
+    try:
+        return fn(audio, *args)
+    finally:
+        del audio
+        try:
+            shm.close()
+        except BufferError:
+            # The result still views the block; the mapping goes away with it
+            pass
+
+def _noop() -> None:
+    """Used to start the worker processes ahead of the first request."""
+
+class AudioProcessPool:
+    """
+    Process pool for CPU-heavy audio and model work.
+
+    Threads share one GIL, so pure-Python or GIL-holding stages cannot use
+    more than one core. This pool runs them in worker processes instead.
+    Audio is passed through shared memory rather than pickled, so handing an
+    utterance to a worker costs one copy into a reused block, and the event
+    loop never blocks on the work itself.
+
+    Functions run in the pool must be importable module-level functions.
+    """
+
+    def __init__(self, max_workers: int = 2, max_free_blocks: int = 8):
+        """
+        Initialize the pool. Worker processes start on first use or warm_up().
+
+        Args:
+            max_workers: Number of worker processes
+            max_free_blocks: Number of idle shared memory blocks kept for reuse
+        """
+        self.max_workers = max_workers
+        self.max_free_blocks = max_free_blocks
+
+        # Spawned workers do not inherit the server's threads, locks or sockets
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self._free_blocks: Dict[int, List[SharedMemory]] = {}
+        self._free_count = 0
+
+        logger.info(f"Initialized audio process pool with {max_workers} workers")
+
+    async def warm_up(self):
+        """Start every worker process so the first requests do not pay for it."""
+        await asyncio.gather(*(self.run(_noop) for _ in range(self.max_workers)))
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run a function in a worker process.
+
+        Args:
+            fn: Module-level function
+            *args: Picklable arguments
+
+        Returns:
+            Any: The function's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def run_audio(self, fn: Callable, audio: AudioInput, *args) -> Any:
+        """
+        Run a function on an utterance in a worker process.
+
+        The PCM payload is copied once into shared memory and the worker
+        reads it in place. If the caller is cancelled, the block is only
+        reused once the worker is done with it.
+
+        Args:
+            fn: Module-level function taking an AudioInput followed by `args`
+            audio: Audio to process
+            *args: Further picklable arguments
+
+        Returns:
+            Any: The function's result
+        """
+        nbytes = len(audio.pcm)
+        shm = self._acquire_block(nbytes)
+        shm.buf[:nbytes] = audio.pcm
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor, _run_with_shared_audio, fn, shm.name, nbytes, audio.sample_rate, audio.channels, args
+        )
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._release_block(shm)
+            else:
+                future.add_done_callback(lambda _: self._release_block(shm))
+
+    def _acquire_block(self, nbytes: int) -> SharedMemory:
+        """Get an idle block of at least `nbytes`, creating one if needed."""
+        size = max(MIN_BLOCK_SIZE, 1 << (nbytes - 1).bit_length())
+        blocks = self._free_blocks.get(size)
+        if blocks:
+            self._free_count -= 1
+            return blocks.pop()
+        return SharedMemory(create=True, size=size)
+
+    def _release_block(self, shm: SharedMemory):
+        """Keep a block for reuse, or free it if enough are idle."""
+        if self._free_count < self.max_free_blocks:
+            self._free_blocks.setdefault(shm.size, []).append(shm)
+            self._free_count += 1
+        else:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self):
+        """Stop the worker processes and free the shared memory."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for blocks in self._free_blocks.values():
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+        self._free_blocks.clear()
+        self._free_count = 0
+
+_process_pool: Optional[AudioProcessPool] = None
+_process_pool_lock = threading.Lock()
+
+def get_process_pool(**kwargs) -> AudioProcessPool:
+    """
+    Get the process-wide audio process pool.
+
+    Args:
+        **kwargs: Settings passed to AudioProcessPool when it is first created
+
+    Returns:
+        AudioProcessPool: The shared pool
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = AudioProcessPool(**kwargs)
+        return _process_pool
@@ -0,0 +1,95 @@
+# Sentence Segmentation for Incremental Speech Synthesis
+
+import re
+from typing import List
+
+# A sentence ends at . ! ? (optionally followed by closing quotes/brackets)
+# when followed by whitespace or the end of the text
+_SENTENCE_END = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]]))\s+')
+
+def split_sentences(text: str, min_length: int = 20) -> List[str]:
+    """
+    Split text into sentences for sentence-by-sentence synthesis.
+
+    Very short sentences are merged with the following one so that each
+    synthesis request carries enough text to sound natural.
+
+    Args:
+        text: Text to split
+        min_length: Minimum number of characters per segment
+
+    Returns:
+        List[str]: Non-empty sentences in order
+    """
+    sentences = []
+    pending = ""
+
+    for part in _SENTENCE_END.split(text.strip()):
+        part = part.strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}" if pending else part
+        if len(pending) >= min_length:
+            sentences.append(pending)
+            pending = ""
+
+    if pending:
+        if sentences and len(pending) < min_length:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+
+    return sentences
+
+class SentenceSegmenter:
+    """
+    Incremental sentence splitter for streamed LLM output.
+
+    Text is fed in arbitrary pieces (tokens); complete sentences are returned
+    as soon as the whitespace after their final punctuation arrives. Short
+    sentences are held back and merged with the next one, as in
+    split_sentences.
+    """
+
+    def __init__(self, min_length: int = 20):
+        """
+        Initialize the segmenter.
+
+        Args:
+            min_length: Minimum number of characters per segment
+        """
+        self.min_length = min_length
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text.
+
+        Args:
+            text: Next piece of text
+
+        Returns:
+            List[str]: Sentences completed by this piece, in order
+        """
+        self._buffer += text
+        sentences = []
+        start = 0
+
+        for match in _SENTENCE_END.finditer(self._buffer):
+            candidate = self._buffer[start:match.start()].strip()
+            if len(candidate) >= self.min_length:
+                sentences.append(candidate)
+                start = match.end()
+
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """
+        Return whatever text is left at the end of the stream.
+
+        Returns:
+            List[str]: The remaining text as one segment, if any
+        """
+        remainder, self._buffer = self._buffer.strip(), ""
+        return [remainder] if remainder else []
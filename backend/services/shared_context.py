@@ -0,0 +1,356 @@
+# Shared Connection Context
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from .conversation_storage import ConversationStorage
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SharedContext:
+    """
+    Process-wide state shared by every WebSocket connection.
+
+    The system prompt, user profile and vision settings are read from disk
+    once and kept in memory. Writes go through to disk off the event loop,
+    and an optional watcher reloads a file when it is changed externally.
+    Connections only hold a reference to this object, so connecting does
+    no file I/O.
+
+    Files are replaced atomically, and writes and reloads hold the same
+    lock, so the watcher never reads a half-written file. A reload that
+    finds a file empty or unparsable keeps the value already in memory.
+    """
+
+    def __init__(self, prompts_dir: str = "prompts"):
+        """
+        Load the shared files.
+
+        Args:
+            prompts_dir: Directory holding the prompt, profile and settings files
+        """
+        # File paths
+        self.prompt_path = os.path.join(prompts_dir, "system_prompt.md")
+        self.profile_path = os.path.join(prompts_dir, "user_profile.json")
+        self.vision_settings_path = os.path.join(prompts_dir, "vision_settings.json")
+
+        # Load system prompt, user profile, and vision settings
+        self.system_prompt = self._load_system_prompt()
+        self.user_profile = self._load_user_profile()
+        self.vision_settings = self._load_vision_settings()
+        self._mtimes = self._read_mtimes()
+
+        # Initialize conversation storage
+        self.conversation_storage = ConversationStorage()
+
+        self._watch_task: Optional[asyncio.Task] = None
+        self._file_lock = threading.Lock()  # Held by writes and reloads
+
+        logger.info("Initialized shared connection context")
+
+    def _load_system_prompt(self, current: Optional[str] = None) -> str:
+        """
+        Load system prompt from file or use default if file doesn't exist.
+
+        Args:
+            current: Value in memory, kept if the file is empty or unreadable (on reload)
+
+        Returns:
+            str: The system prompt
+        """
+        default_prompt = (
+            "You are a helpful, friendly, and concise voice assistant."
+            "Respond to user queries in a natural, conversational manner."
+            "Keep responses brief and to the point, as you're communicating via voice."
+            "When providing information, focus on the most relevant details."
+            "If you don't know something, admit it rather than making up an answer"
+            "\n\n"
+            "Through the webapp, you can receive and understand photographs and pictures."
+            "\n\n"
+            "When the user sends a message like '[silent]', '[no response]', or '[still waiting]', it means they've gone quiet or haven't responded."
+            "When you see these signals, continue the conversation naturally based on the previous topic and context."
+            "Stay on topic, be helpful, and don't mention that they were silent - just carry on the conversation as if you're gently following up."
+        )
+
+        try:
+            # Create directory if it doesn't exist
+            os.makedirs(os.path.dirname(self.prompt_path), exist_ok=True)
+
+            # Read from file if it exists
+            if os.path.exists(self.prompt_path):
+                with open(self.prompt_path, "r") as f:
+                    prompt = f.read().strip()
+                    if prompt:  # Only use if not empty
+                        return prompt
+                    if current is not None:
+                        return current
+
+            # If file doesn't exist or is empty, write default prompt
+            self._write_file(self.prompt_path, default_prompt)
+
+            return default_prompt
+
+        except Exception as e:
+            logger.error(f"Error loading system prompt: {e}")
+            return current if current is not None else default_prompt
+
+    def _load_user_profile(self, current: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Load user profile from file or create a default one if it doesn't exist.
+
+        Args:
+            current: Value in memory, kept if the file is empty or unreadable (on reload)
+
+        Returns:
+            Dict[str, Any]: The user profile
+        """
+        default_profile = {
+            "name": "",
+            "preferences": {}
+        }
+
+        try:
+            # Create directory if it doesn't exist
+            os.makedirs(os.path.dirname(self.profile_path), exist_ok=True)
+
+            # Read from file if it exists
+            if os.path.exists(self.profile_path):
+                with open(self.profile_path, "r") as f:
+                    profile = json.load(f)
+                    if profile:  # Only use if not empty
+                        return profile
+                    if current is not None:
+                        return current
+
+            # If file doesn't exist or is empty, write default profile
+            self._write_file(self.profile_path, json.dumps(default_profile, indent=2))
+
+            return default_profile
+
+        except Exception as e:
+            logger.error(f"Error loading user profile: {e}")
+            return current if current is not None else default_profile
+
+    def _write_user_profile(self) -> bool:
+        """
+        Save user profile to file.
+
+        Returns:
+            bool: Whether the save was successful
+        """
+        try:
+            self._write_file(self.profile_path, json.dumps(self.user_profile, indent=2))
+            return True
+        except Exception as e:
+            logger.error(f"Error saving user profile: {e}")
+            return False
+
+    def _load_vision_settings(self, current: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Load vision settings from file or create a default one if it doesn't exist.
+
+        Args:
+            current: Value in memory, kept if the file is empty or unreadable (on reload)
+
+        Returns:
+            Dict[str, Any]: The vision settings
+        """
+        default_settings = {
+            "enabled": False
+        }
+
+        try:
+            # Create directory if it doesn't exist
+            os.makedirs(os.path.dirname(self.vision_settings_path), exist_ok=True)
+
+            # Read from file if it exists
+            if os.path.exists(self.vision_settings_path):
+                with open(self.vision_settings_path, "r") as f:
+                    settings = json.load(f)
+                    if settings:  # Only use if not empty
+                        return settings
+                    if current is not None:
+                        return current
+
+            # If file doesn't exist or is empty, write default settings
+            self._write_file(self.vision_settings_path, json.dumps(default_settings, indent=2))
+
+            return default_settings
+
+        except Exception as e:
+            logger.error(f"Error loading vision settings: {e}")
+            return current if current is not None else default_settings
+
+    def _write_vision_settings(self) -> bool:
+        """
+        Save vision settings to file.
+
+        Returns:
+            bool: Whether the save was successful
+        """
+        try:
+            self._write_file(self.vision_settings_path, json.dumps(self.vision_settings, indent=2))
+            return True
+        except Exception as e:
+            logger.error(f"Error saving vision settings: {e}")
+            return False
+
+    def _write_system_prompt(self) -> bool:
+        """
+        Save the system prompt to file.
+
+        Returns:
+            bool: Whether the save was successful
+        """
+        try:
+            self._write_file(self.prompt_path, self.system_prompt)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving system prompt: {e}")
+            return False
+
+    @staticmethod
+    def _write_file(path: str, content: str):
+        """
+        Replace a file's content atomically.
+
+        The content is written to a temporary file in the same directory,
+        which then replaces the file, so readers see either the old or the
+        new content.
+
+        Args:
+            path: File to write
+            content: New content
+        """
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    async def save_system_prompt(self, prompt: str) -> bool:
+        """
+        Update the system prompt in memory and save it off the event loop.
+
+        Args:
+            prompt: New system prompt
+
+        Returns:
+            bool: Whether the save was successful
+        """
+        self.system_prompt = prompt
+        return await self._save(self._write_system_prompt, self.prompt_path)
+
+    async def save_user_profile(self) -> bool:
+        """Save the in-memory user profile off the event loop."""
+        return await self._save(self._write_user_profile, self.profile_path)
+
+    async def save_vision_settings(self) -> bool:
+        """Save the in-memory vision settings off the event loop."""
+        return await self._save(self._write_vision_settings, self.vision_settings_path)
+
+    async def _save(self, write, path: str) -> bool:
+        """Run a write in a thread and remember the new mtime so the watcher skips it."""
+        def locked_write() -> bool:
+            with self._file_lock:
+                success = write()
+                if success:
+                    self._mtimes[path] = self._mtime(path)
+                return success
+
+        return await asyncio.to_thread(locked_write)
+
+    @staticmethod
+    def _mtime(path: str) -> Optional[float]:
+        """Modification time of a file, or None if it does not exist."""
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def _read_mtimes(self) -> Dict[str, Optional[float]]:
+        """Modification times of all watched files."""
+        return {
+            path: self._mtime(path)
+            for path in (self.prompt_path, self.profile_path, self.vision_settings_path)
+        }
+
+    def reload_changed(self) -> bool:
+        """
+        Reload any file whose modification time changed since it was last read or written.
+
+        Returns:
+            bool: Whether anything was reloaded
+        """
+        with self._file_lock:
+            mtimes = self._read_mtimes()
+            changed = [path for path, mtime in mtimes.items() if mtime != self._mtimes.get(path)]
+
+            for path in changed:
+                logger.info(f"Reloading changed file: {path}")
+                if path == self.prompt_path:
+                    self.system_prompt = self._load_system_prompt(self.system_prompt)
+                elif path == self.profile_path:
+                    self.user_profile = self._load_user_profile(self.user_profile)
+                else:
+                    self.vision_settings = self._load_vision_settings(self.vision_settings)
+
+            # Loaders may have rewritten defaults, so take fresh mtimes
+            self._mtimes = self._read_mtimes() if changed else mtimes
+            return bool(changed)
+
+    def start_watching(self, interval: float = 2.0):
+        """
+        Poll the shared files for external changes in the background.
+
+        Args:
+            interval: Seconds between checks
+        """
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def _watch(self, interval: float):
+        """Background loop for start_watching."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload_changed)
+            except Exception as e:
+                logger.error(f"Error checking shared files for changes: {e}")
+
+    def stop_watching(self):
+        """Stop the background file watcher."""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+_shared_context: Optional[SharedContext] = None
+_shared_context_lock = threading.Lock()
+
+def get_shared_context() -> SharedContext:
+    """
+    Get the process-wide shared context, loading it on first use.
+
+    Returns:
+        SharedContext: The shared context
+    """
+    global _shared_context
+    with _shared_context_lock:
+        if _shared_context is None:
+            _shared_context = SharedContext()
+        return _shared_context
@@ -0,0 +1,100 @@
+# Pipelined LLM-to-Speech Engine
+
+import asyncio
+import logging
+from typing import AsyncIterator, Optional, Tuple
+
+from .sentences import SentenceSegmenter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SpeechPipeline:
+    """
+    Turns a stream of LLM tokens into an ordered stream of spoken sentences.
+
+    Tokens are cut at sentence boundaries and each sentence is sent to TTS
+    as soon as it is complete, so sentence 1 is being synthesized (and
+    played) while the LLM is still writing sentence 2. At most
+    `max_pending` sentences are synthesized ahead of the consumer.
+    """
+
+    def __init__(self, tts_client, max_pending: int = 2, min_sentence_length: int = 20):
+        """
+        Initialize the pipeline.
+
+        Args:
+            tts_client: TTS client exposing async_text_to_speech()
+            max_pending: Maximum number of sentences synthesized ahead of playback
+            min_sentence_length: Minimum number of characters per synthesized segment
+        """
+        self.tts_client = tts_client
+        self.max_pending = max_pending
+        self.min_sentence_length = min_sentence_length
+
+    async def run(
+        self,
+        tokens: AsyncIterator[str],
+        cancel_event: Optional[asyncio.Event] = None
+    ) -> AsyncIterator[Tuple[str, bytes]]:
+        """
+        Synthesize streamed text sentence by sentence.
+
+        Args:
+            tokens: Streamed LLM output
+            cancel_event: Event that stops the pipeline when set
+
+        Yields:
+            Tuple[str, bytes]: Each sentence with its audio, in order
+        """
+        # Holds (sentence, TTS task) in order, then None at the end of the stream
+        ready: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.max_pending)
+        tts_tasks = []
+
+        async def produce():
+            segmenter = SentenceSegmenter(self.min_sentence_length)
+            try:
+                async for token in tokens:
+                    for sentence in segmenter.feed(token):
+                        await start_tts(sentence)
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+                for sentence in segmenter.flush():
+                    await start_tts(sentence)
+            except Exception as e:
+                ready.put_nowait(e)
+            finally:
+                ready.put_nowait(None)
+
+        async def start_tts(sentence: str):
+            await slots.acquire()
+            task = asyncio.create_task(self.tts_client.async_text_to_speech(sentence))
+            tts_tasks.append(task)
+            ready.put_nowait((sentence, task))
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                item = await ready.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+
+                sentence, task = item
+                try:
+                    audio = await task
+                finally:
+                    slots.release()
+
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                yield sentence, audio
+        finally:
+            producer.cancel()
+            for task in tts_tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(producer, *tts_tasks, return_exceptions=True)
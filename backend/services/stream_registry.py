@@ -0,0 +1,36 @@
+# Audio Capture Stream Registry
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STREAM_REGISTRY = {}
+
+def register_stream(engine: str):
+    """Register a capture stream class under an engine name."""
+    def decorator(cls):
+        STREAM_REGISTRY[engine] = cls
+        return cls
+
+    return decorator
+
+def create_stream(engine: str, **kwargs):
+    """
+    Create a capture stream for a registered engine.
+
+    Engines register themselves when their module is imported:
+    "sounddevice" in microphone.py, "file" and "synthetic" in capture.py.
+
+    Args:
+        engine: Engine name
+        **kwargs: Settings passed to the engine's constructor
+
+    Returns:
+        The new (not yet opened) stream
+    """
+    stream_cls = STREAM_REGISTRY.get(engine)
+    if stream_cls is None:
+        raise ValueError(f"Unknown capture stream engine: {engine} (available: {', '.join(sorted(STREAM_REGISTRY))})")
+    return stream_cls(**kwargs)
@@ -1,32 +1,53 @@
 # Speech-to-Text Transcription Service (Google Dialogflow Version)
 
+import asyncio
 import logging
-import io
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, AsyncIterator, Optional, Tuple, Union
+from google.api_core import exceptions as google_exceptions
 from google.cloud import dialogflow_v2 as dialogflow
-from google.cloud.dialogflow_v2.types import InputAudioConfig, QueryInput, AudioEncoding
+from google.cloud.dialogflow_v2.types import (
+    InputAudioConfig,
+    QueryInput,
+    AudioEncoding,
+    StreamingDetectIntentRequest,
+    StreamingRecognitionResult,
+)
 import os
 import time
-import wave
+
+from .audio_input import AudioInput, BufferLike
+from .dialogflow_sessions import DialogflowSessionManager
+from .transcriber_registry import Transcriber, register_transcriber
+from .transcription_cache import TranscriptionCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class DialogflowTranscriber:
+@register_transcriber("dialogflow")
+class DialogflowTranscriber(Transcriber):
     """
     Speech-to-Text service using Google Dialogflow.
 
     This class handles transcription of speech audio using Dialogflow's detectIntent API.
     """
 
+    # "confidence" is the intent's, which depends on the session, so it is not cached
+    cached_fields = ("language", "speech_recognition_confidence")
+
     def __init__(
         self,
         project_id: str,
         session_id: str,
         language_code: str = "en-US",
-        credentials_path: str = None
+        credentials_path: str = None,
+        max_concurrent_requests: int = 16,
+        request_timeout: float = 10.0,
+        stream_timeout: float = 60.0,
+        session_manager: Optional[DialogflowSessionManager] = None,
+        fallback: Optional[Transcriber] = None,
+        cache: Optional[TranscriptionCache] = None
     ):
         """
         Initialize the transcription service.
@@ -36,10 +57,23 @@ class DialogflowTranscriber:
             session_id: Unique session ID for each conversation
             language_code: Language code for transcription (default is 'en-US')
             credentials_path: Path to Google credentials JSON (if not already set in env)
+            max_concurrent_requests: Maximum number of in-flight async detectIntent calls
+            request_timeout: Timeout in seconds for a single async detectIntent call
+            stream_timeout: Deadline in seconds for a whole streamingDetectIntent call
+            session_manager: Per-connection session pool used when a connection_id is given
+            fallback: Transcriber used when an async detectIntent call times out
+            cache: Cache of transcripts keyed by audio content (optional)
         """
         self.project_id = project_id
         self.session_id = session_id
         self.language_code = language_code
+        self.max_concurrent_requests = max_concurrent_requests
+        self.request_timeout = request_timeout
+        self.stream_timeout = stream_timeout
+        self.session_manager = session_manager
+        self.fallback = fallback
+        self.cache = cache
+        self.is_processing = False
 
         if credentials_path:
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
@@ -47,24 +81,86 @@ class DialogflowTranscriber:
         self.session_client = dialogflow.SessionsClient()
         self.session = self.session_client.session_path(project_id, session_id)
 
+        # The async client and semaphore bind to the running event loop,
+        # so they are created lazily on the first async_transcribe call
+        self.async_session_client: Optional[dialogflow.SessionsAsyncClient] = None
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        self._active_requests = 0
+
         logger.info(f"Initialized Dialogflow Transcriber with project_id={project_id}, session_id={session_id}")
 
-    def _extract_sample_rate(self, audio: np.ndarray) -> int:
-        """Extract the sample rate from the WAV header in the numpy audio array."""
-        try:
-            with io.BytesIO(audio) as byte_stream:
-                with wave.open(byte_stream, 'rb') as wav_file:
-                    return wav_file.getframerate()
-        except Exception as e:
-            logger.warning(f"Could not extract sample rate, defaulting to 16000 Hz: {e}")
-            return 16000
+    def _to_audio_input(self, audio: Union[AudioInput, BufferLike]) -> AudioInput:
+        """
+        Get a validated, zero-copy view of the PCM payload.
 
-    def transcribe(self, audio: np.ndarray) -> Tuple[str, Dict[str, Any]]:
+        Args:
+            audio: An AudioInput, or a complete WAV file (uint8 array or bytes-like)
+
+        Returns:
+            AudioInput: Mono 16-bit PCM with its sample rate
+        """
+        if not isinstance(audio, AudioInput):
+            if isinstance(audio, np.ndarray) and audio.dtype != np.uint8:
+                raise ValueError("Dialogflow requires WAV format audio with headers in uint8.")
+            audio = AudioInput.from_wav(audio)
+
+        if audio.channels != 1:
+            raise ValueError(f"Dialogflow requires mono audio, got {audio.channels} channels")
+        return audio
+
+    def _build_request(self, audio: Union[AudioInput, BufferLike], session: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+        """
+        Build the detectIntent request for an utterance.
+
+        Args:
+            audio: An AudioInput, or a complete WAV file (uint8 array or bytes-like)
+            session: Dialogflow session path (defaults to this transcriber's session)
+
+        Returns:
+            Tuple[Dict[str, Any], int]:
+                - detectIntent request
+                - Sample rate of the audio
+        """
+        audio = self._to_audio_input(audio)
+
+        audio_config = InputAudioConfig(
+            audio_encoding=AudioEncoding.AUDIO_ENCODING_LINEAR_16,
+            language_code=self.language_code,
+            sample_rate_hertz=audio.sample_rate,
+        )
+
+        query_input = QueryInput(audio_config=audio_config)
+
+        # Only the PCM payload is sent; the single copy here is made by the
+        # protobuf field, which requires bytes
+        request = {
+            "session": session or self.session,
+            "query_input": query_input,
+            "input_audio": audio.pcm.tobytes()
+        }
+        return request, audio.sample_rate
+
+    def _build_metadata(self, response, sample_rate: int, processing_time: float) -> Tuple[str, Dict[str, Any]]:
+        """Extract the transcript and metadata from a detectIntent response."""
+        query_result = response.query_result
+        full_text = query_result.query_text
+
+        metadata = {
+            "intent": query_result.intent.display_name,
+            "confidence": query_result.intent_detection_confidence,
+            "speech_recognition_confidence": query_result.speech_recognition_confidence,
+            "language": self.language_code,
+            "processing_time": processing_time,
+            "sample_rate_used": sample_rate
+        }
+        return full_text, metadata
+
+    def transcribe(self, audio: Union[AudioInput, BufferLike]) -> Tuple[str, Dict[str, Any]]:
         """
         Transcribe audio using Google Dialogflow.
 
         Args:
-            audio: Audio data as numpy array (uint8 with WAV headers)
+            audio: Audio data as numpy array (uint8 with WAV headers), or an AudioInput
 
         Returns:
             Tuple[str, Dict[str, Any]]: 
@@ -73,46 +169,217 @@ class DialogflowTranscriber:
         """
         start_time = time.time()
         try:
-            if audio.dtype != np.uint8:
-                raise ValueError("Dialogflow requires WAV format audio with headers in uint8.")
+            audio = self._to_audio_input(audio)
+            cache_key, cached = self._cache_lookup(audio, start_time)
+            if cached is not None:
+                return cached
+
+            request, sample_rate = self._build_request(audio)
+
+            response = self.session_client.detect_intent(request=request)
+
+            processing_time = time.time() - start_time
+            full_text, metadata = self._build_metadata(response, sample_rate, processing_time)
+            self._cache_store(cache_key, full_text, metadata)
+
+            logger.info(f"Transcription completed in {processing_time:.2f}s: {full_text}")
+            return full_text, metadata
+
+        except Exception as e:
+            logger.error(f"Dialogflow transcription error: {e}")
+            return "", {"error": str(e)}
+
+    def _get_async_client(self, connection_id: Optional[str] = None) -> Tuple[str, dialogflow.SessionsAsyncClient]:
+        """
+        Get the session path and async client for a request.
+
+        Requests for a connection use that connection's pooled session; other
+        requests share this transcriber's session and client.
+        """
+        if self._request_semaphore is None:
+            self._request_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        if connection_id is not None and self.session_manager is not None:
+            return self.session_manager.acquire(connection_id)
+
+        if self.async_session_client is None:
+            self.async_session_client = dialogflow.SessionsAsyncClient()
+        return self.session, self.async_session_client
+
+    def release_session(self, connection_id: str):
+        """
+        Release the Dialogflow session of a closed connection.
 
-            # Convert numpy array to bytes for Dialogflow input
-            audio_bytes = io.BytesIO(audio).read()
+        Args:
+            connection_id: Unique ID of the connection
+        """
+        if self.session_manager is not None:
+            self.session_manager.release(connection_id)
+
+    async def async_transcribe(
+        self,
+        audio: Union[AudioInput, BufferLike],
+        connection_id: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Transcribe audio using Google Dialogflow without blocking the event loop.
+
+        At most `max_concurrent_requests` calls are in flight at once; extra
+        callers wait for a free slot. Each call is bounded by `request_timeout`,
+        which does not include the time spent waiting for a slot.
 
-            # Extract actual sample rate from audio header
-            sample_rate = self._extract_sample_rate(audio)
+        Args:
+            audio: Audio data as numpy array (uint8 with WAV headers), or an AudioInput
+            connection_id: Connection whose Dialogflow session should be used
 
+        Returns:
+            Tuple[str, Dict[str, Any]]:
+                - Transcribed text
+                - Metadata dictionary
+        """
+        start_time = time.time()
+        cache_key = None
+        try:
+            audio = self._to_audio_input(audio)
+            cache_key, cached = await self._async_cache_lookup(audio, start_time)
+            if cached is not None:
+                return cached
+
+            session, client = self._get_async_client(connection_id)
+            request, sample_rate = self._build_request(audio, session)
+
+            async with self._request_semaphore:
+                queue_time = time.time() - start_time
+                self._active_requests += 1
+                self.is_processing = True
+                try:
+                    response = await asyncio.wait_for(
+                        client.detect_intent(request=request, timeout=self.request_timeout),
+                        timeout=self.request_timeout
+                    )
+                finally:
+                    self._active_requests -= 1
+                    self.is_processing = self._active_requests > 0
+
+            processing_time = time.time() - start_time
+            full_text, metadata = self._build_metadata(response, sample_rate, processing_time)
+            metadata["queue_time"] = queue_time
+            await self._async_cache_store(cache_key, full_text, metadata)
+
+            logger.info(f"Async transcription completed in {processing_time:.2f}s: {full_text}")
+            return full_text, metadata
+
+        except (asyncio.TimeoutError, google_exceptions.DeadlineExceeded):
+            # Either deadline can fire first: the local wait or the gRPC call's own
+            logger.error(f"Dialogflow transcription timed out after {self.request_timeout}s")
+            if self.fallback is not None:
+                logger.info("Falling back to local transcription")
+                full_text, metadata = await self.fallback.async_transcribe(audio, connection_id)
+                metadata["fallback"] = True
+                # A fallback with its own cache has already stored the result
+                if "cache" not in metadata:
+                    await self._async_cache_store(cache_key, full_text, metadata)
+                return full_text, metadata
+            return "", {"error": f"Transcription timed out after {self.request_timeout}s"}
+        except Exception as e:
+            logger.error(f"Dialogflow transcription error: {e}")
+            return "", {"error": str(e)}
+
+    async def stream_transcribe(
+        self,
+        audio_chunks: AsyncIterator[bytes],
+        sample_rate: int = 16000,
+        single_utterance: bool = True,
+        connection_id: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, bool, Dict[str, Any]]]:
+        """
+        Transcribe raw PCM audio while it is still being received.
+
+        Audio is forwarded to Dialogflow's streamingDetectIntent as it arrives,
+        so recognition runs alongside speech rather than after it. In
+        single_utterance mode Dialogflow decides the end of the utterance,
+        after which no more audio is sent; otherwise the stream ends when
+        `audio_chunks` is exhausted.
+
+        Args:
+            audio_chunks: Async iterator of 16-bit little-endian mono PCM chunks
+            sample_rate: Sample rate of the PCM audio in Hz
+            single_utterance: Let Dialogflow detect the end of the utterance
+            connection_id: Connection whose Dialogflow session should be used
+
+        Yields:
+            Tuple[str, bool, Dict[str, Any]]:
+                - Transcript so far (interim) or final transcript
+                - Whether this is the final result
+                - Metadata dictionary
+        """
+        start_time = time.time()
+        utterance_ended = asyncio.Event()
+        session = None
+
+        async def request_generator():
             audio_config = InputAudioConfig(
                 audio_encoding=AudioEncoding.AUDIO_ENCODING_LINEAR_16,
                 language_code=self.language_code,
                 sample_rate_hertz=sample_rate,
+                single_utterance=single_utterance,
             )
+            yield StreamingDetectIntentRequest(
+                session=session,
+                query_input=QueryInput(audio_config=audio_config),
+            )
+            async for chunk in audio_chunks:
+                if utterance_ended.is_set():
+                    break
+                yield StreamingDetectIntentRequest(input_audio=bytes(chunk))
 
-            query_input = QueryInput(audio_config=audio_config)
+        stream = None
+        try:
+            session, client = self._get_async_client(connection_id)
 
-            response = self.session_client.detect_intent(
-                request={
-                    "session": self.session,
-                    "query_input": query_input,
-                    "input_audio": audio_bytes
-                }
-            )
+            async with self._request_semaphore:
+                self._active_requests += 1
+                self.is_processing = True
+                try:
+                    stream = await client.streaming_detect_intent(
+                        requests=request_generator(),
+                        timeout=self.stream_timeout
+                    )
 
-            query_result = response.query_result
-            full_text = query_result.query_text
-            processing_time = time.time() - start_time
+                    async for response in stream:
+                        result = response.recognition_result
+                        if result.message_type == StreamingRecognitionResult.MessageType.END_OF_SINGLE_UTTERANCE:
+                            utterance_ended.set()
+                            logger.info(f"End of utterance detected after {time.time() - start_time:.2f}s")
+                        elif result.message_type == StreamingRecognitionResult.MessageType.TRANSCRIPT and not result.is_final:
+                            yield result.transcript, False, {
+                                "confidence": result.confidence,
+                                "language": self.language_code,
+                            }
+
+                        if response.query_result.query_text or response.query_result.intent.display_name:
+                            processing_time = time.time() - start_time
+                            full_text, metadata = self._build_metadata(response, sample_rate, processing_time)
+                            metadata["streaming"] = True
+
+                            logger.info(f"Streaming transcription completed in {processing_time:.2f}s: {full_text}")
+                            yield full_text, True, metadata
+                            return
+                finally:
+                    # Abort the RPC if the caller stopped early (barge-in, disconnect)
+                    if stream is not None:
+                        stream.cancel()
+                    self._active_requests -= 1
+                    self.is_processing = self._active_requests > 0
 
-            metadata = {
-                "intent": query_result.intent.display_name,
-                "confidence": query_result.intent_detection_confidence,
+            # Stream closed without a query result (e.g. no speech was recognized)
+            yield "", True, {
                 "language": self.language_code,
-                "processing_time": processing_time,
-                "sample_rate_used": sample_rate
+                "processing_time": time.time() - start_time,
+                "sample_rate_used": sample_rate,
+                "streaming": True
             }
 
-            logger.info(f"Transcription completed in {processing_time:.2f}s: {full_text}")
-            return full_text, metadata
-
         except Exception as e:
-            logger.error(f"Dialogflow transcription error: {e}")
-            return "", {"error": str(e)}
+            logger.error(f"Dialogflow streaming transcription error: {e}")
+            yield "", True, {"error": str(e)}
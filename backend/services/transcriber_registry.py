@@ -0,0 +1,195 @@
+# Transcriber Engine Registry
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
+
+from .audio_input import AudioInput, BufferLike
+from .transcription_cache import TranscriptionCache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TRANSCRIBER_REGISTRY = {}
+
+def register_transcriber(engine: str):
+    """Register a Transcriber class under an engine name."""
+    def decorator(cls):
+        TRANSCRIBER_REGISTRY[engine] = cls
+        return cls
+
+    return decorator
+
+def create_transcriber(engine: str, **kwargs) -> "Transcriber":
+    """
+    Create a transcriber for a registered engine.
+
+    Engines register themselves when their module is imported.
+
+    Args:
+        engine: Engine name (e.g. "dialogflow", "faster_whisper")
+        **kwargs: Settings passed to the engine's constructor
+
+    Returns:
+        Transcriber: The new transcriber
+    """
+    transcriber_cls = TRANSCRIBER_REGISTRY.get(engine)
+    if transcriber_cls is None:
+        raise ValueError(f"Unknown transcriber engine: {engine} (available: {', '.join(sorted(TRANSCRIBER_REGISTRY))})")
+    return transcriber_cls(**kwargs)
+
+class Transcriber(ABC):
+    """
+    Common interface of the transcriber engines.
+
+    Engines implement transcribe() and async_transcribe(). Streaming
+    recognition and per-connection sessions are optional: by default
+    stream_transcribe() collects the audio and transcribes it once the
+    stream ends, and release_session() does nothing.
+
+    Engines given a TranscriptionCache look utterances up with
+    _cache_lookup() before recognizing them and store the results with
+    _cache_store() (or their async_ variants); either way the result
+    metadata reports the cache outcome under "cache". Only the metadata
+    fields in `cached_fields`, which describe the transcript itself, are
+    cached; anything that depends on the session or request is not.
+    """
+
+    is_processing = False
+    language_code: Optional[str] = None
+    cache: Optional[TranscriptionCache] = None
+    cached_fields: Tuple[str, ...] = ("language", "confidence")
+
+    @abstractmethod
+    def transcribe(self, audio: Union[AudioInput, BufferLike]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Transcribe an utterance, blocking until done.
+
+        Args:
+            audio: An AudioInput, or a complete WAV file
+
+        Returns:
+            Tuple[str, Dict[str, Any]]:
+                - Transcribed text
+                - Metadata dictionary
+        """
+
+    @abstractmethod
+    async def async_transcribe(
+        self,
+        audio: Union[AudioInput, BufferLike],
+        connection_id: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Transcribe an utterance without blocking the event loop.
+
+        Args:
+            audio: An AudioInput, or a complete WAV file
+            connection_id: Connection the utterance belongs to
+
+        Returns:
+            Tuple[str, Dict[str, Any]]:
+                - Transcribed text
+                - Metadata dictionary
+        """
+
+    async def stream_transcribe(
+        self,
+        audio_chunks: AsyncIterator[bytes],
+        sample_rate: int = 16000,
+        single_utterance: bool = True,
+        connection_id: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, bool, Dict[str, Any]]]:
+        """
+        Transcribe raw PCM audio that is still being received.
+
+        Args:
+            audio_chunks: Async iterator of 16-bit little-endian mono PCM chunks
+            sample_rate: Sample rate of the PCM audio in Hz
+            single_utterance: Let the engine detect the end of the utterance, if it can
+            connection_id: Connection the utterance belongs to
+
+        Yields:
+            Tuple[str, bool, Dict[str, Any]]:
+                - Transcript so far (interim) or final transcript
+                - Whether this is the final result
+                - Metadata dictionary
+        """
+        pcm = bytearray()
+        async for chunk in audio_chunks:
+            pcm += chunk
+
+        text, metadata = await self.async_transcribe(AudioInput.from_pcm(pcm, sample_rate), connection_id)
+        metadata["streaming"] = False
+        yield text, True, metadata
+
+    def _cache_lookup(self, audio: AudioInput, start_time: float) -> Tuple[Optional[str], Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Look an utterance up in the cache.
+
+        Args:
+            audio: The utterance
+            start_time: When the transcription request started
+
+        Returns:
+            Tuple[Optional[str], Optional[Tuple[str, Dict[str, Any]]]]:
+                - Cache key to store the result under (None without a cache)
+                - Cached text and metadata, or None on a miss
+        """
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(audio, self.language_code)
+        return key, self._cache_hit(self.cache.get(key), start_time)
+
+    async def _async_cache_lookup(self, audio: AudioInput, start_time: float) -> Tuple[Optional[str], Optional[Tuple[str, Dict[str, Any]]]]:
+        """Like _cache_lookup(), but reads the disk tier off the event loop."""
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(audio, self.language_code)
+        return key, self._cache_hit(await self.cache.async_get(key), start_time)
+
+    def _cache_hit(self, cached, start_time: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Report a cache hit in the cached metadata."""
+        if cached is None:
+            return None
+        text, metadata, tier = cached
+        metadata["processing_time"] = time.time() - start_time
+        metadata["cache"] = {"hit": True, "tier": tier, **self.cache.stats()}
+        return text, metadata
+
+    def _cache_store(self, key: Optional[str], text: str, metadata: Dict[str, Any]):
+        """
+        Cache a successful result and report the miss in its metadata.
+
+        Args:
+            key: Key returned by _cache_lookup()
+            text: Transcribed text
+            metadata: Result metadata (updated in place)
+        """
+        if key is None:
+            return
+        if "error" not in metadata:
+            self.cache.put(key, text, self._cacheable(metadata))
+        metadata["cache"] = {"hit": False, "tier": None, **self.cache.stats()}
+
+    async def _async_cache_store(self, key: Optional[str], text: str, metadata: Dict[str, Any]):
+        """Like _cache_store(), but writes the disk tier off the event loop."""
+        if key is None:
+            return
+        if "error" not in metadata:
+            await self.cache.async_put(key, text, self._cacheable(metadata))
+        metadata["cache"] = {"hit": False, "tier": None, **self.cache.stats()}
+
+    def _cacheable(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """The transcript-level fields of a result's metadata."""
+        return {field: metadata[field] for field in self.cached_fields if field in metadata}
+
+    def release_session(self, connection_id: str):
+        """
+        Release any per-connection state of a closed connection.
+
+        Args:
+            connection_id: Unique ID of the connection
+        """
@@ -0,0 +1,216 @@
+# Transcription Result Cache
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .audio_input import AudioInput
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TranscriptionCache:
+    """
+    Content-addressed cache of transcripts.
+
+    Entries are keyed by a hash of the PCM payload together with the
+    language, sample rate and channel count, so identical audio (repeated
+    commands, client retries, test replays) skips the recognizer entirely.
+    The in-memory tier is an LRU bounded by entry count and by the
+    approximate size of the cached results. The optional disk tier keeps
+    one small JSON file per entry, survives restarts and is bounded by
+    entry count; disk hits are promoted to memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 4 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        max_disk_entries: int = 10000
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            max_bytes: Maximum approximate size of the in-memory entries
+            disk_dir: Directory of the disk tier (None keeps the cache in memory only)
+            max_disk_entries: Maximum number of entries kept on disk
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+
+        # key -> (text, metadata, size), least recently used first
+        self._entries: "OrderedDict[str, Tuple[str, Dict[str, Any], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._disk_count = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_count = len(self._disk_entries())
+
+        logger.info(f"Initialized transcription cache (max_entries={max_entries}, disk_dir={disk_dir})")
+
+    @staticmethod
+    def make_key(audio: AudioInput, language: Optional[str]) -> str:
+        """
+        Build the cache key of an utterance.
+
+        Args:
+            audio: The utterance
+            language: Recognition language
+
+        Returns:
+            str: Hex digest of the PCM payload and its recognition settings
+        """
+        digest = hashlib.blake2b(audio.pcm, digest_size=16).hexdigest()
+        return f"{digest}-{language or 'auto'}-{audio.sample_rate}-{audio.channels}"
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any], str]]:
+        """
+        Look up an entry in memory, then on disk.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Optional[Tuple[str, Dict[str, Any], str]]:
+                Text, a copy of the metadata and the tier that served it, or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], copy.deepcopy(entry[1]), "memory"
+
+        cached = self._read_disk(key)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._store(key, *cached)
+        return cached[0], copy.deepcopy(cached[1]), "disk"
+
+    def put(self, key: str, text: str, metadata: Dict[str, Any]):
+        """
+        Cache a transcript.
+
+        Args:
+            key: Key from make_key()
+            text: Transcribed text
+            metadata: Metadata returned with it
+        """
+        metadata = copy.deepcopy(metadata)
+        self._store(key, text, metadata)
+        self._write_disk(key, text, metadata)
+
+    async def async_get(self, key: str) -> Optional[Tuple[str, Dict[str, Any], str]]:
+        """Like get(), but reads the disk tier off the event loop."""
+        if self.disk_dir is None or key in self._entries:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def async_put(self, key: str, text: str, metadata: Dict[str, Any]):
+        """Like put(), but writes the disk tier off the event loop."""
+        if self.disk_dir is None:
+            self.put(key, text, metadata)
+        else:
+            await asyncio.to_thread(self.put, key, text, metadata)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters plus the current size."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._bytes}
+
+    def _store(self, key: str, text: str, metadata: Dict[str, Any]):
+        """Insert into the in-memory LRU and evict down to the bounds."""
+        size = len(key) + len(text.encode()) + len(json.dumps(metadata, default=str))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (text, metadata, size)
+            self._bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def _disk_path(self, key: str) -> str:
+        """Entries are spread over subdirectories by their first two hex digits."""
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Read an entry from the disk tier."""
+        if self.disk_dir is None:
+            return None
+        try:
+            with open(self._disk_path(key), "r") as f:
+                entry = json.load(f)
+            return entry["text"], entry["metadata"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable transcription cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, text: str, metadata: Dict[str, Any]):
+        """Write an entry to the disk tier and prune it to its bound."""
+        if self.disk_dir is None:
+            return
+        try:
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            is_new = not os.path.exists(path)
+            # Write to a temporary file first so readers never see partial entries
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"text": text, "metadata": metadata}, f, default=str)
+            os.replace(temp_path, path)
+
+            # Pruning scans the directory, so let the tier overshoot a little between prunes
+            with self._lock:
+                self._disk_count += is_new
+                prune = self._disk_count > self.max_disk_entries + max(1, self.max_disk_entries // 10)
+            if prune:
+                self._prune_disk()
+        except Exception as e:
+            logger.warning(f"Failed to write transcription cache entry {key}: {e}")
+
+    def _disk_entries(self) -> List[os.DirEntry]:
+        """List the entry files of the disk tier."""
+        entries = []
+        for shard in os.scandir(self.disk_dir):
+            if shard.is_dir():
+                entries.extend(entry for entry in os.scandir(shard.path) if entry.name.endswith(".json"))
+        return entries
+
+    def _prune_disk(self):
+        """Delete the oldest disk entries above max_disk_entries."""
+        entries = self._disk_entries()
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        removed = 0
+        for entry in entries[:max(0, len(entries) - self.max_disk_entries)]:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            self._disk_count = len(entries) - removed
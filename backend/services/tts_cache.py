@@ -0,0 +1,334 @@
+# TTS Audio Cache
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+AudioBuffer = Union[bytes, mmap.mmap]
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so trivially different spellings share a cache entry.
+
+    Unicode is NFC-normalized and runs of whitespace collapse to one space.
+    Case and punctuation are kept because they change how the text is spoken.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+class TTSCache:
+    """
+    Cache of synthesized audio keyed by normalized text, voice and format.
+
+    Recently used clips are kept in an in-memory LRU bounded by total size.
+    The optional disk tier stores one file per clip. Clips up to
+    `promote_max_bytes` found on disk are promoted to memory, so their next
+    hits skip the file system; larger clips are served as read-only memory
+    maps, so a large phrase library costs page cache rather than heap and
+    is shared with every other worker process.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        promote_max_bytes: int = 256 * 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of the clips kept in memory
+            disk_dir: Directory of the disk tier (None keeps the cache in memory only)
+            max_disk_bytes: Maximum total size of the clips kept on disk
+            promote_max_bytes: Largest disk clip copied into memory on a hit
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.promote_max_bytes = promote_max_bytes
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(entry.stat().st_size for entry in self._disk_entries())
+
+        logger.info(f"Initialized TTS cache (max_bytes={max_bytes}, disk_dir={disk_dir})")
+
+    @staticmethod
+    def make_key(text: str, voice: Optional[str], audio_format: Optional[str]) -> str:
+        """
+        Build the cache key of a phrase.
+
+        Args:
+            text: Text to speak
+            voice: Voice name
+            audio_format: Output format (e.g. "wav", "mp3")
+
+        Returns:
+            str: Hex digest of the normalized text, voice and format
+        """
+        digest = hashlib.blake2b(
+            f"{voice}\0{audio_format}\0{normalize_text(text)}".encode(), digest_size=16
+        ).hexdigest()
+        return f"{digest}.{audio_format or 'audio'}"
+
+    def get(self, key: str) -> Optional[AudioBuffer]:
+        """
+        Look up a clip in memory, then on disk.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Optional[AudioBuffer]: The audio (bytes, or a read-only mmap for large disk hits), or None
+        """
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        audio = self._map_disk(key)
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        if len(audio) <= self.promote_max_bytes:
+            mapped, audio = audio, bytes(audio)
+            mapped.close()
+            self._store(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        """
+        Cache a clip in memory and, if enabled, on disk.
+
+        Args:
+            key: Key from make_key()
+            audio: Encoded audio
+        """
+        self._store(key, audio)
+        self._write_disk(key, audio)
+
+    async def async_get(self, key: str) -> Optional[AudioBuffer]:
+        """Like get(), but maps the disk tier off the event loop."""
+        if self.disk_dir is None or key in self._entries:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def async_put(self, key: str, audio: bytes):
+        """Like put(), but writes the disk tier off the event loop."""
+        self._store(key, audio)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._write_disk, key, audio)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters plus the current size."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._bytes}
+
+    def _store(self, key: str, audio: bytes):
+        """Insert into the in-memory LRU and evict down to the size bound."""
+        if len(audio) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = audio
+            self._bytes += len(audio)
+
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        """Clips are spread over subdirectories by their first two hex digits."""
+        return os.path.join(self.disk_dir, key[:2], key)
+
+    def _map_disk(self, key: str) -> Optional[mmap.mmap]:
+        """Memory-map a clip from the disk tier."""
+        if self.disk_dir is None:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                # The map stays valid after the file is closed
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: empty file, which cannot be mapped
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable TTS cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, audio: bytes):
+        """Write a clip to the disk tier and prune it to its bound."""
+        if self.disk_dir is None or not audio:
+            return
+        try:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never map partial clips
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(audio)
+            os.replace(temp_path, path)
+
+            with self._lock:
+                self._disk_bytes += len(audio)
+                prune = self._disk_bytes > self.max_disk_bytes
+            if prune:
+                self._prune_disk()
+        except Exception as e:
+            logger.warning(f"Failed to write TTS cache entry {key}: {e}")
+
+    def _disk_entries(self) -> List[os.DirEntry]:
+        """List the clip files of the disk tier."""
+        entries = []
+        for shard in os.scandir(self.disk_dir):
+            if shard.is_dir():
+                entries.extend(entry for entry in os.scandir(shard.path) if not entry.name.endswith(".tmp"))
+        return entries
+
+    def _prune_disk(self):
+        """Delete the least recently used clips until the disk tier is within 90% of its bound."""
+        # Memory-mapped reads update the access time only on some filesystems; fall back to mtime
+        entries = sorted(self._disk_entries(), key=lambda entry: max(entry.stat().st_atime, entry.stat().st_mtime))
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.max_disk_bytes * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            self._disk_bytes = total
+
+class CachedTTS:
+    """
+    TTS client wrapper that serves repeated phrases from a TTSCache.
+
+    It has the same interface as the wrapped client. Concurrent requests
+    for the same uncached phrase share one synthesis call, which is only
+    cancelled once every caller waiting for it has been cancelled. Create
+    one per process and share it, so this works across connections.
+    """
+
+    def __init__(self, tts_client, cache: TTSCache):
+        """
+        Wrap a TTS client.
+
+        Args:
+            tts_client: Client exposing async_text_to_speech() and output_format
+            cache: Cache to serve and store clips
+        """
+        self.tts_client = tts_client
+        self.cache = cache
+        # key -> [synthesis task, number of waiting callers]
+        self._inflight: Dict[str, list] = {}
+
+    def __getattr__(self, name):
+        # Everything else (output_format, is_processing, ...) comes from the wrapped client
+        return getattr(self.tts_client, name)
+
+    def _key(self, text: str) -> str:
+        return self.cache.make_key(text, getattr(self.tts_client, "voice", None), self.tts_client.output_format)
+
+    async def async_text_to_speech(self, text: str) -> AudioBuffer:
+        """
+        Synthesize text, or return the cached clip.
+
+        Args:
+            text: Text to speak
+
+        Returns:
+            AudioBuffer: Encoded audio
+        """
+        key = self._key(text)
+        audio = await self.cache.async_get(key)
+        if audio is not None:
+            return audio
+
+        entry = self._inflight.get(key)
+        if entry is None or not self._reusable(entry[0]):
+            task = asyncio.ensure_future(self._synthesize(key, text))
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        entry[1] += 1
+        try:
+            # An interrupted caller must not cancel synthesis for the others
+            return await asyncio.shield(entry[0])
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[0].done():
+                entry[0].cancel()
+                # Forget it now: the done-callback only runs a loop iteration
+                # later, and a new caller must not join a cancelling task
+                self._forget(key, entry[0])
+
+    @staticmethod
+    def _reusable(task: asyncio.Future) -> bool:
+        if not task.done():
+            return not task.cancelling()
+        return not task.cancelled() and task.exception() is None
+
+    def _forget(self, key: str, task: asyncio.Future):
+        # Only drop the entry if it still belongs to this task
+        entry = self._inflight.get(key)
+        if entry is not None and entry[0] is task:
+            del self._inflight[key]
+
+    async def _synthesize(self, key: str, text: str) -> bytes:
+        audio = await self.tts_client.async_text_to_speech(text)
+        if audio:
+            await self.cache.async_put(key, audio)
+        return audio
+
+    async def warm_up(self, phrases: Iterable[str], max_concurrent: int = 4):
+        """
+        Synthesize phrases ahead of time so their first use is served from the cache.
+
+        Args:
+            phrases: Phrases to cache
+            max_concurrent: Maximum number of synthesis calls at once
+        """
+        phrases = [phrase for phrase in phrases if phrase.strip()]
+        slots = asyncio.Semaphore(max_concurrent)
+
+        async def synthesize(phrase: str):
+            async with slots:
+                return await self.async_text_to_speech(phrase)
+
+        results = await asyncio.gather(*(synthesize(phrase) for phrase in phrases), return_exceptions=True)
+        failed = sum(isinstance(result, Exception) for result in results)
+        logger.info(f"Warmed up TTS cache with {len(phrases) - failed}/{len(phrases)} phrases")
@@ -0,0 +1,293 @@
+# Voice Activity Detection Service (Silero VAD)
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Silero VAD consumes fixed windows plus a short context from the previous window
+WINDOW_SIZES = {16000: 512, 8000: 256}
+CONTEXT_SIZES = {16000: 64, 8000: 32}
+
+# VAD events emitted by VADSegmenter.process
+class VADEvent:
+    START = "start"    # Speech started; audio includes the leading pad
+    SPEECH = "speech"  # Continuation of the current utterance
+    END = "end"        # Endpoint reached; audio is the trailing pad
+
+class SileroVADModel:
+    """
+    Shared Silero VAD model.
+
+    The ONNX model is loaded once per process and shared by every connection.
+    Each connection keeps its own recurrent state, so windows submitted by
+    different connections in the same event loop iteration are stacked into
+    one batch and run together in a thread pool.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        hangover_ms: int = 600,
+        speech_pad_ms: int = 150,
+        max_utterance_s: float = 30.0,
+        max_workers: int = 2
+    ):
+        """
+        Load the VAD model.
+
+        Args:
+            threshold: Speech probability above which a window counts as speech
+            hangover_ms: Silence required after speech before an endpoint is declared
+            speech_pad_ms: Audio kept before speech starts and after it ends
+            max_utterance_s: Utterances are force-ended after this duration
+            max_workers: Threads used for model inference
+        """
+        from silero_vad import load_silero_vad
+
+        self.threshold = threshold
+        self.hangover_ms = hangover_ms
+        self.speech_pad_ms = speech_pad_ms
+        self.max_utterance_s = max_utterance_s
+
+        self._session = load_silero_vad(onnx=True).session
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="silero-vad")
+        self._pending: List[Tuple[np.ndarray, np.ndarray, int, asyncio.Future]] = []
+        self._flush_scheduled = False
+
+        logger.info(f"Loaded Silero VAD model (threshold={threshold}, hangover_ms={hangover_ms})")
+
+    def create_segmenter(self, sample_rate: int = 16000) -> "VADSegmenter":
+        """Create a per-connection segmenter that uses this model and its settings."""
+        return VADSegmenter(
+            self,
+            sample_rate=sample_rate,
+            threshold=self.threshold,
+            hangover_ms=self.hangover_ms,
+            speech_pad_ms=self.speech_pad_ms,
+            max_utterance_s=self.max_utterance_s
+        )
+
+    async def predict(self, window: np.ndarray, state: np.ndarray, sample_rate: int) -> Tuple[float, np.ndarray]:
+        """
+        Compute the speech probability of one window.
+
+        Args:
+            window: Context followed by the window, float32 of shape (context + window,)
+            state: Recurrent state of the caller, float32 of shape (2, 1, 128)
+            sample_rate: 8000 or 16000
+
+        Returns:
+            Tuple[float, np.ndarray]:
+                - Speech probability
+                - Updated recurrent state
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((window, state, sample_rate, future))
+
+        # Batch every window submitted during this loop iteration
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Run all pending windows through the model, one batch per sample rate."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, []
+
+        loop = asyncio.get_running_loop()
+        for sample_rate in {item[2] for item in pending}:
+            batch = [item for item in pending if item[2] == sample_rate]
+            task = loop.run_in_executor(self._executor, self._run_batch, batch, sample_rate)
+            task.add_done_callback(lambda done, batch=batch: self._resolve(batch, done))
+
+    def _run_batch(self, batch, sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Run one batched forward pass (called in the thread pool)."""
+        inputs = np.stack([item[0] for item in batch])
+        states = np.concatenate([item[1] for item in batch], axis=1)
+        probs, states = self._session.run(None, {
+            "input": inputs,
+            "state": states,
+            "sr": np.array(sample_rate, dtype=np.int64)
+        })
+        return probs, states
+
+    def _resolve(self, batch, done: asyncio.Future):
+        """Route batched results back to the waiting callers."""
+        if done.exception() is not None:
+            for item in batch:
+                if not item[3].done():
+                    item[3].set_exception(done.exception())
+            return
+
+        probs, states = done.result()
+        for i, item in enumerate(batch):
+            if not item[3].done():
+                item[3].set_result((float(probs[i][0]), states[:, i:i + 1, :]))
+
+    def shutdown(self):
+        """Stop the inference thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_shared_model: Optional[SileroVADModel] = None
+_shared_model_lock = threading.Lock()
+
+def get_vad_model(**kwargs) -> SileroVADModel:
+    """
+    Get the process-wide VAD model, loading it on first use.
+
+    Args:
+        **kwargs: Settings passed to SileroVADModel when it is first created
+
+    Returns:
+        SileroVADModel: The shared model
+    """
+    global _shared_model
+    with _shared_model_lock:
+        if _shared_model is None:
+            _shared_model = SileroVADModel(**kwargs)
+        return _shared_model
+
+class VADSegmenter:
+    """
+    Per-connection VAD endpointing stage.
+
+    Consumes streamed 16-bit mono PCM, trims leading and trailing silence and
+    emits (VADEvent, audio) pairs. Silence is only ever emitted when it is
+    part of the configured padding or sits between two speech windows inside
+    the hangover period, so trimmed silence never reaches the recognizer.
+    """
+
+    def __init__(
+        self,
+        model: SileroVADModel,
+        sample_rate: int = 16000,
+        threshold: float = 0.5,
+        hangover_ms: int = 600,
+        speech_pad_ms: int = 150,
+        max_utterance_s: float = 30.0
+    ):
+        """
+        Initialize the segmenter.
+
+        Args:
+            model: Shared VAD model
+            sample_rate: Sample rate of the incoming PCM (8000 or 16000)
+            threshold: Speech probability above which a window counts as speech
+            hangover_ms: Silence required after speech before an endpoint is declared
+            speech_pad_ms: Audio kept before speech starts and after it ends
+            max_utterance_s: Utterances are force-ended after this duration
+        """
+        if sample_rate not in WINDOW_SIZES:
+            raise ValueError(f"Silero VAD supports 8000 or 16000 Hz audio, got {sample_rate}")
+
+        self.model = model
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        # Hysteresis: speech continues until the probability drops well below the threshold
+        self.neg_threshold = max(threshold - 0.15, 0.01)
+
+        self.window_size = WINDOW_SIZES[sample_rate]
+        self.context_size = CONTEXT_SIZES[sample_rate]
+        window_ms = 1000 * self.window_size / sample_rate
+        self.hangover_windows = max(1, int(round(hangover_ms / window_ms)))
+        self.pad_windows = int(round(speech_pad_ms / window_ms))
+        self.max_utterance_windows = int(max_utterance_s * 1000 / window_ms)
+
+        self.reset()
+
+    def reset(self):
+        """Clear all stream state."""
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._context = np.zeros(self.context_size, dtype=np.float32)
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._preroll = deque(maxlen=max(self.pad_windows, 1))
+        self._trailing: List[np.ndarray] = []
+        self._utterance_windows = 0
+        self.is_speaking = False
+
+    async def process(self, pcm: Union[bytes, memoryview, np.ndarray]) -> List[Tuple[str, np.ndarray]]:
+        """
+        Run VAD over a chunk of streamed audio.
+
+        Args:
+            pcm: 16-bit little-endian mono PCM
+
+        Returns:
+            List[Tuple[str, np.ndarray]]: VADEvent names with the int16 audio to forward
+        """
+        samples = pcm if isinstance(pcm, np.ndarray) else np.frombuffer(pcm, dtype=np.int16)
+        if len(self._remainder):
+            samples = np.concatenate((self._remainder, samples))
+
+        num_windows = len(samples) // self.window_size
+        self._remainder = samples[num_windows * self.window_size:].copy()
+
+        events: List[Tuple[str, List[np.ndarray]]] = []
+        for i in range(num_windows):
+            window = samples[i * self.window_size:(i + 1) * self.window_size]
+            prob = await self._predict(window)
+            self._handle_window(window, prob, events)
+
+        return [(event, np.concatenate(chunks)) for event, chunks in events if chunks]
+
+    async def _predict(self, window: np.ndarray) -> float:
+        """Score one window, carrying context and recurrent state forward."""
+        audio = window.astype(np.float32) / 32768.0
+        model_input = np.concatenate((self._context, audio))
+        prob, self._state = await self.model.predict(model_input, self._state, self.sample_rate)
+        self._context = audio[-self.context_size:]
+        return prob
+
+    def _handle_window(self, window: np.ndarray, prob: float, events: List[Tuple[str, List[np.ndarray]]]):
+        """Advance the endpointing state machine by one window."""
+        if not self.is_speaking:
+            if prob >= self.threshold:
+                self.is_speaking = True
+                self._utterance_windows = 1
+                events.append((VADEvent.START, list(self._preroll) + [window]))
+                self._preroll.clear()
+            elif self.pad_windows:
+                self._preroll.append(window)
+            return
+
+        self._utterance_windows += 1
+
+        if prob < self.neg_threshold:
+            self._trailing.append(window)
+            if len(self._trailing) >= self.hangover_windows:
+                self._end_utterance(events)
+                return
+        else:
+            # Speech resumed: the short pause belongs to the utterance
+            self._append_speech(events, self._trailing + [window])
+            self._trailing = []
+
+        if self._utterance_windows >= self.max_utterance_windows:
+            logger.info("Maximum utterance length reached, forcing endpoint")
+            self._end_utterance(events)
+
+    def _append_speech(self, events: List[Tuple[str, List[np.ndarray]]], chunks: List[np.ndarray]):
+        """Add speech audio to the last event, or start a new SPEECH event."""
+        if events and events[-1][0] in (VADEvent.START, VADEvent.SPEECH):
+            events[-1][1].extend(chunks)
+        else:
+            events.append((VADEvent.SPEECH, list(chunks)))
+
+    def _end_utterance(self, events: List[Tuple[str, List[np.ndarray]]]):
+        """Emit the endpoint with only the trailing pad; drop the rest of the silence."""
+        events.append((VADEvent.END, self._trailing[:self.pad_windows] or [np.zeros(0, dtype=np.int16)]))
+        self._trailing = []
+        self._utterance_windows = 0
+        self.is_speaking = False
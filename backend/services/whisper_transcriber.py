@@ -0,0 +1,349 @@
+# Local Speech-to-Text Transcription Service (faster-whisper)
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from math import gcd
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .audio_input import AudioInput, BufferLike
+from .micro_batcher import MicroBatcher
+from .transcriber_registry import Transcriber, register_transcriber
+from .transcription_cache import TranscriptionCache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Whisper models consume 16 kHz mono float32 audio in 30 second windows
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_WINDOW_S = 30.0
+
+_models: Dict[Tuple[str, str, str, int, int], Any] = {}
+_models_lock = threading.Lock()
+
+def get_whisper_model(
+    model_size: str,
+    device: str = "cpu",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+    num_workers: int = 1
+):
+    """
+    Get a process-wide faster-whisper model, loading it on first use.
+
+    Transcribers created with the same settings share one model.
+
+    Args:
+        model_size: Model name (e.g. "tiny.en", "small") or path to a converted model
+        device: "cpu", "cuda" or "auto"
+        compute_type: CTranslate2 quantization (e.g. "int8", "int8_float16", "float32")
+        cpu_threads: Threads per inference call (0 uses the CTranslate2 default)
+        num_workers: Number of inference calls the model runs in parallel
+
+    Returns:
+        faster_whisper.WhisperModel: The shared model
+    """
+    from faster_whisper import WhisperModel
+
+    key = (model_size, device, compute_type, cpu_threads, num_workers)
+    with _models_lock:
+        if key not in _models:
+            start_time = time.time()
+            _models[key] = WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers
+            )
+            logger.info(f"Loaded faster-whisper model {model_size} ({compute_type}) in {time.time() - start_time:.2f}s")
+        return _models[key]
+
+def to_whisper_audio(audio: AudioInput) -> np.ndarray:
+    """
+    Convert 16-bit PCM to the 16 kHz mono float32 samples Whisper expects.
+
+    Args:
+        audio: PCM audio at any sample rate and channel count
+
+    Returns:
+        np.ndarray: float32 samples in [-1, 1]
+    """
+    samples = audio.samples().astype(np.float32) / 32768.0
+    if audio.channels > 1:
+        samples = samples.reshape(-1, audio.channels).mean(axis=1)
+
+    if audio.sample_rate != WHISPER_SAMPLE_RATE:
+        from scipy.signal import resample_poly
+
+        factor = gcd(audio.sample_rate, WHISPER_SAMPLE_RATE)
+        samples = resample_poly(samples, WHISPER_SAMPLE_RATE // factor, audio.sample_rate // factor).astype(np.float32)
+
+    return samples
+
+@register_transcriber("faster_whisper")
+class WhisperTranscriber(Transcriber):
+    """
+    Local CPU speech-to-text using faster-whisper (CTranslate2).
+
+    Transcription needs no network round trip, so it is a low-latency
+    alternative to Dialogflow and a fallback when Dialogflow is slow. The
+    model is loaded once per process and inference runs in a bounded thread
+    pool (CTranslate2 releases the GIL). Utterances longer than one Whisper
+    window are cut into chunks that are decoded together as one batch.
+
+    Short utterances that finish at about the same time on different
+    connections are micro-batched: they are collected for `batch_wait_ms`,
+    padded to one window each and decoded in a single encoder and decoder
+    pass, which raises throughput per core under load.
+    """
+
+    cached_fields = ("language", "language_probability", "confidence", "engine")
+
+    def __init__(
+        self,
+        model_size: str = "tiny.en",
+        language_code: Optional[str] = "en-US",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 2,
+        batch_size: int = 8,
+        beam_size: int = 1,
+        batch_wait_ms: float = 10.0,
+        cache: Optional[TranscriptionCache] = None
+    ):
+        """
+        Load the model and start the inference pool.
+
+        Args:
+            model_size: Model name (e.g. "tiny.en", "small") or path to a converted model
+            language_code: Spoken language (e.g. "en-US"), or None to detect it
+            device: "cpu", "cuda" or "auto"
+            compute_type: CTranslate2 quantization (int8 is fastest on CPU)
+            cpu_threads: Threads per inference call (0 uses the CTranslate2 default)
+            num_workers: Number of utterances transcribed in parallel
+            batch_size: Maximum number of chunks or utterances decoded together
+            beam_size: Beam size (1 is greedy decoding)
+            batch_wait_ms: How long an utterance waits for others to batch with
+                (0 disables micro-batching; also disabled when detecting the language)
+            cache: Cache of transcripts keyed by audio content (optional)
+        """
+        self.model_size = model_size
+        self.language_code = language_code
+        self.language = language_code.split("-")[0].lower() if language_code else None
+        self.batch_size = batch_size
+        self.beam_size = beam_size
+        self.cache = cache
+        self.is_processing = False
+
+        self.model = get_whisper_model(model_size, device, compute_type, cpu_threads, num_workers)
+        self._batched = None
+        self._tokenizer = None
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="whisper")
+        self._active_requests = 0
+
+        self._batcher: Optional[MicroBatcher] = None
+        if batch_wait_ms > 0 and self.language is not None:
+            self._batcher = MicroBatcher(self._run_batch, self._executor, batch_size, batch_wait_ms)
+
+        logger.info(f"Initialized faster-whisper Transcriber with model={model_size}, workers={num_workers}")
+
+    def _get_batched_pipeline(self):
+        """Create the batched pipeline on first use."""
+        if self._batched is None:
+            from faster_whisper import BatchedInferencePipeline
+
+            self._batched = BatchedInferencePipeline(model=self.model)
+        return self._batched
+
+    def _run(self, audio: Union[AudioInput, BufferLike]) -> Tuple[str, Dict[str, Any]]:
+        """Convert and decode an utterance (called in the inference pool)."""
+        if not isinstance(audio, AudioInput):
+            audio = AudioInput.from_wav(audio)
+        samples = to_whisper_audio(audio)
+
+        if len(samples) > WHISPER_WINDOW_S * WHISPER_SAMPLE_RATE:
+            segments, info = self._get_batched_pipeline().transcribe(
+                samples, language=self.language, beam_size=self.beam_size, batch_size=self.batch_size
+            )
+        else:
+            segments, info = self.model.transcribe(
+                samples,
+                language=self.language,
+                beam_size=self.beam_size,
+                without_timestamps=True,
+                condition_on_previous_text=False
+            )
+
+        # Segments are decoded lazily, so consume them here rather than on the event loop
+        segments = list(segments)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        confidence = float(np.exp(np.mean([segment.avg_logprob for segment in segments]))) if segments else 0.0
+
+        return text, {
+            "confidence": confidence,
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "sample_rate_used": audio.sample_rate,
+            "engine": "faster_whisper"
+        }
+
+    def _get_tokenizer(self):
+        """Create the tokenizer used for batched decoding on first use."""
+        if self._tokenizer is None:
+            from faster_whisper.tokenizer import Tokenizer
+
+            self._tokenizer = Tokenizer(
+                self.model.hf_tokenizer,
+                self.model.model.is_multilingual,
+                task="transcribe",
+                language=self.language
+            )
+        return self._tokenizer
+
+    def _run_batch(self, items: List[Tuple[AudioInput, float]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Decode several short utterances in one forward pass (called in the inference pool).
+
+        Args:
+            items: Utterances (each at most one window long) with the time they were submitted
+
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: Text and metadata of each utterance, in order
+        """
+        from faster_whisper.audio import pad_or_trim
+
+        started = time.time()
+        tokenizer = self._get_tokenizer()
+
+        features = np.stack([
+            pad_or_trim(self.model.feature_extractor(to_whisper_audio(audio))) for audio, _ in items
+        ])
+        encoder_output = self.model.encode(features)
+        prompt = self.model.get_prompt(tokenizer, previous_tokens=[], without_timestamps=True)
+        results = self.model.model.generate(
+            encoder_output,
+            [prompt] * len(items),
+            beam_size=self.beam_size,
+            max_length=self.model.max_length,
+            return_scores=True,
+            suppress_blank=True,
+            suppress_tokens=[-1]
+        )
+
+        outputs = []
+        for (audio, submitted), result in zip(items, results):
+            tokens = [token for token in result.sequences_ids[0] if token < tokenizer.eot]
+            # Same normalization as faster-whisper's avg_logprob (length_penalty=1)
+            avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+            outputs.append((tokenizer.decode(tokens).strip(), {
+                "confidence": float(np.exp(avg_logprob)),
+                "language": self.language,
+                "language_probability": 1.0,
+                "sample_rate_used": audio.sample_rate,
+                "engine": "faster_whisper",
+                "batch_size": len(items),
+                "queue_time": started - submitted
+            }))
+        return outputs
+
+    def transcribe(self, audio: Union[AudioInput, BufferLike]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Transcribe audio locally.
+
+        Args:
+            audio: An AudioInput, or a complete WAV file
+
+        Returns:
+            Tuple[str, Dict[str, Any]]:
+                - Transcribed text
+                - Metadata dictionary
+        """
+        start_time = time.time()
+        try:
+            if not isinstance(audio, AudioInput):
+                audio = AudioInput.from_wav(audio)
+            cache_key, cached = self._cache_lookup(audio, start_time)
+            if cached is not None:
+                return cached
+
+            full_text, metadata = self._run(audio)
+
+            processing_time = time.time() - start_time
+            metadata["processing_time"] = processing_time
+            self._cache_store(cache_key, full_text, metadata)
+
+            logger.info(f"Local transcription completed in {processing_time:.2f}s: {full_text}")
+            return full_text, metadata
+
+        except Exception as e:
+            logger.error(f"Local transcription error: {e}")
+            return "", {"error": str(e)}
+
+    async def async_transcribe(
+        self,
+        audio: Union[AudioInput, BufferLike],
+        connection_id: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Transcribe audio locally without blocking the event loop.
+
+        Short utterances are micro-batched with other concurrent requests.
+        At most `num_workers` batches or long utterances are decoded at once;
+        extra callers wait for a free worker.
+
+        Args:
+            audio: An AudioInput, or a complete WAV file
+            connection_id: Unused; local transcription keeps no per-connection state
+
+        Returns:
+            Tuple[str, Dict[str, Any]]:
+                - Transcribed text
+                - Metadata dictionary
+        """
+        start_time = time.time()
+        started = []
+
+        def run():
+            started.append(time.time())
+            return self._run(audio)
+
+        self._active_requests += 1
+        self.is_processing = True
+        try:
+            if not isinstance(audio, AudioInput):
+                audio = AudioInput.from_wav(audio)
+            cache_key, cached = await self._async_cache_lookup(audio, start_time)
+            if cached is not None:
+                return cached
+
+            if self._batcher is not None and audio.duration <= WHISPER_WINDOW_S:
+                full_text, metadata = await self._batcher.submit((audio, start_time))
+            else:
+                loop = asyncio.get_running_loop()
+                full_text, metadata = await loop.run_in_executor(self._executor, run)
+                metadata["queue_time"] = started[0] - start_time
+
+            processing_time = time.time() - start_time
+            metadata["processing_time"] = processing_time
+            await self._async_cache_store(cache_key, full_text, metadata)
+
+            logger.info(f"Async local transcription completed in {processing_time:.2f}s: {full_text}")
+            return full_text, metadata
+
+        except Exception as e:
+            logger.error(f"Local transcription error: {e}")
+            return "", {"error": str(e)}
+        finally:
+            self._active_requests -= 1
+            self.is_processing = self._active_requests > 0
+
+    def shutdown(self):
+        """Stop the inference thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
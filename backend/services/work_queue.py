@@ -0,0 +1,224 @@
+# Bounded Utterance Scheduling
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# What a connection's queue does with a new utterance when it is full
+class QueuePolicy:
+    DROP_OLDEST = "drop_oldest"    # Discard the stalest queued utterance
+    DROP_NEWEST = "drop_newest"    # Reject the new utterance
+    MERGE = "merge"                # Merge the new utterance into the newest queued one
+
+# Outcome of submitting an utterance
+class SubmitOutcome:
+    QUEUED = "queued"
+    MERGED = "merged"
+    DROPPED_OLDEST = "dropped_oldest"
+    DROPPED_NEWEST = "dropped_newest"
+    SHED = "shed"                  # Rejected because the process is overloaded
+
+class WorkScheduler:
+    """
+    Process-wide admission control for utterance processing.
+
+    Bounds how many utterances are waiting across all connections
+    (`max_queued`) and how many are processed at once (`max_active`).
+    Each connection gets its own small WorkQueue on top of these limits, so
+    one noisy client can neither grow memory without bound nor take every
+    processing slot.
+    """
+
+    def __init__(
+        self,
+        max_active: int = 32,
+        max_queued: int = 256,
+        max_pending: int = 2,
+        policy: str = QueuePolicy.DROP_OLDEST
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_active: Maximum number of utterances processed at once
+            max_queued: Maximum number of utterances waiting across all connections
+            max_pending: Default queue length per connection
+            policy: Default QueuePolicy applied when a connection's queue is full
+        """
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.max_pending = max_pending
+        self.policy = policy
+
+        self._slots = asyncio.Semaphore(max_active)
+        self.active = 0
+        self.queued = 0
+
+        logger.info(f"Initialized work scheduler: max_active={max_active}, max_queued={max_queued}, policy={policy}")
+
+    def create_queue(
+        self,
+        merge: Optional[Callable[[Any, Any], Any]] = None,
+        max_pending: Optional[int] = None,
+        policy: Optional[str] = None
+    ) -> "WorkQueue":
+        """
+        Create a bounded queue for one connection.
+
+        Args:
+            merge: Combines an older and a newer item, or returns None if they cannot be merged
+            max_pending: Queue length (defaults to the scheduler's)
+            policy: QueuePolicy when full (defaults to the scheduler's)
+
+        Returns:
+            WorkQueue: The connection's queue
+        """
+        return WorkQueue(self, max_pending or self.max_pending, policy or self.policy, merge)
+
+    @property
+    def overloaded(self) -> bool:
+        """Whether new utterances are being shed."""
+        return self.queued >= self.max_queued
+
+    def stats(self) -> Dict[str, int]:
+        """Current queue depth and processing slots in use."""
+        return {"queued": self.queued, "active": self.active, "max_queued": self.max_queued, "max_active": self.max_active}
+
+class WorkQueue:
+    """
+    A connection's bounded queue of utterances waiting to be processed.
+
+    Items are handed out one at a time, and only once a processing slot is
+    free in the scheduler. While an item waits for a slot, newer items can
+    still replace or be merged into it, so the connection always processes
+    the freshest speech.
+    """
+
+    def __init__(
+        self,
+        scheduler: WorkScheduler,
+        max_pending: int,
+        policy: str,
+        merge: Optional[Callable[[Any, Any], Any]] = None
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            scheduler: Scheduler providing the global limits
+            max_pending: Maximum number of queued items
+            policy: QueuePolicy applied when the queue is full
+            merge: Combines an older and a newer item, or returns None if they cannot be merged
+        """
+        self.scheduler = scheduler
+        self.max_pending = max_pending
+        self.policy = policy
+        self.merge = merge
+
+        self._items: Deque[Any] = deque()
+        self._available = asyncio.Event()
+        self._holds_slot = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def submit(self, item: Any) -> str:
+        """
+        Queue an item without waiting.
+
+        Args:
+            item: Work item (an utterance)
+
+        Returns:
+            str: The SubmitOutcome
+        """
+        if len(self._items) < self.max_pending:
+            if self.scheduler.overloaded:
+                return SubmitOutcome.SHED
+            self._push(item)
+            return SubmitOutcome.QUEUED
+
+        # Full: replacing or merging queued items does not add to the global count
+        if self.policy == QueuePolicy.DROP_NEWEST:
+            return SubmitOutcome.DROPPED_NEWEST
+
+        if self.policy == QueuePolicy.MERGE and self.merge is not None:
+            merged = self.merge(self._items[-1], item)
+            if merged is not None:
+                self._items[-1] = merged
+                return SubmitOutcome.MERGED
+
+        self._items.popleft()
+        self._items.append(item)
+        return SubmitOutcome.DROPPED_OLDEST
+
+    def _push(self, item: Any):
+        """Append an item and count it against the global limit."""
+        self._items.append(item)
+        self.scheduler.queued += 1
+        self._available.set()
+
+    async def get(self) -> Any:
+        """
+        Wait for the next item and a free processing slot.
+
+        The caller must call task_done() once the item has been processed.
+
+        Returns:
+            Any: The oldest queued item
+        """
+        while True:
+            await self._available.wait()
+            await self.scheduler._slots.acquire()
+            if self._items:
+                break
+            # Emptied by clear() while waiting for the slot
+            self.scheduler._slots.release()
+            self._available.clear()
+
+        item = self._items.popleft()
+        self.scheduler.queued -= 1
+        self.scheduler.active += 1
+        self._holds_slot = True
+        if not self._items:
+            self._available.clear()
+        return item
+
+    def task_done(self):
+        """Release the processing slot taken by get()."""
+        if self._holds_slot:
+            self._holds_slot = False
+            self.scheduler.active -= 1
+            self.scheduler._slots.release()
+
+    def clear(self):
+        """Drop all queued items and release any slot still held."""
+        self.scheduler.queued -= len(self._items)
+        self._items.clear()
+        self._available.clear()
+        self.task_done()
+
+_scheduler: Optional[WorkScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_work_scheduler(**kwargs) -> WorkScheduler:
+    """
+    Get the process-wide work scheduler.
+
+    Args:
+        **kwargs: Settings passed to WorkScheduler when it is first created
+
+    Returns:
+        WorkScheduler: The shared scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = WorkScheduler(**kwargs)
+        return _scheduler
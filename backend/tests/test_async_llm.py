@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+import pytest
+from backend.services.async_llm import AsyncLLM, LLMCancelledError
+
+class SlowSyncLLM:
+    """Synchronous client that blocks like a real HTTP call."""
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.conversation_history = []
+
+    def get_response(self, user_input, system_prompt=None, **kwargs):
+        time.sleep(self.delay)
+        return {"text": f"echo: {user_input}", "thread": threading.current_thread().name}
+
+    def stream_response(self, user_input, system_prompt=None, **kwargs):
+        for word in user_input.split():
+            time.sleep(self.delay / 4)
+            yield word + " "
+
+def test_sync_client_does_not_block_event_loop():
+    async def main():
+        llm = AsyncLLM(SlowSyncLLM())
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        response = await llm.get_response("hello")
+        tick_task.cancel()
+        return response, ticks
+
+    response, ticks = asyncio.run(main())
+    assert response["text"] == "echo: hello"
+    assert response["thread"].startswith("llm")
+    assert ticks >= 5
+
+def test_cancel_event_abandons_call():
+    async def main():
+        llm = AsyncLLM(SlowSyncLLM(delay=1.0))
+        cancel = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.05, cancel.set)
+        start = time.monotonic()
+        with pytest.raises(LLMCancelledError):
+            await llm.get_response("hello", cancel_event=cancel)
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) < 0.5
+
+def test_stream_response_yields_tokens_from_sync_generator():
+    async def main():
+        llm = AsyncLLM(SlowSyncLLM(delay=0.02))
+        return [token async for token in llm.stream_response("one two three")]
+
+    assert asyncio.run(main()) == ["one ", "two ", "three "]
+
+class HistoryLLM(SlowSyncLLM):
+    """Client that answers from and appends to its own history."""
+
+    def get_response(self, user_input, system_prompt=None, add_to_history=True, **kwargs):
+        time.sleep(self.delay)
+        seen = len(self.conversation_history)
+        if add_to_history:
+            self.conversation_history.append({"role": "user", "content": user_input})
+        return {"text": f"seen {seen}"}
+
+def test_history_views_do_not_share_history():
+    shared = HistoryLLM(delay=0.05)
+    shared.conversation_history = [{"role": "system", "content": "prompt"}]
+
+    async def main():
+        llm = AsyncLLM(shared)
+        first = llm.with_history([])
+        second = llm.with_history([{"role": "user", "content": "hi"}] * 3)
+        cancel = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.01, cancel.set)
+        responses = await asyncio.gather(
+            first.get_response("a"),
+            second.get_response("b"),
+            second.get_response("c", cancel_event=cancel),
+            return_exceptions=True
+        )
+        # Let the abandoned call finish in its thread
+        await asyncio.sleep(0.1)
+        return first, second, responses
+
+    first, second, responses = asyncio.run(main())
+    assert responses[0] == {"text": "seen 0"}
+    assert isinstance(responses[2], LLMCancelledError)
+    assert [m["content"] for m in first.conversation_history] == ["a"]
+    assert len(second.conversation_history) == 5
+    assert shared.conversation_history == [{"role": "system", "content": "prompt"}]
+    assert first.executor is second.executor
@@ -0,0 +1,82 @@
+import struct
+import numpy as np
+import pytest
+from backend.services.audio_codec import (
+    AudioCodec,
+    OggDemuxer,
+    OggFlag,
+    WebMDemuxer,
+    ogg_crc,
+    ogg_page,
+    parse_opus_head,
+)
+
+OPUS_HEAD = b"OpusHead" + struct.pack("<BBHIhB", 1, 1, 312, 48000, 0, 0)
+
+def feed_bytewise(demuxer, data):
+    packets = []
+    for i in range(len(data)):
+        packets.extend(demuxer.feed(data[i:i + 1]))
+    return packets
+
+def raw_page(lacing: bytes, body: bytes, serial: int, sequence: int, flags: int = 0) -> bytes:
+    header = struct.pack("<4sBBqIIIB", b"OggS", 0, flags, 0, serial, sequence, 0, len(lacing))
+    return header + lacing + body
+
+def ebml(element_id: int, payload: bytes, unknown_size: bool = False) -> bytes:
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    size = b"\x01\xff\xff\xff\xff\xff\xff\xff" if unknown_size else bytes([0x80 | len(payload)])
+    return id_bytes + size + (b"" if unknown_size else payload)
+
+def simple_block(frame: bytes) -> bytes:
+    # Track 1, timecode 0, keyframe flag
+    return ebml(0xA3, b"\x81\x00\x00\x80" + frame)
+
+def test_ogg_crc_matches_reference():
+    assert ogg_crc(b"123456789") == 0x89A1897F
+
+def test_ogg_pages_split_anywhere_are_demuxed():
+    long_packet = bytes(range(256)) * 3
+    # The long packet starts on the first page and ends on the second
+    first = raw_page(bytes([len(OPUS_HEAD), 255, 255]), OPUS_HEAD + long_packet[:510], 7, 0, OggFlag.BOS)
+    other_stream = ogg_page([b"ignored"], 0, serial=8, sequence=0)
+    second = raw_page(bytes([255, 3, 4]), long_packet[510:] + b"tail", 7, 1, OggFlag.CONTINUED)
+
+    packets = feed_bytewise(OggDemuxer(), first + other_stream + second)
+
+    assert packets == [OPUS_HEAD, long_packet, b"tail"]
+    assert parse_opus_head(packets[0])["pre_skip"] == 312
+
+def test_webm_blocks_are_demuxed_from_live_stream():
+    header = ebml(0x1A45DFA3, ebml(0x4282, b"webm"))
+    tracks = ebml(0x1654AE6B, ebml(0xAE, ebml(0xD7, b"\x01") + ebml(0x63A2, OPUS_HEAD)))
+    cluster = ebml(0xE7, b"\x00") + simple_block(b"frame-1") + ebml(0xA0, ebml(0xA1, b"\x81\x00\x14\x00frame-2"))
+    data = (
+        header
+        + ebml(0x18538067, b"", unknown_size=True)
+        + ebml(0x1549A966, ebml(0x2AD7B1, b"\x0f\x42\x40"))
+        + tracks
+        + ebml(0x1F43B675, b"", unknown_size=True)
+        + cluster
+        + ebml(0x1F43B675, b"", unknown_size=True)
+        + simple_block(b"frame-3")
+    )
+
+    packets = feed_bytewise(WebMDemuxer(), data)
+
+    assert packets == [OPUS_HEAD, b"frame-1", b"frame-2", b"frame-3"]
+
+def test_opus_round_trip_through_ogg():
+    pytest.importorskip("opuslib")
+    from backend.services.audio_codec import OggOpusEncoder, decode_audio
+
+    t = np.arange(16000) / 16000
+    speech = np.round(8000 * np.sin(2 * np.pi * 300 * t)).astype(np.int16)
+    encoder = OggOpusEncoder(16000)
+    data = b"".join(encoder.encode(speech[i:i + 4000]) for i in range(0, len(speech), 4000)) + encoder.flush()
+
+    audio = decode_audio(data, AudioCodec.OGG_OPUS, 16000)
+
+    assert len(data) < len(speech.tobytes()) / 4
+    assert abs(audio.num_frames - len(speech)) < 960
+    assert np.abs(audio.samples()).max() > 4000
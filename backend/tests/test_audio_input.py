@@ -0,0 +1,44 @@
+import io
+import wave
+import numpy as np
+import pytest
+from backend.services.audio_input import AudioFormatError, AudioInput
+
+def make_wav(samples: np.ndarray, sample_rate: int = 16000, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.astype("<i2").tobytes())
+    return buffer.getvalue()
+
+def test_from_wav_views_payload_without_copy():
+    samples = np.arange(-500, 500, dtype=np.int16)
+    data = np.frombuffer(make_wav(samples, 44100), dtype=np.uint8)
+
+    audio = AudioInput.from_wav(data)
+
+    assert audio.sample_rate == 44100
+    assert audio.channels == 1
+    assert audio.num_frames == len(samples)
+    assert np.array_equal(audio.samples(), samples)
+    assert np.shares_memory(audio.samples(), data)
+
+def test_from_wav_rejects_non_wav():
+    with pytest.raises(AudioFormatError):
+        AudioInput.from_wav(b"not a wav file at all")
+
+def test_from_wav_clamps_truncated_data_chunk():
+    data = make_wav(np.ones(100, dtype=np.int16))
+
+    audio = AudioInput.from_wav(data[:-11])
+
+    assert audio.num_frames == 94
+
+def test_from_pcm_requires_whole_frames():
+    audio = AudioInput.from_pcm(b"\x00\x01" * 8, 8000)
+    assert audio.duration == 8 / 8000
+
+    with pytest.raises(AudioFormatError):
+        AudioInput.from_pcm(b"\x00\x01\x02", 8000)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from backend.services.audio_normalizer import AudioNormalizer
+
+def tone(frequency, sample_rate, seconds=0.5, amplitude=8000):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return np.round(amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+
+def test_chunked_stream_matches_whole_recording():
+    samples = tone(440, 44100)
+    normalizer = AudioNormalizer(44100)
+
+    # Chunk sizes that split int16 samples across chunks
+    data = samples.tobytes()
+    cuts = [0, 1, 777, 778, 5001, 9000, len(data)]
+    chunks = [normalizer.process(data[a:b]) for a, b in zip(cuts, cuts[1:])]
+    chunks.append(normalizer.flush())
+
+    whole = AudioNormalizer(44100).convert(samples)
+    assert np.array_equal(np.concatenate(chunks), whole)
+    assert len(whole) == 8000
+
+def test_resampled_tone_keeps_frequency_and_level():
+    out = AudioNormalizer(44100).convert(tone(440, 44100))
+
+    expected = tone(440, 16000)
+    # Away from the edges, where the stream starts and ends in silence
+    assert np.abs(out[200:-200].astype(int) - expected[200:-200]).max() < 40
+
+def test_content_above_output_nyquist_is_filtered():
+    out = AudioNormalizer(48000).convert(tone(12000, 48000))
+
+    assert np.abs(out[200:-200]).max() < 100
+
+def test_float_stereo_is_downmixed_to_int16():
+    left = np.full(4800, 0.25, dtype=np.float32)
+    right = np.full(4800, -0.75, dtype=np.float32)
+    stereo = np.stack([left, right], axis=1)
+
+    out = AudioNormalizer(48000, channels=2, dtype="float32").convert(stereo.tobytes())
+
+    assert out.dtype == np.int16 and len(out) == 1600
+    assert np.all(out[100:-100] == -8192)
+
+def test_same_rate_is_passed_through():
+    samples = np.arange(-100, 100, dtype=np.int16)
+    normalizer = AudioNormalizer(16000)
+
+    assert np.array_equal(normalizer.process(samples), samples)
+    assert len(normalizer.flush()) == 0
+
+def test_unsupported_dtype_is_rejected():
+    with pytest.raises(ValueError):
+        AudioNormalizer(44100, dtype="uint8")
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+import numpy as np
+from backend.services.audio_ring_buffer import AudioRingBuffer
+
+def test_blocks_are_views_of_the_ring():
+    ring = AudioRingBuffer(block_frames=4, num_blocks=4)
+
+    # Writes need not line up with blocks
+    assert ring.write(np.arange(6, dtype=np.int16)) == 6
+    assert ring.write(np.arange(6, 10, dtype=np.int16)) == 4
+    first = ring.read_nowait()
+    first_values = np.frombuffer(first, dtype=np.int16).tolist()
+    second = ring.read_nowait()
+
+    assert first_values == [0, 1, 2, 3]
+    assert np.frombuffer(second, dtype=np.int16).tolist() == [4, 5, 6, 7]
+    assert np.shares_memory(np.frombuffer(second, dtype=np.int16), ring._blocks)
+    assert ring.read_nowait() is None
+    assert ring.underruns == 1
+
+def test_full_ring_drops_new_audio_instead_of_overwriting():
+    ring = AudioRingBuffer(block_frames=2, num_blocks=2)
+    ring.write(np.array([1, 1], dtype=np.int16))
+    held = ring.read_nowait()
+    ring.write(np.array([2, 2], dtype=np.int16))
+
+    stored = ring.write(np.array([3, 3, 4, 4], dtype=np.int16))
+
+    assert stored == 0
+    assert np.frombuffer(held, dtype=np.int16).tolist() == [1, 1]
+    assert (ring.overruns, ring.dropped_frames) == (1, 4)
+
+def test_stereo_frames_and_raw_bytes():
+    ring = AudioRingBuffer(block_frames=2, channels=2, num_blocks=2)
+
+    assert ring.write(np.array([1, -1, 2, -2], dtype=np.int16).tobytes()) == 2
+    assert bytes(ring.read_nowait()) == np.array([1, -1, 2, -2], dtype=np.int16).tobytes()
+
+def test_async_frames_follow_a_producer_thread():
+    ring = AudioRingBuffer(block_frames=160, num_blocks=8)
+
+    def produce():
+        for i in range(20):
+            ring.write(np.full(160, i, dtype=np.int16))
+            time.sleep(0.002)
+        ring.close()
+
+    async def main():
+        threading.Thread(target=produce).start()
+        return [int(np.frombuffer(view, dtype=np.int16)[0]) async for view in ring.frames()]
+
+    assert asyncio.run(main()) == list(range(20))
+    assert ring.overruns == 0
+
+def test_blocking_read_times_out_as_underrun():
+    ring = AudioRingBuffer(block_frames=2)
+
+    assert ring.read(timeout=0.01) is None
+    assert ring.stats()["underruns"] == 1
@@ -0,0 +1,108 @@
+import asyncio
+import time
+import wave
+import numpy as np
+from backend.services.audio_ring_buffer import AudioRingBuffer
+from backend.services.capture import GeneratedStream, MultiStreamCapture
+from backend.services.stream_registry import STREAM_REGISTRY, create_stream
+
+class RampStream(GeneratedStream):
+    """Each sample holds its own stream position."""
+
+    def _generate(self, position, frames):
+        ramp = (position + np.arange(frames)) % 30000
+        return np.repeat(ramp[:, None], self.channels, axis=1).astype(np.int16)
+
+class ManualStream:
+    """Stream fed by the test, with control over block positions."""
+
+    samplerate = 1000
+    channels = 1
+    chunk = 4
+    dtype = "int16"
+    start_time = 0.0
+
+    def __init__(self, blocks):
+        self.ring = AudioRingBuffer(self.chunk, num_blocks=8)
+        for position, value in blocks:
+            self.ring.write(np.full(self.chunk, value, dtype=np.int16), position)
+        self.ring.close()
+
+    def frames(self):
+        return self.ring.frames()
+
+    def stats(self):
+        return self.ring.stats()
+
+async def collect(capture, limit=None):
+    blocks = []
+    async for timestamp, frames in capture.frames():
+        blocks.append((timestamp, frames.copy()))
+        if limit is not None and len(blocks) == limit:
+            break
+    return blocks
+
+def test_engines_are_registered():
+    stream = create_stream("synthetic", chunk=160, realtime=False, ring_blocks=4)
+    stream.open()
+    stream.start()
+    view, overflowed = stream.read(timeout=1)
+    stream.close()
+
+    assert {"synthetic", "file"} <= set(STREAM_REGISTRY)
+    assert len(view) == 160 * 2
+    assert np.abs(np.frombuffer(view, dtype=np.int16)).max() > 0
+
+def test_file_stream_plays_wav_to_the_end(tmp_path):
+    path = tmp_path / "ramp.wav"
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(8000)
+        f.writeframes(np.arange(2000, dtype=np.int16).tobytes())
+
+    stream = create_stream("file", path=str(path), chunk=256, realtime=False)
+    stream.open()
+    stream.start()
+
+    async def main():
+        return [bytes(view) async for view in stream.frames()]
+
+    chunks = asyncio.run(main())
+    stream.close()
+
+    assert (stream.samplerate, stream.channels) == (8000, 2)
+    # The last block is padded with silence
+    assert len(chunks) == 4
+    assert b"".join(chunks) == np.arange(2000, dtype=np.int16).tobytes() + bytes(2 * 48)
+
+def test_streams_started_at_different_times_are_aligned():
+    first = RampStream(samplerate=8000, chunk=80)
+    second = RampStream(samplerate=8000, chunk=80, channels=2)
+    capture = MultiStreamCapture([first, second])
+    capture.open()
+    first.start()
+    time.sleep(0.05)
+    second.start()
+
+    blocks = asyncio.run(collect(capture, limit=5))
+    capture.close()
+
+    assert capture.channels == 3
+    for _, frames in blocks:
+        a, b, c = frames.astype(np.int64)
+        instant_a = first.start_time + a / 8000
+        instant_b = second.start_time + b / 8000
+        assert np.abs(instant_a - instant_b).max() < 1.5 / 8000
+        assert (b == c).all()
+    assert abs(blocks[1][0] - blocks[0][0] - 80 / 8000) < 1e-9
+
+def test_dropped_audio_is_replaced_with_silence():
+    stream = ManualStream([(0, 1), (4, 2), (12, 3)])
+    capture = MultiStreamCapture([stream], block_frames=8)
+
+    blocks = asyncio.run(collect(capture))
+
+    assert blocks[0][1].tolist() == [[1, 1, 1, 1, 2, 2, 2, 2]]
+    assert blocks[1][1].tolist() == [[0, 0, 0, 0, 3, 3, 3, 3]]
+    assert capture.stats()[0]["zero_filled_frames"] == 4
@@ -0,0 +1,63 @@
+import copy
+import json
+from backend.services.conversation_history import ConversationHistory, HistorySlot, SUMMARY_PREFIX
+
+def turn(role, text):
+    return {"role": role, "content": text}
+
+def test_system_messages_go_to_their_slots_in_order():
+    history = ConversationHistory([turn("user", "Hi."), turn("assistant", "Hello!")])
+    history.append(turn("system", "[VISION CONTEXT]: A red bicycle."))
+    history.insert(0, turn("system", "You are a helpful assistant."))
+    history.set_slot(HistorySlot.USER_CONTEXT, turn("system", "USER CONTEXT: The user's name is Sam."))
+    history.set_slot(HistorySlot.USER_CONTEXT, turn("system", "USER CONTEXT: The user's name is Alex."))
+
+    assert [message["content"][:12] for message in history] == [
+        "You are a he", "USER CONTEXT", "[VISION CONT", "Hi.", "Hello!"
+    ]
+    assert "Alex" in history[1]["content"]
+    assert history.turns == [turn("user", "Hi."), turn("assistant", "Hello!")]
+
+def test_token_count_is_updated_incrementally():
+    history = ConversationHistory(count_tokens=len)
+    history.append(turn("user", "abcd"))
+    history.append(turn("assistant", "ef"))
+    history[1] = turn("assistant", "efgh")
+    history.pop(0)
+
+    assert history.tokens == len("efgh") + 4
+
+def test_old_turns_are_summarized_once_over_budget():
+    history = ConversationHistory(max_tokens=200, min_recent=2, summary_max_tokens=60)
+    history.append(turn("system", "You are a helpful assistant."))
+    for i in range(20):
+        history.append(turn("user", f"Question number {i} about the weather today? Some more detail."))
+        history.append(turn("assistant", f"Answer number {i}. It is sunny and warm."))
+
+    assert history.tokens <= 200
+    assert history[0]["content"] == "You are a helpful assistant."
+    assert history[1]["content"].startswith(SUMMARY_PREFIX)
+    assert "Answer number 19" in history[-1]["content"]
+    assert history.turns[0]["role"] == "user"
+    assert history.stats()["compacted_turns"] > 0
+
+def test_replaced_image_is_kept_in_summary():
+    history = ConversationHistory()
+    history.set_slot(HistorySlot.VISION, turn("system", "[VISION CONTEXT]: A red bicycle. It has a bell."))
+    history.set_slot(HistorySlot.VISION, turn("system", "[VISION CONTEXT]: A cat."))
+
+    assert len(history) == 2
+    assert "Image: A red bicycle." in history.get_slot(HistorySlot.SUMMARY)["content"]
+
+def test_saved_history_round_trips():
+    history = ConversationHistory(max_tokens=100, min_recent=2)
+    for i in range(10):
+        history.append(turn("user", f"Message {i} with a few words in it."))
+
+    restored = ConversationHistory(json.loads(json.dumps(history)), max_tokens=100, min_recent=2)
+    duplicate = copy.deepcopy(history)
+
+    assert restored == history
+    assert restored.tokens == history.tokens
+    assert duplicate == history and duplicate.get_slot(HistorySlot.SUMMARY) is not None
+    assert type(history.copy()) is list
@@ -0,0 +1,64 @@
+import asyncio
+import json
+from backend.services.conversation_storage import ConversationStorage
+
+def messages(n):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i}"} for i in range(n)]
+
+def test_save_load_and_overwrite(tmp_path):
+    storage = ConversationStorage(str(tmp_path))
+
+    async def main():
+        session_id = await storage.save_session(messages(2), title="Weather", metadata={"user_name": "Sam"})
+        await storage.save_session(messages(4), session_id=session_id)
+        return session_id, await storage.load_session(session_id), await storage.load_session("missing")
+
+    session_id, session, missing = asyncio.run(main())
+
+    assert session["id"] == session_id
+    assert session["title"] == "Weather"
+    assert session["messages"] == messages(4)
+    assert session["metadata"]["message_count"] == 4
+    assert missing is None
+
+def test_listing_is_paginated_filtered_and_omits_messages(tmp_path):
+    storage = ConversationStorage(str(tmp_path))
+
+    async def main():
+        for i in range(5):
+            await storage.save_session(messages(2), title=f"Trip {i}" if i % 2 else f"Recipe {i}")
+        return (
+            await storage.list_sessions(limit=2, offset=1),
+            await storage.list_sessions(query="trip"),
+            await storage.count_sessions(query="recipe"),
+        )
+
+    page, trips, recipes = asyncio.run(main())
+
+    assert [session["title"] for session in page] == ["Trip 3", "Recipe 2"]
+    assert all("messages" not in session for session in page)
+    assert sorted(session["title"] for session in trips) == ["Trip 1", "Trip 3"]
+    assert recipes == 3
+
+def test_delete_removes_messages_too(tmp_path):
+    storage = ConversationStorage(str(tmp_path))
+
+    async def main():
+        session_id = await storage.save_session(messages(2))
+        return await storage.delete_session(session_id), await storage.delete_session(session_id)
+
+    assert asyncio.run(main()) == (True, False)
+    assert storage._conn.execute("SELECT COUNT(*) FROM session_messages").fetchone()[0] == 0
+
+def test_json_session_files_are_imported(tmp_path):
+    (tmp_path / "abc.json").write_text(json.dumps({
+        "id": "abc", "title": "Old", "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-02T00:00:00", "messages": messages(3), "metadata": {}
+    }))
+
+    storage = ConversationStorage(str(tmp_path))
+    session = asyncio.run(storage.load_session("abc"))
+
+    assert (session["title"], session["updated_at"]) == ("Old", "2024-01-02T00:00:00")
+    assert session["messages"] == messages(3)
+    assert not (tmp_path / "abc.json").exists()
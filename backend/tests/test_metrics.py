@@ -0,0 +1,63 @@
+import pytest
+from backend.services.metrics import MetricsRegistry
+from backend.services.work_queue import WorkScheduler
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    stages = registry.histogram("stage_seconds", "Stage latency", ["stage"], buckets=(0.1, 1.0))
+
+    stt = stages.labels("stt")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        stt.observe(value)
+    with stages.labels("vad").time():
+        pass
+
+    text = registry.render()
+
+    assert "# TYPE stage_seconds histogram" in text
+    assert 'stage_seconds_bucket{stage="stt",le="0.1"} 2' in text
+    assert 'stage_seconds_bucket{stage="stt",le="1.0"} 3' in text
+    assert 'stage_seconds_bucket{stage="stt",le="+Inf"} 4' in text
+    assert 'stage_seconds_sum{stage="stt"} 3.65' in text
+    assert 'stage_seconds_count{stage="vad"} 1' in text
+
+def test_counters_and_gauges_are_shared_by_name():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors", ["stage"]).labels("stt").inc()
+    registry.counter("errors_total", "Errors", ["stage"]).labels("stt").inc(2)
+    connections = registry.gauge("connections", "Open connections")
+    connections.inc()
+    connections.inc()
+    connections.dec()
+
+    text = registry.render()
+
+    assert 'errors_total{stage="stt"} 3.0' in text
+    assert "connections 1.0" in text
+    with pytest.raises(ValueError):
+        registry.gauge("errors_total", "Errors")
+    with pytest.raises(ValueError):
+        registry.counter("errors_total", "Errors", ["stage"]).labels("stt", "extra")
+
+def test_stats_are_collected_at_scrape_time():
+    registry = MetricsRegistry()
+    stats = {"hits": 1, "misses": 4, "entries": 2}
+    registry.register_stats("cache", lambda: stats, {"cache": "tts"})
+    registry.register_stats("cache", lambda: {"hits": 7, "misses": 0}, {"cache": "transcription"})
+    stats["hits"] = 5
+
+    lines = registry.render().splitlines()
+
+    assert lines.count("# TYPE cache_hits_total counter") == 1
+    assert 'cache_hits_total{cache="tts"} 5' in lines
+    assert 'cache_hits_total{cache="transcription"} 7' in lines
+    assert 'cache_entries{cache="tts"} 2' in lines
+
+def test_failing_collector_does_not_break_scrape():
+    registry = MetricsRegistry()
+    registry.register_collector(lambda: 1 / 0)
+    registry.register_stats("work", WorkScheduler(max_active=3).stats)
+
+    text = registry.render()
+
+    assert "work_max_active 3" in text
@@ -0,0 +1,49 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from backend.services.micro_batcher import MicroBatcher
+
+def test_requests_are_grouped_up_to_max_batch_size():
+    batches = []
+
+    def run_batch(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = MicroBatcher(run_batch, executor, max_batch_size=3, max_wait_ms=20)
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(main()) == [0, 10, 20, 30, 40]
+    # A full batch is dispatched at once, the rest when the window closes
+    assert batches == [[0, 1, 2], [3, 4]]
+
+def test_cancelled_requests_are_skipped():
+    batches = []
+
+    def run_batch(items):
+        batches.append(list(items))
+        return items
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = MicroBatcher(run_batch, executor, max_wait_ms=20)
+            cancelled = asyncio.create_task(batcher.submit("stale"))
+            kept = asyncio.create_task(batcher.submit("fresh"))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            return await kept
+
+    assert asyncio.run(main()) == "fresh"
+    assert batches == [["fresh"]]
+
+def test_errors_reach_every_caller():
+    def run_batch(items):
+        raise RuntimeError("model failed")
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = MicroBatcher(run_batch, executor, max_wait_ms=1)
+            return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert [str(error) for error in asyncio.run(main())] == ["model failed", "model failed"]
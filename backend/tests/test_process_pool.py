@@ -0,0 +1,26 @@
+import asyncio
+import numpy as np
+from backend.services.audio_input import AudioInput, resample_to_mono
+from backend.services.process_pool import AudioProcessPool
+
+def test_audio_is_processed_in_worker_through_shared_memory():
+    stereo_48k = np.tile(np.array([[1000, 3000]], dtype=np.int16), (4800, 1))
+    audio = AudioInput.from_pcm(stereo_48k, 48000, channels=2)
+
+    async def main():
+        pool = AudioProcessPool(max_workers=1)
+        try:
+            first = await pool.run_audio(resample_to_mono, audio, 16000)
+            second = await pool.run_audio(resample_to_mono, audio, 16000)
+            return first, second, pool._free_count
+        finally:
+            pool.shutdown()
+
+    first, second, free_blocks = asyncio.run(main())
+
+    assert first.dtype == np.int16 and len(first) == 1600
+    # Downmixed to the channel average (away from the resampler's edges)
+    assert np.all(first[100:-100] == 2000)
+    assert np.array_equal(first, second)
+    # The same block was reused for both calls
+    assert free_blocks == 1
@@ -0,0 +1,41 @@
+import asyncio
+import json
+import os
+from backend.services.shared_context import SharedContext
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def make_context(tmp_path, monkeypatch):
+    # Conversation storage is created in the working directory
+    monkeypatch.chdir(tmp_path)
+    return SharedContext(str(tmp_path / "prompts"))
+
+def test_saves_replace_files_atomically(tmp_path, monkeypatch):
+    context = make_context(tmp_path, monkeypatch)
+    context.user_profile["name"] = "Ana"
+
+    assert asyncio.run(context.save_user_profile())
+
+    assert json.loads((tmp_path / "prompts" / "user_profile.json").read_text())["name"] == "Ana"
+    assert sorted(p.name for p in (tmp_path / "prompts").iterdir()) == ["system_prompt.md", "user_profile.json", "vision_settings.json"]
+    assert not context.reload_changed()
+
+def test_reload_keeps_values_when_file_is_partial(tmp_path, monkeypatch):
+    context = make_context(tmp_path, monkeypatch)
+    context.user_profile["name"] = "Ana"
+    asyncio.run(context.save_user_profile())
+    profile_path = tmp_path / "prompts" / "user_profile.json"
+
+    # An external editor truncated the file and has not finished writing it
+    profile_path.write_text('{"name": "Bu')
+    bump_mtime(profile_path)
+    assert context.reload_changed()
+    assert context.user_profile["name"] == "Ana"
+    assert profile_path.read_text() == '{"name": "Bu'
+
+    profile_path.write_text('{"name": "Budi"}')
+    bump_mtime(profile_path)
+    assert context.reload_changed()
+    assert context.user_profile["name"] == "Budi"
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from backend.services.speech_pipeline import SpeechPipeline
+
+class FakeTTS:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.started = []
+
+    async def async_text_to_speech(self, text: str) -> bytes:
+        self.started.append((text, time.monotonic()))
+        await asyncio.sleep(self.delay)
+        return text.encode()
+
+async def slow_tokens(text: str, delay: float):
+    for word in text.split(" "):
+        await asyncio.sleep(delay)
+        yield word + " "
+
+def test_sentences_are_synthesized_while_llm_is_still_streaming():
+    text = "The first sentence is here. The second sentence follows it. And a third one ends."
+
+    async def main():
+        tts = FakeTTS(delay=0.05)
+        pipeline = SpeechPipeline(tts, min_sentence_length=10)
+        start = time.monotonic()
+        results = []
+        async for sentence, audio in pipeline.run(slow_tokens(text, 0.02)):
+            results.append((sentence, audio, time.monotonic() - start))
+        return tts, results, time.monotonic() - start
+
+    tts, results, total = asyncio.run(main())
+
+    assert [sentence for sentence, _, _ in results] == [
+        "The first sentence is here.",
+        "The second sentence follows it.",
+        "And a third one ends.",
+    ]
+    assert all(audio == sentence.encode() for sentence, audio, _ in results)
+    # First audio is ready long before the LLM finishes the whole response
+    assert results[0][2] < 0.02 * len(text.split(" "))
+    # TTS for sentence 1 started before the last token was produced
+    assert tts.started[0][1] - tts.started[-1][1] < 0
+
+def test_cancel_event_stops_pipeline():
+    async def main():
+        cancel = asyncio.Event()
+        pipeline = SpeechPipeline(FakeTTS(delay=0.01), min_sentence_length=1)
+        results = []
+        async for sentence, _ in pipeline.run(slow_tokens("One. Two. Three. Four.", 0.01), cancel):
+            results.append(sentence)
+            cancel.set()
+        return results
+
+    assert asyncio.run(main()) == ["One."]
+
+def test_cancelling_consumer_cancels_pending_tts():
+    async def main():
+        tts = FakeTTS(delay=10)
+        pipeline = SpeechPipeline(tts, min_sentence_length=1)
+
+        async def consume():
+            async for _ in pipeline.run(slow_tokens("One. Two. Three.", 0)):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        return tts, time.monotonic() - start, pending
+
+    tts, latency, pending = asyncio.run(main())
+
+    assert len(tts.started) == 2  # max_pending sentences were in flight
+    assert latency < 0.1
+    assert pending == []
@@ -0,0 +1,55 @@
+import numpy as np
+from backend.services.audio_input import AudioInput
+from backend.services.transcription_cache import TranscriptionCache
+
+def make_audio(value, sample_rate=16000):
+    return AudioInput.from_pcm(np.full(1600, value, dtype=np.int16), sample_rate)
+
+def test_key_depends_on_audio_language_and_rate():
+    key = TranscriptionCache.make_key(make_audio(1), "en-US")
+
+    assert key == TranscriptionCache.make_key(make_audio(1), "en-US")
+    assert key != TranscriptionCache.make_key(make_audio(2), "en-US")
+    assert key != TranscriptionCache.make_key(make_audio(1), "id-ID")
+    assert key != TranscriptionCache.make_key(make_audio(1, 8000), "en-US")
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TranscriptionCache(max_entries=2)
+    cache.put("a", "first", {})
+    cache.put("b", "second", {})
+    cache.get("a")
+    cache.put("c", "third", {})
+
+    assert cache.get("b") is None
+    assert cache.get("a")[0] == "first"
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+def test_size_bound_evicts_entries():
+    cache = TranscriptionCache(max_bytes=200)
+    for i in range(10):
+        cache.put(str(i), "x" * 50, {})
+
+    assert cache.stats()["bytes"] <= 200
+    assert cache.get("9") is not None and cache.get("0") is None
+
+def test_cached_metadata_is_not_shared():
+    cache = TranscriptionCache()
+    cache.put("a", "text", {"confidence": 0.9})
+    cache.get("a")[1]["confidence"] = 0.0
+
+    assert cache.get("a")[1]["confidence"] == 0.9
+
+def test_disk_tier_survives_restart(tmp_path):
+    TranscriptionCache(disk_dir=str(tmp_path)).put("abc", "hello", {"language": "en-US"})
+
+    cache = TranscriptionCache(disk_dir=str(tmp_path))
+
+    assert cache.get("abc") == ("hello", {"language": "en-US"}, "disk")
+    assert cache.get("abc")[2] == "memory"
+
+def test_disk_tier_is_pruned(tmp_path):
+    cache = TranscriptionCache(max_entries=1, disk_dir=str(tmp_path), max_disk_entries=5)
+    for i in range(20):
+        cache.put(f"{i:02d}key", "text", {})
+
+    assert len(cache._disk_entries()) <= 6
@@ -0,0 +1,123 @@
+import asyncio
+import mmap
+from backend.services.tts_cache import CachedTTS, TTSCache, normalize_text
+
+class FakeTTS:
+    """Returns the text as audio after a short delay."""
+
+    output_format = "wav"
+    is_processing = False
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+
+    async def async_text_to_speech(self, text):
+        self.calls.append(text)
+        await asyncio.sleep(self.delay)
+        return text.encode()
+
+def test_key_ignores_whitespace_but_not_voice_or_format():
+    key = TTSCache.make_key("Hello  there.\n", "en-US-A", "wav")
+
+    assert normalize_text(" Hello \t there. ") == "Hello there."
+    assert TTSCache.make_key("Hello there.", "en-US-A", "wav") == key
+    assert TTSCache.make_key("Hello there.", "en-US-B", "wav") != key
+    assert TTSCache.make_key("Hello there.", "en-US-A", "mp3") != key
+
+def test_memory_tier_evicts_least_recently_used_by_size():
+    cache = TTSCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.get("a")
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.stats()["bytes"] == 8
+
+def test_large_disk_clips_are_served_as_memory_map(tmp_path):
+    TTSCache(disk_dir=str(tmp_path)).put("abc.wav", b"RIFF audio")
+
+    cache = TTSCache(disk_dir=str(tmp_path), promote_max_bytes=4)
+    audio = cache.get("abc.wav")
+
+    assert isinstance(audio, mmap.mmap)
+    assert audio[:] == b"RIFF audio"
+    assert cache.stats()["entries"] == 0
+
+def test_small_disk_clips_are_promoted_to_memory(tmp_path):
+    TTSCache(disk_dir=str(tmp_path)).put("abc.wav", b"RIFF audio")
+
+    cache = TTSCache(disk_dir=str(tmp_path))
+    first = cache.get("abc.wav")
+    (tmp_path / "ab" / "abc.wav").unlink()
+
+    assert first == b"RIFF audio"
+    assert cache.get("abc.wav") == b"RIFF audio"
+    assert cache.stats()["hits"] == 2
+
+def test_disk_tier_is_pruned_to_its_bound(tmp_path):
+    cache = TTSCache(disk_dir=str(tmp_path), max_disk_bytes=25)
+    for key in ("aa", "bb", "cc"):
+        cache.put(key, b"0123456789")
+
+    assert cache._disk_bytes <= 25
+    assert cache._map_disk("cc") is not None
+
+def test_concurrent_requests_share_one_synthesis():
+    tts = FakeTTS()
+    cached = CachedTTS(tts, TTSCache())
+
+    async def main():
+        first = await asyncio.gather(*(cached.async_text_to_speech("Hi there.") for _ in range(3)))
+        second = await cached.async_text_to_speech("Hi  there.")
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert tts.calls == ["Hi there."]
+    assert first == [b"Hi there."] * 3
+    assert second == b"Hi there."
+    assert cached.output_format == "wav"
+
+def test_synthesis_is_cancelled_once_every_caller_is():
+    tts = FakeTTS(delay=1.0)
+    cached = CachedTTS(tts, TTSCache())
+
+    async def main():
+        callers = [asyncio.ensure_future(cached.async_text_to_speech("Long answer.")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        [task] = [entry[0] for entry in cached._inflight.values()]
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        still_running = not task.done()
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return still_running, task.cancelled()
+
+    assert asyncio.run(main()) == (True, True)
+
+def test_request_after_cancel_starts_a_new_synthesis():
+    tts = FakeTTS()
+    cached = CachedTTS(tts, TTSCache())
+
+    async def main():
+        first = asyncio.ensure_future(cached.async_text_to_speech("Hi there."))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        return await cached.async_text_to_speech("Hi there.")
+
+    assert asyncio.run(main()) == b"Hi there."
+    assert tts.calls == ["Hi there.", "Hi there."]
+
+def test_warm_up_fills_the_cache():
+    tts = FakeTTS()
+    cache = TTSCache()
+
+    asyncio.run(CachedTTS(tts, cache).warm_up(["Hello!", "One moment.", " "]))
+
+    assert sorted(tts.calls) == ["Hello!", "One moment."]
+    assert cache.get(cache.make_key("Hello!", None, "wav")) == b"Hello!"
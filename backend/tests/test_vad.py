@@ -0,0 +1,47 @@
+import asyncio
+import numpy as np
+from backend.services.vad import VADEvent, VADSegmenter
+
+class FakeVADModel:
+    """Scores a window as speech when its mean amplitude is high."""
+
+    async def predict(self, window, state, sample_rate):
+        return float(np.abs(window).mean() > 0.1), state
+
+def make_audio(pattern, window=512):
+    """Build int16 PCM from a string of 's' (speech) and '.' (silence) windows."""
+    return np.concatenate([
+        np.full(window, 10000 if c == "s" else 0, dtype=np.int16) for c in pattern
+    ])
+
+def run(segmenter, audio):
+    return asyncio.run(segmenter.process(audio.tobytes()))
+
+def test_trims_leading_and_trailing_silence():
+    # 32 ms windows: 64 ms padding, 128 ms hangover
+    segmenter = VADSegmenter(FakeVADModel(), hangover_ms=128, speech_pad_ms=64)
+    events = run(segmenter, make_audio("......ssss......"))
+
+    assert [event for event, _ in events] == [VADEvent.START, VADEvent.END]
+    # 2 pad windows + 4 speech windows, then 2 trailing pad windows
+    assert len(events[0][1]) == 6 * 512
+    assert len(events[1][1]) == 2 * 512
+    assert not segmenter.is_speaking
+
+def test_short_pause_is_kept_inside_utterance():
+    segmenter = VADSegmenter(FakeVADModel(), hangover_ms=128, speech_pad_ms=0)
+    events = run(segmenter, make_audio("ss..ss"))
+
+    assert [event for event, _ in events] == [VADEvent.START]
+    assert len(events[0][1]) == 6 * 512
+    assert segmenter.is_speaking
+
+def test_windows_span_chunks():
+    segmenter = VADSegmenter(FakeVADModel(), hangover_ms=64, speech_pad_ms=0)
+    audio = make_audio("ss")
+
+    first = run(segmenter, audio[:700])
+    second = run(segmenter, audio[700:])
+
+    assert [(event, len(chunk)) for event, chunk in first] == [(VADEvent.START, 512)]
+    assert [(event, len(chunk)) for event, chunk in second] == [(VADEvent.SPEECH, 512)]
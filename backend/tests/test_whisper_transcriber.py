@@ -0,0 +1,107 @@
+import asyncio
+import numpy as np
+from backend.services import whisper_transcriber
+from backend.services.audio_input import AudioInput
+from backend.services.transcriber_registry import TRANSCRIBER_REGISTRY, create_transcriber
+from backend.services.transcription_cache import TranscriptionCache
+
+class FakeSegment:
+    def __init__(self, text):
+        self.text = text
+        self.avg_logprob = 0.0
+
+class FakeInfo:
+    language = "en"
+    language_probability = 1.0
+
+class FakeWhisperModel:
+    """Reports the number of samples it was given."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, samples, **kwargs):
+        self.calls.append(samples)
+        return iter([FakeSegment(f" {len(samples)} samples ")]), FakeInfo()
+
+def make_transcriber(monkeypatch, **kwargs):
+    model = FakeWhisperModel()
+    monkeypatch.setattr(whisper_transcriber, "get_whisper_model", lambda *args: model)
+    kwargs.setdefault("batch_wait_ms", 0)
+    return create_transcriber("faster_whisper", num_workers=1, **kwargs), model
+
+def test_engine_is_registered(monkeypatch):
+    transcriber, _ = make_transcriber(monkeypatch)
+
+    assert TRANSCRIBER_REGISTRY["faster_whisper"] is whisper_transcriber.WhisperTranscriber
+    assert transcriber.language == "en"
+
+def test_input_is_resampled_to_16k_mono(monkeypatch):
+    transcriber, model = make_transcriber(monkeypatch)
+    stereo_48k = np.zeros(48000 * 2, dtype=np.int16)
+
+    text, metadata = transcriber.transcribe(AudioInput.from_pcm(stereo_48k, 48000, channels=2))
+
+    assert text == "16000 samples"
+    assert model.calls[0].dtype == np.float32
+    assert metadata["sample_rate_used"] == 48000
+    assert metadata["confidence"] == 1.0
+
+def test_stream_transcribe_collects_audio(monkeypatch):
+    transcriber, _ = make_transcriber(monkeypatch)
+
+    async def chunks():
+        for _ in range(4):
+            yield np.zeros(4000, dtype=np.int16).tobytes()
+
+    async def main():
+        return [result async for result in transcriber.stream_transcribe(chunks(), 16000)]
+
+    [(text, is_final, metadata)] = asyncio.run(main())
+
+    assert (text, is_final) == ("16000 samples", True)
+    assert "queue_time" in metadata
+
+def test_concurrent_short_utterances_are_batched(monkeypatch):
+    transcriber, _ = make_transcriber(monkeypatch, batch_wait_ms=20)
+    batches = []
+
+    def run_batch(items):
+        batches.append(len(items))
+        return [(f"utterance {audio.num_frames}", {}) for audio, _ in items]
+
+    transcriber._batcher.run_batch = run_batch
+
+    async def main():
+        audio = [AudioInput.from_pcm(np.zeros(n, dtype=np.int16), 16000) for n in (100, 200, 300)]
+        return await asyncio.gather(*(transcriber.async_transcribe(a) for a in audio))
+
+    results = asyncio.run(main())
+
+    assert batches == [3]
+    assert [text for text, _ in results] == ["utterance 100", "utterance 200", "utterance 300"]
+
+def test_repeated_audio_is_served_from_cache(monkeypatch):
+    transcriber, model = make_transcriber(monkeypatch, cache=TranscriptionCache())
+    audio = AudioInput.from_pcm(np.ones(16000, dtype=np.int16), 16000)
+
+    first = transcriber.transcribe(audio)
+    second = transcriber.transcribe(AudioInput.from_pcm(np.ones(16000, dtype=np.int16), 16000))
+
+    assert len(model.calls) == 1
+    assert first[0] == second[0]
+    assert first[1]["cache"]["hit"] is False
+    assert (second[1]["cache"]["hit"], second[1]["cache"]["tier"]) == (True, "memory")
+    assert (second[1]["cache"]["hits"], second[1]["cache"]["misses"]) == (1, 1)
+
+def test_only_transcript_fields_are_cached(monkeypatch):
+    transcriber, model = make_transcriber(monkeypatch, cache=TranscriptionCache())
+    audio = AudioInput.from_pcm(np.ones(16000, dtype=np.int16), 16000)
+
+    first = transcriber.transcribe(audio)
+    second = transcriber.transcribe(audio)
+
+    assert "sample_rate_used" in first[1]
+    assert "sample_rate_used" not in second[1]
+    assert second[1]["confidence"] == first[1]["confidence"]
+    assert second[1]["engine"] == "faster_whisper"
@@ -0,0 +1,54 @@
+import asyncio
+from backend.services.work_queue import QueuePolicy, SubmitOutcome, WorkScheduler
+
+def test_full_queue_drops_oldest():
+    queue = WorkScheduler(max_pending=2).create_queue()
+
+    outcomes = [queue.submit(item) for item in ("a", "b", "c")]
+
+    assert outcomes == [SubmitOutcome.QUEUED, SubmitOutcome.QUEUED, SubmitOutcome.DROPPED_OLDEST]
+    assert list(queue._items) == ["b", "c"]
+    assert queue.scheduler.queued == 2
+
+def test_full_queue_merges_into_newest():
+    queue = WorkScheduler(max_pending=1, policy=QueuePolicy.MERGE).create_queue(merge=lambda a, b: a + b)
+
+    outcomes = [queue.submit(item) for item in ("a", "b", "c")]
+
+    assert outcomes == [SubmitOutcome.QUEUED, SubmitOutcome.MERGED, SubmitOutcome.MERGED]
+    assert list(queue._items) == ["abc"]
+
+def test_global_limit_sheds_new_work():
+    scheduler = WorkScheduler(max_queued=2, max_pending=2, policy=QueuePolicy.DROP_NEWEST)
+    first, second = scheduler.create_queue(), scheduler.create_queue()
+
+    assert first.submit("a") == SubmitOutcome.QUEUED
+    assert first.submit("b") == SubmitOutcome.QUEUED
+    assert second.submit("c") == SubmitOutcome.SHED
+    assert first.submit("d") == SubmitOutcome.DROPPED_NEWEST
+    assert scheduler.overloaded
+
+def test_get_waits_for_a_processing_slot():
+    async def main():
+        scheduler = WorkScheduler(max_active=1)
+        first, second = scheduler.create_queue(), scheduler.create_queue()
+        first.submit("a")
+        second.submit("b")
+
+        assert await first.get() == "a"
+        waiting = asyncio.create_task(second.get())
+        await asyncio.sleep(0.01)
+        blocked = not waiting.done()
+
+        # Newer speech replaces the waiting utterance before it gets a slot
+        second.submit("c")
+        second.submit("d")
+        first.task_done()
+        return blocked, await waiting, scheduler
+
+    blocked, item, scheduler = asyncio.run(main())
+
+    assert blocked
+    assert item == "c"
+    assert scheduler.active == 1
+    assert scheduler.queued == 1
@@ -192,6 +192,11 @@ const ChatInterface: React.FC = () => {
       }
     };
     
+    // Show the transcript so far while a streamed utterance is still being recognized
+    const handleInterimTranscription = (data: any) => {
+      setTranscript(data.text);
+    };
+    
     // Handle LLM response
     const handleLLMResponse = (data: any) => {
       // Store the response text
@@ -251,6 +256,7 @@ const ChatInterface: React.FC = () => {
     websocketService.addEventListener('close', handleConnectionChange);
     websocketService.addEventListener('error', handleConnectionChange);
     websocketService.addEventListener('transcription', handleTranscription);
+    websocketService.addEventListener('transcription_interim', handleInterimTranscription);
     websocketService.addEventListener('llm_response', handleLLMResponse);
     // Add error handler for non-connection errors
     websocketService.addEventListener('error', handleError);
@@ -279,7 +285,11 @@ const ChatInterface: React.FC = () => {
     
     // Handle TTS audio chunks
     const handleTTSChunk = (data: any) => {
-      if (data.audio_chunk) {
+      if (data.audio_data instanceof ArrayBuffer) {
+        // Segment received in binary frames
+        console.log(`Received TTS chunk (${data.audio_data.byteLength} bytes), sending to audio service`);
+        audioService.playAudioData(data.audio_data, data.format || 'wav');
+      } else if (data.audio_chunk) {
         console.log(`Received TTS chunk (${data.audio_chunk.length} chars), sending to audio service`);
         audioService.playAudioChunk(data.audio_chunk, data.format || 'mp3');
       }
@@ -296,6 +306,7 @@ const ChatInterface: React.FC = () => {
       websocketService.removeEventListener('close', handleConnectionChange);
       websocketService.removeEventListener('error', handleConnectionChange);
       websocketService.removeEventListener('transcription', handleTranscription);
+      websocketService.removeEventListener('transcription_interim', handleInterimTranscription);
       websocketService.removeEventListener('llm_response', handleLLMResponse);
       websocketService.removeEventListener('error', handleError);
       websocketService.removeEventListener('tts_chunk', handleTTSChunk);
@@ -14,6 +14,7 @@ interface AudioConfig {
   noiseSuppression: boolean;
   autoGainControl: boolean;
   bufferSize: number;
+  streaming: boolean; // Stream utterances while they are spoken instead of sending a WAV file at the end
 }
 
 // Default audio configuration
@@ -23,7 +24,8 @@ const DEFAULT_CONFIG: AudioConfig = {
   echoCancellation: true,
   noiseSuppression: true,
   autoGainControl: true,
-  bufferSize: 4096
+  bufferSize: 4096,
+  streaming: import.meta.env.VITE_AUDIO_STREAMING === 'true'
 };
 
 // Audio service state
@@ -67,6 +69,7 @@ export class AudioService {
   private isPlaying: boolean = false;
   private isSpeaking: boolean = false; // Distinct from isPlaying to track TTS specifically
   private isMuted: boolean = false; // Track microphone mute state
+  private isStreaming: boolean = false; // An audio stream is open on the server
   private currentSource: AudioBufferSourceNode | null = null;
   
   // State tracking (for UI coordination)
@@ -246,6 +249,7 @@ export class AudioService {
 
     // Send any remaining audio data
     this.sendAudioChunk();
+    this.endAudioStream();
 
     // Reset state
     this.audioState = AudioState.INACTIVE;
@@ -332,6 +336,7 @@ export class AudioService {
     
     // If in a protected state, never accumulate audio buffer
     if (this.isProcessing || this.isVisionProcessing || this.isGreeting) {
+      this.endAudioStream();
       // Dispatch event for visualization only
       this.dispatchEvent(AudioEvent.RECORDING_DATA, { 
         buffer: bufferCopy,
@@ -343,7 +348,11 @@ export class AudioService {
     
     // Add to buffer if voice is detected or we're in the silence timeout period
     if (this.isVoiceDetected) {
-      this.audioBuffer.push(bufferCopy);
+      if (this.config.streaming) {
+        this.streamAudio(bufferCopy);
+      } else {
+        this.audioBuffer.push(bufferCopy);
+      }
       
       // Check if we've exceeded silence timeout
       const timeSinceVoice = Date.now() - this.lastVoiceTime;
@@ -352,7 +361,11 @@ export class AudioService {
         this.isVoiceDetected = false;
         
         // Send accumulated audio
-        this.sendAudioChunk();
+        if (this.config.streaming) {
+          this.endAudioStream();
+        } else {
+          this.sendAudioChunk();
+        }
       }
     }
     
@@ -413,6 +426,19 @@ export class AudioService {
     return wavBuffer;
   }
   
+  /**
+   * Convert Float32Array audio data to 16-bit PCM samples
+   */
+  private float32ToInt16(buffer: Float32Array): Int16Array {
+    const pcm = new Int16Array(buffer.length);
+    for (let i = 0; i < buffer.length; i++) {
+      // Clamp the value to [-1.0, 1.0]
+      const sample = Math.max(-1.0, Math.min(1.0, buffer[i]));
+      pcm[i] = sample < 0 ? sample * 32768 : sample * 32767;
+    }
+    return pcm;
+  }
+
   /**
    * Helper function to write a string to a DataView
    */
@@ -470,6 +496,35 @@ export class AudioService {
     this.audioBuffer = [];
   }
 
+  /**
+   * Send a buffer of the current utterance to the server's audio stream,
+   * opening the stream on the first buffer
+   */
+  private streamAudio(buffer: Float32Array): void {
+    if (!this.isStreaming) {
+      if (!websocketService.startAudioStream(this.config.sampleRate)) {
+        return;
+      }
+      this.isStreaming = true;
+      console.log('Audio stream started');
+    }
+    
+    websocketService.sendAudioStreamChunk(this.float32ToInt16(buffer));
+  }
+
+  /**
+   * End the server's audio stream, if one is open
+   */
+  private endAudioStream(): void {
+    if (!this.isStreaming) {
+      return;
+    }
+    
+    this.isStreaming = false;
+    websocketService.endAudioStream();
+    console.log('Audio stream ended');
+  }
+
   /**
    * Play audio from base64-encoded data
    * 
@@ -479,7 +534,18 @@ export class AudioService {
    * This method is specifically for playing TTS content and will
    * set the state to SPEAKING rather than just PLAYING.
    */
-  public async playAudioChunk(base64AudioChunk: string, _format: string = 'wav'): Promise<void> {
+  public async playAudioChunk(base64AudioChunk: string, format: string = 'wav'): Promise<void> {
+    // Convert base64 to ArrayBuffer
+    return this.playAudioData(WebSocketService.base64ToArrayBuffer(base64AudioChunk), format);
+  }
+
+  /**
+   * Play a complete audio file received as binary data
+   * 
+   * Used for TTS audio sent in binary WebSocket frames; otherwise the
+   * same as playAudioChunk().
+   */
+  public async playAudioData(audioData: ArrayBuffer, _format: string = 'wav'): Promise<void> {
     try {
       await this.initAudioContext();
       
@@ -487,9 +553,6 @@ export class AudioService {
         throw new Error('AudioContext not initialized');
       }
       
-      // Convert base64 to ArrayBuffer
-      const audioData = WebSocketService.base64ToArrayBuffer(base64AudioChunk);
-      
       console.log(`Received complete audio file (${audioData.byteLength} bytes)`);
       
       // Decode the audio data
@@ -7,7 +7,12 @@
 // Message types (corresponds to backend message types)
 export enum MessageType {
   AUDIO = "audio",
+  AUDIO_STREAM_START = "audio_stream_start",
+  AUDIO_STREAM_CHUNK = "audio_stream_chunk",
+  AUDIO_STREAM_END = "audio_stream_end",
+  AUDIO_CODEC = "audio_codec",
   TRANSCRIPTION = "transcription",
+  TRANSCRIPTION_INTERIM = "transcription_interim",
   LLM_RESPONSE = "llm_response",
   TTS_CHUNK = "tts_chunk",
   TTS_START = "tts_start",
@@ -36,6 +41,31 @@ export enum MessageType {
   DELETE_SESSION_RESULT = "delete_session_result",
 }
 
+// WebSocket subprotocol that switches audio to binary frames (see backend/routes/binary_protocol.py)
+export const BINARY_SUBPROTOCOL = 'suarasemar.binary.v1';
+
+const BINARY_PROTOCOL_VERSION = 1;
+const BINARY_HEADER_SIZE = 8; // version (uint8) | frame type (uint8) | flags (uint16) | sequence (uint32), big-endian
+
+// Binary frame types
+enum FrameType {
+  // Client -> server
+  AUDIO_WAV = 0x01, // Complete utterance as a WAV file
+  AUDIO_PCM = 0x02, // Raw PCM chunk for the active audio stream
+
+  // Server -> client
+  TTS_AUDIO = 0x10 // Synthesized speech audio
+}
+
+// Binary frame flags
+const FRAME_FLAG_END_OF_SEGMENT = 0x0001;
+
+// Audio codecs (corresponds to backend AudioCodec)
+export enum AudioCodec {
+  PCM = "pcm",
+  OGG_OPUS = "ogg_opus"
+}
+
 // Session interface
 export interface Session {
   id: string;
@@ -58,6 +88,7 @@ type WebSocketEventType =
   | 'error'
   | 'audio'
   | 'transcription'
+  | 'transcription_interim'
   | 'llm_response'
   | 'tts_start'
   | 'tts_chunk'
@@ -103,6 +134,11 @@ export class WebSocketService {
   
   // Track states that should prevent interrupt signals
   private isInGreetingFlow: boolean = false;
+  
+  // Binary frame state
+  private frameSequence: number = 0;
+  private ttsFormat: string = 'wav'; // Format announced by the last tts_start
+  private ttsFrames: Uint8Array[] = []; // Frames of the TTS segment being received
 
   constructor(
     url: string = 'ws://localhost:8000/ws', 
@@ -129,7 +165,11 @@ export class WebSocketService {
     this.setConnectionState(ConnectionState.CONNECTING);
     
     try {
-      this.socket = new WebSocket(this.url);
+      // Offer binary audio frames; servers that don't support them fall back to JSON
+      this.socket = new WebSocket(this.url, [BINARY_SUBPROTOCOL]);
+      this.socket.binaryType = 'arraybuffer';
+      this.frameSequence = 0;
+      this.ttsFrames = [];
       
       this.socket.onopen = this.onOpen.bind(this);
       this.socket.onclose = this.onClose.bind(this);
@@ -184,10 +224,49 @@ export class WebSocketService {
     }
   }
 
+  /**
+   * Whether the server accepted binary audio frames for this connection
+   */
+  public usesBinaryFrames(): boolean {
+    return this.socket !== null && this.socket.protocol === BINARY_SUBPROTOCOL;
+  }
+
+  /**
+   * Send a binary frame (8-byte header followed by the payload)
+   */
+  private sendFrame(frameType: FrameType, payload: Uint8Array): boolean {
+    if (!this.socket || this.socket.readyState !== WebSocket.OPEN) {
+      console.error('WebSocket not connected');
+      return false;
+    }
+
+    try {
+      const frame = new Uint8Array(BINARY_HEADER_SIZE + payload.byteLength);
+      const header = new DataView(frame.buffer);
+      header.setUint8(0, BINARY_PROTOCOL_VERSION);
+      header.setUint8(1, frameType);
+      header.setUint16(2, 0);
+      header.setUint32(4, this.frameSequence);
+      frame.set(payload, BINARY_HEADER_SIZE);
+      this.frameSequence = (this.frameSequence + 1) >>> 0;
+      
+      this.socket.send(frame);
+      return true;
+    } catch (error) {
+      console.error('Error sending frame:', error);
+      return false;
+    }
+  }
+
   /**
    * Send audio data to the WebSocket server
    */
   public sendAudio(audioData: Float32Array | ArrayBuffer): boolean {
+    // WAV files go out as binary frames when the server accepted them
+    if (audioData instanceof ArrayBuffer && this.usesBinaryFrames()) {
+      return this.sendFrame(FrameType.AUDIO_WAV, new Uint8Array(audioData));
+    }
+    
     // Convert to base64 if Float32Array
     let base64Data: string;
     
@@ -207,6 +286,66 @@ export class WebSocketService {
     });
   }
 
+  /**
+   * Start streaming an utterance while it is being spoken
+   * 
+   * The server transcribes the chunks as they arrive and sends interim
+   * transcripts, instead of waiting for a complete WAV file.
+   * 
+   * @param sampleRate Sample rate of the PCM chunks that will follow
+   */
+  public startAudioStream(sampleRate: number): boolean {
+    return this.send(MessageType.AUDIO_STREAM_START, {
+      sample_rate: sampleRate,
+      encoding: 'pcm_s16le'
+    });
+  }
+
+  /**
+   * Send a chunk of 16-bit PCM audio for the active stream
+   */
+  public sendAudioStreamChunk(pcmData: Int16Array): boolean {
+    const bytes = new Uint8Array(pcmData.buffer, pcmData.byteOffset, pcmData.byteLength);
+    if (this.usesBinaryFrames()) {
+      return this.sendFrame(FrameType.AUDIO_PCM, bytes);
+    }
+    return this.send(MessageType.AUDIO_STREAM_CHUNK, {
+      audio_data: this.arrayBufferToBase64(bytes)
+    });
+  }
+
+  /**
+   * End the active audio stream (end of the utterance)
+   */
+  public endAudioStream(): boolean {
+    return this.send(MessageType.AUDIO_STREAM_END);
+  }
+
+  /**
+   * Ask for Opus TTS audio if both the server and this browser support it
+   * 
+   * Microphone audio is captured as PCM, so the uplink stays uncompressed.
+   * 
+   * @param codecs Codecs offered by the server in its connected status
+   */
+  private negotiateAudioCodec(codecs?: { uplink?: string[]; downlink?: string[] }): boolean {
+    if (!codecs?.downlink?.includes(AudioCodec.OGG_OPUS)) {
+      return false;
+    }
+    
+    // decodeAudioData() handles Ogg Opus wherever the media element can play it
+    if (typeof Audio === 'undefined' || new Audio().canPlayType('audio/ogg; codecs=opus') === '') {
+      console.log('Ogg Opus playback not supported, keeping uncompressed TTS audio');
+      return false;
+    }
+    
+    console.log('Requesting Opus TTS audio');
+    return this.send(MessageType.AUDIO_CODEC, {
+      uplink: AudioCodec.PCM,
+      downlink: AudioCodec.OGG_OPUS
+    });
+  }
+
   /**
    * Send an interrupt signal to stop ongoing TTS
    * Will not send if we're in the initial greeting flow
@@ -219,6 +358,8 @@ export class WebSocketService {
     }
     
     console.log('Sending interrupt signal to server');
+    // Drop the rest of the segment being received; it won't be completed
+    this.ttsFrames = [];
     return this.send(MessageType.INTERRUPT);
   }
   
@@ -425,10 +566,26 @@ export class WebSocketService {
    * Handle WebSocket message event
    */
   private onMessage(event: MessageEvent): void {
+    if (event.data instanceof ArrayBuffer) {
+      this.onBinaryFrame(event.data);
+      return;
+    }
+    
     try {
       const message = JSON.parse(event.data);
       const type = message.type as WebSocketEventType;
       
+      // The server lists its codecs when the connection is set up
+      if (message.type === MessageType.STATUS && message.status === 'connected') {
+        this.negotiateAudioCodec(message.data?.codecs);
+      }
+      
+      // Binary TTS frames that follow carry audio in this format
+      if (message.type === MessageType.TTS_START) {
+        this.ttsFormat = message.format || 'wav';
+        this.ttsFrames = [];
+      }
+      
       // Acknowledge pings but DON'T send pong responses
       // Backend doesn't handle pong messages well
       if (message.type === 'ping') {
@@ -450,6 +607,54 @@ export class WebSocketService {
     }
   }
 
+  /**
+   * Handle a binary frame from the server
+   * 
+   * TTS audio arrives in several frames; once the frame flagged as the end
+   * of the segment arrives, the segment is passed to the tts_chunk listeners
+   * as an ArrayBuffer, like a JSON tts_chunk message carries it in base64.
+   */
+  private onBinaryFrame(data: ArrayBuffer): void {
+    if (data.byteLength < BINARY_HEADER_SIZE) {
+      console.error(`Binary frame too short: ${data.byteLength} bytes`);
+      return;
+    }
+    
+    const header = new DataView(data);
+    const version = header.getUint8(0);
+    const frameType = header.getUint8(1);
+    const flags = header.getUint16(2);
+    if (version !== BINARY_PROTOCOL_VERSION) {
+      console.error(`Unsupported binary frame version: ${version}`);
+      return;
+    }
+    if (frameType !== FrameType.TTS_AUDIO) {
+      console.warn(`Unknown binary frame type: ${frameType}`);
+      return;
+    }
+    
+    this.ttsFrames.push(new Uint8Array(data, BINARY_HEADER_SIZE));
+    if (!(flags & FRAME_FLAG_END_OF_SEGMENT)) {
+      return;
+    }
+    
+    // Join the segment's frames into one audio file
+    const length = this.ttsFrames.reduce((acc, frame) => acc + frame.byteLength, 0);
+    const segment = new Uint8Array(length);
+    let offset = 0;
+    for (const frame of this.ttsFrames) {
+      segment.set(frame, offset);
+      offset += frame.byteLength;
+    }
+    this.ttsFrames = [];
+    
+    this.notifyListeners('tts_chunk', {
+      type: MessageType.TTS_CHUNK,
+      audio_data: segment.buffer,
+      format: this.ttsFormat
+    });
+  }
+
   /**
    * Notify all listeners of an event
    */
@@ -492,9 +697,9 @@ export class WebSocketService {
   /**
    * Convert ArrayBuffer to Base64 string
    */
-  private arrayBufferToBase64(buffer: ArrayBuffer): string {
+  private arrayBufferToBase64(buffer: ArrayBuffer | Uint8Array): string {
     const binary = [];
-    const bytes = new Uint8Array(buffer);
+    const bytes = buffer instanceof Uint8Array ? buffer : new Uint8Array(buffer);
     const len = bytes.byteLength;
     
     for (let i = 0; i < len; i++) {